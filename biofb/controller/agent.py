@@ -1,4 +1,5 @@
-from numpy import ndarray, nan
+from numpy import ndarray
+from biofb.io import actions_to_records, records_to_actions
 from biofb.session import Controller
 from time import time
 import os
@@ -62,6 +63,9 @@ class Agent(Controller):
 
     @action_data.setter
     def action_data(self, value):
+        if isinstance(value, ndarray) and value.dtype.names is not None:
+            value = records_to_actions(value)  # structured array, see `dump_actions`
+
         if not isinstance(value, list):
             if isinstance(value, dict):
                 value = Agent.dict_to_list(value_dict=value)
@@ -118,11 +122,8 @@ class Agent(Controller):
                 raise NotImplementedError(f'file_format {file_format}')
 
         with h5py.File(filename, mode) as h5:
-            g = h5.create_group(key)
-            for i, (timestamp, action) in enumerate(self.action_data):
-                g[f'{i}/timestamp'] = timestamp
-
-                # store actions -- possibly None (ESC), otherwise (key, action_value) pairs
-                for j, action_value in enumerate(action if hasattr(action, '__iter__') else [action]):
-                    # check, whether action_value is value_dict (if None in case of key '.' -> save np.nan)
-                    g[f'{i}/{j}'] = (action_value if action_value is not None else nan)
+            if key in h5:
+                del h5[key]
+
+            # a single structured dataset instead of one group per action
+            h5.create_dataset(key, data=actions_to_records(self.action_data))
@@ -1,6 +1,7 @@
 from biofb.io import Loadable
 from biofb.session import Sample
 from biofb.controller import Agent
+from biofb.pipeline import Recorder
 from numpy import ndarray
 import threading
 from time import sleep
@@ -22,6 +23,9 @@ class Session(Loadable):
     SAMPLE_DATA_KEY = 'sample_data'
     ACTION_DATA_KEY = 'action_data'
 
+    RECORDING_BUFFER_DURATION = 10.
+    """ Default duration in seconds of the received data which is kept in memory during a recorded `run` """
+
     def __init__(self,
                  sample: Sample,
                  agent: Agent,
@@ -31,6 +35,8 @@ class Session(Loadable):
                  timeout: float = 2.,
                  sample_data=None,
                  action_data=None,
+                 recording: (str, None) = None,
+                 buffer_duration: (float, None) = None,
                  ):
         """Constructor of Feedback `Session`
 
@@ -44,6 +50,11 @@ class Session(Loadable):
                             e.g. when loading from a file (defaults to None).
         :param action_data: (Optional) Agent-data list which initializes the `action_data`-property of the agent
                             instance, e.g. when loading from a file (defaults to None).
+        :param recording: (Optional) path of a write-ahead recording file to which all received data-chunks and
+                          actions are written during `run` (see `biofb.pipeline.Recorder`, defaults to None).
+        :param buffer_duration: (Optional) duration in seconds of the received data which is kept in memory during
+                                a recorded `run` (see `Device.buffer_duration`, defaults to None, i.e. the
+                                `monitor_window`, but at least `RECORDING_BUFFER_DURATION` seconds).
         """
 
         Loadable.__init__(self)
@@ -77,6 +88,17 @@ class Session(Loadable):
         self._timeout = None
         self.timeout = timeout
 
+        self._recording = None
+        self.recording = recording
+
+        self._buffer_duration = None
+        self.buffer_duration = buffer_duration
+
+        self._recorder = None
+        self._device_buffer_durations = None  # buffer durations of the devices before `start_recording`
+
+        self._monitor_window = None  # forward all sample data to data monitors on default
+
         self._feedback_loop_daemon = None
 
     def __enter__(self):
@@ -143,6 +165,82 @@ class Session(Loadable):
         assert value >= 0
         self._timeout = value
 
+    @property
+    def monitor_window(self) -> (float, None):
+        """ Duration in seconds of the most recent sample data which is forwarded to a data monitor
+            in the `run` method (None: all data) """
+        return self._monitor_window
+
+    @monitor_window.setter
+    def monitor_window(self, value: (float, None)):
+        assert value is None or value > 0
+        self._monitor_window = value
+
+    @property
+    def recording(self) -> (str, None):
+        """ Path of the write-ahead recording file of the `run` method (None: no recording) """
+        return self._recording
+
+    @recording.setter
+    def recording(self, value: (str, None)):
+        self._recording = value
+
+    @property
+    def buffer_duration(self) -> (float, None):
+        """ Duration in seconds of the received data which is kept in memory during a recorded `run`
+            (None: the `monitor_window`, but at least `RECORDING_BUFFER_DURATION` seconds, see `start_recording`) """
+        return self._buffer_duration
+
+    @buffer_duration.setter
+    def buffer_duration(self, value: (float, None)):
+        assert value is None or value > 0
+        self._buffer_duration = value
+
+    @property
+    def recorder(self) -> (Recorder, None):
+        """ `biofb.pipeline.Recorder` of a running recorded `run` """
+        return self._recorder
+
+    def start_recording(self) -> (Recorder, None):
+        """ Start writing the received data-chunks and actions to the `recording` file (if specified)
+
+        The `Device`s keep only the latest `buffer_duration` seconds of data in memory while recording (if not
+        specified, the `monitor_window`, but at least `RECORDING_BUFFER_DURATION` seconds, are kept for `Device`s
+        without a `Device.buffer_duration`), i.e. the memory usage of a recorded `run` is bounded. The previous
+        buffer durations of the `Device`s are restored by `stop_recording`.
+        """
+        if self.recording is None:
+            return None
+
+        setup = self.sample.setup
+        self._device_buffer_durations = [device.buffer_duration for device in setup.devices]
+        for device in setup.devices:
+            if self.buffer_duration is not None:
+                device.buffer_duration = self.buffer_duration
+
+            elif device.buffer_duration is None:
+                device.buffer_duration = max(self.monitor_window or 0., self.RECORDING_BUFFER_DURATION)
+
+        self._recorder = Recorder(self.recording, streams=Recorder.get_streams(setup))
+        self._recorder.start()
+        setup.recorder = self._recorder
+        return self._recorder
+
+    def stop_recording(self) -> None:
+        """ Write all pending records, close the `recording` file and restore the buffer durations of the
+            `Device`s (see `start_recording`) """
+        if self._recorder is None:
+            return
+
+        self.sample.setup.recorder = None
+        recorder, self._recorder = self._recorder, None
+        recorder.stop()
+
+        for device, buffer_duration in zip(self.sample.setup.devices, self._device_buffer_durations):
+            device.buffer_duration = buffer_duration
+
+        self._device_buffer_durations = None
+
     @property
     def description(self) -> str:
         return self._description
@@ -171,26 +269,37 @@ class Session(Loadable):
         - Actions are proposed according to the current state of the subject's acquired `sample`s.
         - The state of the subject is updated by the `agent`'s `action`s.
         - The goal is to guide the subject's state to exhibit certain qualities.
+        - If a `recording` file is specified, all received data-chunks and actions are written to the file
+          while the session is running (see `start_recording`).
 
         :return: None
         """
 
         self.done = False          # start the agent loop (this could be done in an extra thread)
 
-        state = self.sample.state  # acquire the initial state
-        done = False
+        recorder = self.start_recording()
 
-        while not done:
-            action = self.agent.get_action(state)       # get action from agent instance and track action data
-            done, state, info_dict = self.step(action)  # update sample state based on agent action
+        try:
+            state = self.sample.state  # acquire the initial state
+            done = False
 
-            try:
-                data_monitor.data = [d.T for d in self.sample.data]
-            except:
-                pass
+            while not done:
+                action = self.agent.get_action(state)       # get action from agent instance and track action data
+                if recorder is not None:
+                    recorder.record_action(*self.agent.action_data[-1])
 
-            if self.delay != 0.:
-                sleep(self.delay)
+                done, state, info_dict = self.step(action)  # update sample state based on agent action
+
+                try:
+                    data_monitor.data = [d.T for d in self.sample.get_recent_data(self.monitor_window)]
+                except:
+                    pass
+
+                if self.delay != 0.:
+                    sleep(self.delay)
+
+        finally:
+            self.stop_recording()
 
         self.done = done
         return
@@ -263,6 +372,12 @@ class Session(Loadable):
         return super().load(value)
 
     def dump(self, filename=None, file_format=None, exist_ok=True):
+        """ Dump the session and its sample data and actions into the HDF5 file of the `Sample`
+
+        The sample data is stored in chunked, resizable datasets (see `Sample.dump_data` and `Recorder.to_hdf5`),
+        which are read into memory when the sample is loaded. Use `Sample.dump_data(chunked=False)` to store
+        contiguous datasets which are memory-mapped on loading.
+        """
         if filename is None:
             filename = self.sample.filename
             base, extension = os.path.splitext(filename)
@@ -279,6 +394,13 @@ class Session(Loadable):
                 file_format = 'yml'
 
         super().dump(filename=filename, file_format=file_format, exist_ok=exist_ok)
+
+        if self.recording is not None and os.path.isfile(self.recording):
+            # the recording holds all data, whereas only the latest `buffer_duration` seconds are kept in memory
+            Recorder.to_hdf5(self.recording, self.sample.filename, mode='a', key=self.SAMPLE_DATA_KEY,
+                             action_key=self.ACTION_DATA_KEY)
+            return
+
         self.sample.dump_data(mode='a', key=self.SAMPLE_DATA_KEY)
         self.agent.dump_actions(filename=self.sample.filename, mode='a', key=self.ACTION_DATA_KEY)
 
@@ -1,5 +1,6 @@
 """bio-controller hardware-io module for bio-controller sessions."""
 
+from .time_axis import get_time_axis, clear_time_axes
 from .channel import Channel
 from .device import Device
 from .setup import Setup
@@ -1,6 +1,8 @@
 from biofb.io import Loadable
 from biofb.signal import filter
-from numpy import asarray, arange, linspace, ndarray
+from numpy import asarray, ndarray
+from biofb.hardware.time_axis import get_time_axis
+from functools import lru_cache
 from copy import deepcopy
 
 
@@ -51,6 +53,14 @@ class Channel(Loadable):
 
         return channel
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_channel_cls(name: str, label: (str, None) = None) -> (type, None):
+        """ Specific channel class of the `biofb.hardware.channels` package named by the channel `name` or `label`
+            (None if there is no specific channel class, cached per name and label) """
+        from biofb.hardware import channels as channels_module
+        return getattr(channels_module, name, getattr(channels_module, str(label), None))
+
     @classmethod
     def load(cls, value):
         """ Loads channel instance based on the `value_dict` argument (`Channel` or `dict`).
@@ -62,10 +72,8 @@ class Channel(Loadable):
         :return:
         """
 
-        from biofb.hardware import channels as channels_module
-
         if isinstance(value, dict):
-            channel_cls = getattr(channels_module, value['name'], getattr(channels_module, value.get('label', 'None'), cls))
+            channel_cls = cls.get_channel_cls(value['name'], value.get('label', 'None')) or cls
 
         elif isinstance(value, cls):
             channel_cls = value.__class__
@@ -88,6 +96,9 @@ class Channel(Loadable):
     def name(self, value: str):
         self._name = value
 
+        if getattr(self, '_device', None) is not None:
+            self._device._channel_map = None  # channel names are indexed by the device
+
     @property
     def label(self) -> str:
         return self._label if self._label is not None else self._name
@@ -263,30 +274,34 @@ class Channel(Loadable):
 
     @property
     def data(self):
+        """ Channel data, a (strided) column view on the device data if the channel is used in a `Device` """
         if self._data is None:
             if self._device is not None:
-                return [channel_data
-                        for channel, channel_data in zip(self._device.channels, self._device.data.T)
-                        if channel is self][0]
+                return self._device.data[:, self._get_index()]
 
         return self._data
 
     @data.setter
     def data(self, value):
         if self._device is not None:
-            for i, channel in enumerate(self._device.channels):
-                if channel is self:
-                    self._device.data[:, i] = value
+            self._device.data[:, self._get_index()] = value
 
         if self._data is not None:
             self._data[:] = value
 
-    @property
-    def time(self):
-        data = self.data
-        time = linspace(0, len(data)/self.sampling_rate, len(data), endpoint=False)
+    def _get_index(self) -> int:
+        """ Column index of the channel in the device data (cached by the device) """
+        index = self._device.get_channel_index(self)
+        if index is None:
+            raise IndexError(f"Channel `{self.name}` is not a channel of device `{self._device.name}`.")
 
-        return time
+        return index
+
+    @property
+    def time(self) -> ndarray:
+        """ Time axis of the channel data in seconds (read-only view on a cached axis, see `get_time_axis`, use
+            `copy()` to modify it) """
+        return get_time_axis(len(self.data), self.sampling_rate)
 
     def plot(self, data, ax=None, label_by='label', figure_kwargs=(), **plot_kwargs):
         """Plot provided channel data.
@@ -311,7 +326,7 @@ class Channel(Loadable):
 
         plot_kwargs = deepcopy(plot_kwargs)
         for i in range(len(data)):
-            t = arange(0, len(data[i])) / self.sampling_rate
+            t = get_time_axis(len(data[i]), self.sampling_rate)
 
             label = plot_kwargs.pop('label', None)
             sample_label = None if label is None else (label + (f' {i}' * (len(data) > 1)))
@@ -1,13 +1,16 @@
 import numpy as np
 
 from biofb.io import Loadable
+from biofb.io import DataBuffer
+from biofb.io import load_cached
 from biofb.hardware import Channel
-from numpy import loadtxt, ndarray, asarray, concatenate
+from numpy import loadtxt, ndarray, asarray
 import importlib
 from copy import deepcopy
 from os.path import abspath
 from biofb.pipeline import Receiver
-from collections import defaultdict
+from biofb.signal.filter import StreamingFilter, FilterBank
+from collections import defaultdict, OrderedDict
 import inspect
 
 
@@ -24,6 +27,10 @@ class Device(Loadable):
         of these sensors
     """
 
+    FILTER_BANK_CACHE_SIZE = 8
+    """ Maximum number of filter banks which are kept per device (see `get_filter_bank`, least recently used are
+        dropped) """
+
     def __init__(self, name: str, channels: (tuple, list) = (), description: str = "", load_data_kwargs=(), data=None,
                  **parameters):
         """ Constructs a bio-controller hardware `Device` instance.
@@ -42,6 +49,7 @@ class Device(Loadable):
         self.name = name
 
         self._channels = None
+        self._channel_map = None
         self.channels = channels
 
         self._description = None
@@ -56,16 +64,21 @@ class Device(Loadable):
         self._receiver = None
         self._transmitter = None
 
+        self._buffer_duration = None  # keep all data on default
+        self._buffer = None
+
+        self._streaming_filter = None
+        self._filter_banks = OrderedDict()
+
         self._data = data
         self.data = data
 
     def __getitem__(self, key):
         """ Access channel via Channel-instance, name or id """
 
-        if isinstance(key, Channel):
-            channels = [channel for channel in self.channels if channel is key]
-        elif isinstance(key, str):
-            channels = [channel for channel in self.channels if channel.name == key]
+        if isinstance(key, (Channel, str)):
+            indices = self._get_channel_map().get(key if isinstance(key, str) else id(key), ())
+            channels = [self._channels[i] for i in indices]
         elif isinstance(key, int):
             return self.channels[key]
         elif hasattr(key, '__iter__'):
@@ -82,6 +95,35 @@ class Device(Loadable):
 
         return channels
 
+    def _get_channel_map(self) -> dict:
+        """ Mapping of channel ids (`id(channel)`) and channel names to tuples of channel indices,
+            rebuilt if the `channels` (or a channel name) have changed """
+        if self._channel_map is None:
+            channel_map = {}
+            for i, channel in enumerate(self._channels):
+                channel_map[id(channel)] = (i, )
+                channel_map[channel.name] = channel_map.get(channel.name, ()) + (i, )
+
+            self._channel_map = channel_map
+
+        return self._channel_map
+
+    def get_channel_index(self, channel: (Channel, str, int)) -> (int, None):
+        """ Column index of a channel in the device data (O(1) lookup)
+
+        :param channel: `Channel` instance, name or id.
+        :return: Column index of the channel, or None if the channel is not found.
+        :raises KeyError: if the channel name is not unique.
+        """
+        if isinstance(channel, int):
+            return channel
+
+        indices = self._get_channel_map().get(channel if isinstance(channel, str) else id(channel), ())
+        if len(indices) > 1:
+            raise KeyError(f"Channel name `{channel}` is not unique.")
+
+        return indices[0] if indices else None
+
     @property
     def name(self) -> str:
         return self._name
@@ -90,6 +132,9 @@ class Device(Loadable):
     def name(self, value: str):
         self._name = value
 
+        if getattr(self, '_setup', None) is not None:
+            self._setup._device_map = None  # device names are indexed by the setup
+
     @property
     def channels(self) -> (list, tuple):
         if self._channels is not None:
@@ -108,6 +153,7 @@ class Device(Loadable):
             v if isinstance(v, Channel) else Channel.load(v)
             for v in value
         ]
+        self._channel_map = None
 
         for c in self.channels:
             c._device = self
@@ -171,6 +217,9 @@ class Device(Loadable):
 
         - If the device is used without a setup, the device hosts its own data array
         - If the device is used in a hardware setup, the corresponding setup data is updated
+
+        Appended data is stored in a preallocated `biofb.io.DataBuffer` (amortized O(1) per appended chunk),
+        the `data` property provides a view on the buffered data.
         """
         if value is None:
             return
@@ -180,10 +229,60 @@ class Device(Loadable):
                 self._setup.append_device_data(value=value, device=self)
                 return
 
+        self._buffer = self.get_data_buffer(data=self._data, buffer=self._buffer)
+        self._data = self._buffer.append(value)
+
+    @property
+    def buffer_duration(self) -> (float, None):
+        """ Duration in seconds of received data which is kept in memory
+
+        If None, all appended data is kept (growable buffer), otherwise the latest `buffer_duration` seconds
+        of data are kept in a ring-buffer (e.g. for long sessions where data is recorded to disk).
+        """
+        return self._buffer_duration
+
+    @buffer_duration.setter
+    def buffer_duration(self, value: (float, None)):
+        assert value is None or value > 0, f"Buffer duration must be positive (provided `{value}`)."
+        self._buffer_duration = value
+        self._buffer = None
+
+    def get_data_buffer(self, data: (ndarray, None), buffer: (DataBuffer, None) = None) -> DataBuffer:
+        """ Get the `DataBuffer` which hosts the provided device data array
+
+        :param data: Current device data array (or None).
+        :param buffer: (Optional) `DataBuffer` instance which has been used so far to host the device data.
+        :return: `buffer` if the current device `data` is a view on the buffer and the buffer capacity matches
+                 `buffer_capacity`, otherwise a new `DataBuffer` instance initialized with the device `data`
+                 (i.e., if the data has been set externally or the `buffer_duration` has changed).
+        """
+        capacity = self.buffer_capacity
+        if buffer is not None and buffer.data is data and buffer.capacity == capacity:
+            return buffer
+
+        return DataBuffer(capacity=capacity, data=data)
+
+    @property
+    def buffer_capacity(self) -> (int, None):
+        """ Number of samples which are kept in the device-data buffer (None if all data is kept,
+            see `buffer_duration`) """
+        if self.buffer_duration is None:
+            return None
+
+        return int(round(self.buffer_duration * max(self.sampling_rates)))
+
+    def get_recent_data(self, duration: (float, None) = None) -> (ndarray, None):
+        """ View on the most recent device data
+
+        :param duration: Duration in seconds of the most recent data (defaults to None, i.e. all data).
+        :return: View on the device data of the last `duration` seconds (no copy of the data is made).
+        """
         data = self.data
-        data = concatenate([data, value]) if data is not None else asarray(value)
+        if data is None or duration is None:
+            return data
 
-        self.data = data
+        n_samples = int(round(duration * max(self.sampling_rates)))
+        return data[len(data) - min(n_samples, len(data)):]
 
     @classmethod
     def load(cls, value):
@@ -201,7 +300,7 @@ class Device(Loadable):
         if isinstance(value, cls):
             return value
 
-        value = deepcopy(value)
+        value = dict(value)  # `class` and `location` are popped, the (nested) values are not modified
         device_cls = value.pop('class', cls)
 
         if device_cls != cls:
@@ -258,14 +357,23 @@ class Device(Loadable):
 
         return cls
 
-    def load_data(self, filename, **kwargs):
+    def load_data(self, filename, cache=False, **kwargs):
         """ Load numpy array from file and stores it in device data property
 
         :param filename: Path to file containing numpy data array
+        :param cache: Boolean which controls whether the loaded data are cached in (and memory-mapped from)
+                      a binary sidecar file (see `biofb.io.load_cached`, defaults to False).
         :param kwargs: Forwarded keyword arguments to `numpy.loadtxt`.
         :returns: Loaded `numpy` array
         """
-        self.data = loadtxt(abspath(filename), **{**self._load_data_kwargs, **kwargs})
+        filename = abspath(filename)
+        kwargs = {**self._load_data_kwargs, **kwargs}
+
+        if cache:
+            self.data = load_cached(filename, lambda: loadtxt(filename, **kwargs), sorted(kwargs.items()))
+        else:
+            self.data = loadtxt(filename, **kwargs)
+
         return self.data
 
     def __str__(self) -> str:
@@ -319,6 +427,111 @@ class Device(Loadable):
 
         return axes
 
+    @property
+    def streaming_filter(self) -> (StreamingFilter, None):
+        """ `biofb.signal.filter.StreamingFilter` which is applied incrementally to each received data-chunk
+            (see `receive_data` and `Setup.receive_data`), or None (default, received data is not filtered) """
+        return self._streaming_filter
+
+    @streaming_filter.setter
+    def streaming_filter(self, value: (StreamingFilter, list, tuple, None)):
+        """ Set the `StreamingFilter` of the device
+
+        :param value: `StreamingFilter` instance, list of filter specifications (see `StreamingFilter.from_specs`,
+                      designed for the device's sampling rate) or None.
+        """
+        if isinstance(value, (list, tuple)):
+            value = self.get_filter_bank(value).streaming_filter()
+
+        self._streaming_filter = value
+
+    def get_filter_bank(self, specs: (list, tuple)) -> FilterBank:
+        """ Precomputed `biofb.signal.filter.FilterBank` of the filter specifications for the device configuration
+
+        :param specs: List of filter specifications (see `biofb.signal.filter.design`).
+        :return: `FilterBank` designed for the sampling rates of the device channels (the bank is cached per
+                 specifications and sampling rates, for at most `FILTER_BANK_CACHE_SIZE` configurations).
+        """
+        key = (repr(specs), tuple(self.sampling_rates))
+        if key not in self._filter_banks:
+            self._filter_banks[key] = FilterBank(specs=specs, sampling_rates=self.sampling_rates)
+
+        self._filter_banks.move_to_end(key)
+        while len(self._filter_banks) > self.FILTER_BANK_CACHE_SIZE:
+            self._filter_banks.popitem(last=False)
+
+        return self._filter_banks[key]
+
+    def get_channel_indices(self, channels: (list, tuple, None) = None) -> ndarray:
+        """ Column indices of the specified channels in the device data
+
+        :param channels: List of `Channel` instances, names or ids (defaults to None, i.e. all channels).
+        :return: Integer array of column indices.
+        """
+        if channels is None:
+            return np.arange(self.n_channels)
+
+        indices = [self.get_channel_index(channel) for channel in channels]
+        assert None not in indices, f"Channel `{channels[indices.index(None)]}` not found."
+
+        return np.asarray(indices, dtype=int)
+
+    def apply_filters(self, pipeline: (list, tuple), channels: (list, tuple, None) = None, filtfilt: bool = True,
+                      update_data: bool = True) -> ndarray:
+        """ Apply a filter pipeline to (selected channels of) the device data
+
+        The filter stages are combined into a precomputed `sos`-cascade (see `get_filter_bank`), and all selected
+        channels of the same sampling rate are filtered in a single `axis=0` SciPy call on the 2-D device data
+        (instead of one call per channel, see `Channel.apply_bandpass` etc.).
+
+        :param pipeline: List of filter specifications (see `biofb.signal.filter.design`),
+                         e.g. `[{'type': 'notch', 'w0': 50.}, {'type': 'bandpass', 'N': 4, 'Wn': (1., 40.)}]`.
+        :param channels: (Optional) List of `Channel` instances, names or ids to be filtered
+                         (defaults to None, i.e. all channels).
+        :param filtfilt: Boolean specifying whether to use `scipy.signal.sosfiltfilt` or `scipy.signal.sosfilt`
+                         (defaults to True).
+        :param update_data: Boolean controlling whether the device data is filtered in place (if True, default),
+                            or whether a filtered copy is returned (if False).
+        :returns: Filtered data.
+        """
+        data = self.data
+        assert data is not None, "No device data available."
+
+        if update_data and not np.issubdtype(data.dtype, np.floating):
+            self.data = data.astype(float)
+            data = self.data
+
+        bank = self.get_filter_bank(pipeline)
+        return bank(data, filtfilt=filtfilt, channels=self.get_channel_indices(channels),
+                    out=data if update_data else None)
+
+    def apply_filter(self, filter_type: str, channels: (list, tuple, None) = None, filtfilt: bool = True,
+                     update_data: bool = True, **filter_kwargs) -> ndarray:
+        """ Apply a single filter to (selected channels of) the device data, see `apply_filters`
+
+        :param filter_type: Type of the filter, one of ('notch', 'bandpass', 'bandstop', 'lowpass', 'highpass').
+        :param channels: (Optional) List of `Channel` instances, names or ids to be filtered
+                         (defaults to None, i.e. all channels).
+        :param filtfilt: Boolean specifying whether to use `scipy.signal.sosfiltfilt` or `scipy.signal.sosfilt`
+                         (defaults to True).
+        :param update_data: Boolean controlling whether the device data is filtered in place (if True, default).
+        :param filter_kwargs: Keyword arguments of the filter design function (e.g. `N` and `Wn`, or `w0` and `Q`).
+        :returns: Filtered data.
+        """
+        return self.apply_filters([{'type': filter_type, **filter_kwargs}], channels=channels, filtfilt=filtfilt,
+                                  update_data=update_data)
+
+    def filter_data(self, value: (ndarray, None)) -> (ndarray, None):
+        """ Apply the `streaming_filter` (if specified) to the next received data-chunk
+
+        :param value: Received data-chunk of shape `(n_samples, n_channels)`.
+        :return: Filtered data-chunk (or `value`, if no `streaming_filter` is specified).
+        """
+        if value is None or self._streaming_filter is None:
+            return value
+
+        return self._streaming_filter(value)
+
     @property
     def receiver(self):
         """ bio-feedback pipeline Receiver property """
@@ -441,7 +654,7 @@ class Device(Loadable):
         :param receiver_kwargs: (Optional) kwargs to initialize Receiver.
                                 Only used, if Receiver argument is specified
         :return: tuple of (timestamp, sample-data-chunk) numpy arrays, representing the time-of-retrieval and
-                 the retrieved channel data.
+                 the retrieved channel data (filtered by the `streaming_filter`, if specified).
         """
         if receiver is None:  # assert that a receiver has been specified
             assert self.receiver is not None, "No biofb.hardware.pipeline.Receiver specified."
@@ -456,6 +669,7 @@ class Device(Loadable):
 
         # retrieve data, blocking
         timestamp, data_chunk = receiver.receive_data()
+        data_chunk = self.filter_data(data_chunk)
 
         # append to data property
         self.append_data(data_chunk)
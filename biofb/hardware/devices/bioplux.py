@@ -1,9 +1,13 @@
 from biofb.hardware import Channel
 import biofb.hardware.channels as chs
 from biofb.hardware import Device
-from numpy import loadtxt
+from biofb.io import load_cached
+from numpy import float64
 from warnings import warn
 from collections import defaultdict
+import pandas as pd
+import json
+import ast
 
 
 class Bioplux(Device):
@@ -77,15 +81,106 @@ class Bioplux(Device):
     def __str__(self) -> str:
         return f"<Bioplux: {self.name}>"
 
-    def load_data(self, filename, update_device=False, update_channels=True, update_sampling_rate=True, **read_csv_kwargs):
+    @staticmethod
+    def read_header(filename) -> dict:
+        """Read the (JSON) header of an `OpenSignals r(evolution) Recorder` data file.
+
+        :param filename: Data file to read from.
+        :returns: Header dict, mapping the device name(s) to the device configuration(s).
+        """
+        with open(filename, 'r') as f:
+            f.readline()  # header
+            header = f.readline()[1:].strip()
+
+        try:
+            return json.loads(header)
+        except ValueError:
+            return ast.literal_eval(header)
+
+    LOADTXT_KWARGS = dict(delimiter='sep', comments='comment', max_rows='nrows')
+    """ Keywords of `numpy.loadtxt` (used by former versions of `load_data`) and the corresponding keywords of
+        `pandas.read_csv` (`skiprows`, `dtype` and `encoding` are accepted by both functions) """
+
+    @classmethod
+    def get_read_csv_kwargs(cls, n_header: int, **kwargs) -> dict:
+        """ Translate keyword arguments of `numpy.loadtxt` (used by former versions of `load_data`) to
+            `pandas.read_csv`, other keyword arguments are passed through
+
+        :param n_header: Number of header lines of the data file.
+        :param kwargs: Keyword arguments of `numpy.loadtxt` or `pandas.read_csv`.
+        :return: dict of `pandas.read_csv` keyword arguments.
+        :raises TypeError: for `numpy.loadtxt` keywords without equivalent (`usecols`, `unpack`, `ndmin`, the
+                           data columns are selected via the device channels).
+        """
+        unsupported = sorted({'usecols', 'unpack', 'ndmin'} & set(kwargs))
+        if unsupported:
+            raise TypeError(f"Keywords {unsupported} are not supported by `Bioplux.load_data` (data are read via "
+                            f"`pandas.read_csv` instead of `numpy.loadtxt`, columns are selected by the channels).")
+
+        loadtxt_kwargs = sorted(k for k in kwargs if k in cls.LOADTXT_KWARGS)
+        if loadtxt_kwargs:
+            warn(f"`numpy.loadtxt` keywords {loadtxt_kwargs} of `Bioplux.load_data` are deprecated, use the "
+                 f"`pandas.read_csv` keywords {[cls.LOADTXT_KWARGS[k] for k in loadtxt_kwargs]}.", DeprecationWarning)
+
+        read_csv_kwargs = {cls.LOADTXT_KWARGS.get(k, k): v for k, v in kwargs.items()}
+        if 'sep' in read_csv_kwargs and read_csv_kwargs['sep'] is None:
+            read_csv_kwargs['sep'] = r'\s+'  # whitespace delimiter of `numpy.loadtxt`
+
+        if 'skiprows' in read_csv_kwargs:
+            # `numpy.loadtxt` counts the skipped lines from the top of the file (including the header lines)
+            read_csv_kwargs['skiprows'] = max(int(read_csv_kwargs['skiprows']), n_header)
+
+        return read_csv_kwargs
+
+    @staticmethod
+    def read_columns(filename, columns, cache=False, **read_csv_kwargs):
+        """Read selected data columns of an `OpenSignals r(evolution) Recorder` data file.
+
+        The tab separated data are parsed by the C-engine of `pandas.read_csv`, only the selected `columns` are
+        converted (the header lines are skipped instead of being parsed as comments).
+
+        :param filename: Data file to read from.
+        :param columns: Indices of the data columns to read (list of int).
+        :param cache: Boolean controlling whether the selected columns are stored in a binary sidecar cache
+                      (see `biofb.io.load_cached`) next to the data file, which is memory-mapped when the data file
+                      is reopened (defaults to False).
+        :param read_csv_kwargs: Keyword arguments forwarded to `pandas.read_csv` (keywords of `numpy.loadtxt` are
+                                translated, see `get_read_csv_kwargs`).
+        :returns: Data as `numpy` array of dimension (n_data, len(columns)).
+        """
+        columns = [int(c) for c in columns]
+
+        with open(filename, 'r') as f:
+            n_header = 0
+            while f.readline().startswith('#'):
+                n_header += 1
+
+        read_csv_kwargs = Bioplux.get_read_csv_kwargs(n_header, **read_csv_kwargs)
+
+        def read():
+            kwargs = dict(sep='\t', skiprows=n_header, header=None, usecols=columns, dtype=float64, engine='c')
+            data = pd.read_csv(filename, **{**kwargs, **read_csv_kwargs})
+            return data[columns].to_numpy()  # `usecols` doesn't preserve the order of the columns
+
+        if cache:
+            return load_cached(filename, read, columns, sorted(read_csv_kwargs.items()))
+
+        return read()
+
+    def load_data(self, filename, update_device=False, update_channels=True, update_sampling_rate=True, cache=False,
+                  **read_csv_kwargs):
         """Load data from `OpenSignals r(evolution) Recorder` data file.
 
-        Only channels which are specified in the `biofb Bioplux` instance are loaded.
+        Only channels which are specified in the `biofb Bioplux` instance are loaded (see `read_columns`).
 
         :param filename: Data file to read form.
         :param update_device: Boolean which controls whether device data (such as name) are updated based on the data file (defaults to False).
         :param update_channels: Boolean which controls whether device's channels are updated based on the data file (defaults to True).
         :param update_sampling_rate: Boolean which controls whether device's channel's sampling rates are updated based on the data file (defaults to True).
+        :param cache: Boolean which controls whether the loaded data are cached in (and memory-mapped from) a binary sidecar file (defaults to False).
+        :param read_csv_kwargs: Keyword arguments forwarded to `pandas.read_csv` (formerly `numpy.loadtxt`, whose
+                                keywords `delimiter`, `comments`, `max_rows`, `skiprows`, `dtype` and `encoding`
+                                are translated, see `get_read_csv_kwargs`).
         :returns: Data as `numpy` array of dimension (n_data, n_channels).
         """
 
@@ -93,11 +188,7 @@ class Bioplux(Device):
             if k in locals():
                 locals()[k] = v
 
-        with open(filename, 'r') as f:
-            f.readline()  # header
-            config = eval(f.readline()[1:].strip())
-
-        data = loadtxt(filename, **read_csv_kwargs)
+        config = self.read_header(filename)
 
         if len(config.keys()) > 1:
             raise NotImplementedError("Mutli-device measurement with biosignalsplux equipment.")
@@ -130,7 +221,6 @@ class Bioplux(Device):
 
         if update_device:
             self.name = device_name
-            self.data = data
 
         if update_channels:
             channels = []
@@ -177,4 +267,9 @@ class Bioplux(Device):
         assert len(data_columns) > 0, f"No data columns found for current device channels " \
                                       f"[{[c.name for c in self.channels]}]."
 
-        return data[:, data_columns]
+        data = self.read_columns(filename, data_columns, cache=cache, **read_csv_kwargs)
+
+        if update_device:
+            self.data = data
+
+        return data
@@ -1,7 +1,8 @@
 import biofb.hardware.channels as chl
 from biofb.hardware import Device
+from biofb.io import load_cached, DataBuffer
 from pandas import read_csv
-from numpy import array
+from numpy import empty
 from os.path import abspath
 
 
@@ -60,30 +61,70 @@ class Unicorn(Device):
     def __str__(self) -> str:
         return f"<Unicorn: {self.name}>"
 
-    def load_data(self, filename, update_device=False, **read_csv_kwargs):
+    def load_data(self, filename, update_device=False, dtype='float32', chunksize=None, cache=False, **read_csv_kwargs):
         """Load data from `Unicorn Suit Hybrid Black Recorder` csv file.
 
-        Only channels which are specified in the `biofb Unicorn` instance are loaded.
+        Only channels which are specified in the `biofb Unicorn` instance are parsed (`usecols`).
 
         :param filename: Csv data file to read form.
         :param update_device:  Boolean which controls whether device data are updated based on the data file (defaults to False).
+        :param dtype: Data type of the loaded data (defaults to 'float32').
+        :param chunksize: (Optional) Number of rows which are parsed at once and copied into an array which is
+                          preallocated for the counted rows of the file (see `count_rows`, and grows if the file
+                          contains more rows), which limits the peak memory of long recordings (defaults to None,
+                          i.e. the whole file is parsed at once).
+        :param cache: Boolean which controls whether the loaded data are cached in (and memory-mapped from)
+                      a binary sidecar file (see `biofb.io.load_cached`, defaults to False).
+        :param read_csv_kwargs: Keyword arguments forwarded to `pandas.read_csv`.
         :returns: Data as `numpy` array of dimension (n_data, n_channels).
         """
-        data = read_csv(abspath(filename), **{**self._load_data_kwargs, **read_csv_kwargs})
+        filename = abspath(filename)
+        read_csv_kwargs = {**self._load_data_kwargs, **read_csv_kwargs}
+        channel_names = self.channel_names
+
+        loaded_channels = set(read_csv(filename, nrows=0, **read_csv_kwargs).columns)
+        for device_channel in channel_names:
+            assert device_channel in loaded_channels, f"Couldn't find device channel {device_channel} " \
+                                                      f"in loaded channels {list(loaded_channels)}."
+
+        kwargs = dict(usecols=channel_names, dtype={channel: dtype for channel in channel_names}, **read_csv_kwargs)
+
+        def read():
+            if chunksize is None:
+                return read_csv(filename, **kwargs)[channel_names].to_numpy()
+
+            # the counted rows may differ from the parsed rows (e.g. line breaks in quoted fields, `skiprows`)
+            buffer = DataBuffer(block_size=max(self.count_rows(filename), 1))
+            for chunk in read_csv(filename, chunksize=chunksize, **kwargs):
+                buffer.append(chunk[channel_names].to_numpy())
+
+            return buffer.data if len(buffer) else empty((0, len(channel_names)), dtype=dtype)
+
+        if cache:
+            data = load_cached(filename, read, channel_names, str(dtype), sorted(read_csv_kwargs.items()))
+        else:
+            data = read()
 
         if update_device:
-            self._data = data
+            self.data = data
 
-        loaded_channels = data.keys()
+        return data
 
-        for device_channel in self.channel_names:
+    @staticmethod
+    def count_rows(filename, block_size=2**20) -> int:
+        """Count the data rows of a csv file (number of lines without the header line)
 
-            found_channel = False
-            for loaded_channel in loaded_channels:
-                if device_channel == loaded_channel:
-                    found_channel = True
-                    break
+        :param filename: Csv data file.
+        :param block_size: Number of bytes which are scanned at once.
+        :returns: Number of data rows.
+        """
+        n_lines, last = 0, b''
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                n_lines += block.count(b'\n')
+                last = block
 
-            assert found_channel, f"Couldn't find device channel {device_channel} in loaded channels {loaded_channels}."
+        if last and not last.endswith(b'\n'):
+            n_lines += 1  # last line without line break
 
-        return array([data[channel].values for channel in self.channel_names]).T
+        return max(n_lines - 1, 0)
@@ -1,6 +1,8 @@
 from biofb.io import Loadable
+from biofb.io import DataBuffer
 from biofb.hardware import Device
-from numpy import ndarray, asarray, concatenate
+from biofb.pipeline import Synchronizer, Recorder
+from numpy import ndarray, asarray, atleast_1d
 
 
 class Setup(Loadable):
@@ -21,6 +23,7 @@ class Setup(Loadable):
         self.name = name
 
         self._devices = None
+        self._device_map = None
         self.devices = devices
 
         self._description = None
@@ -28,16 +31,20 @@ class Setup(Loadable):
 
         self._sample = None
         self._data = None
+        self._buffers = {}
+        self._timestamp_buffers = {}
 
         self._receivers = None
+        self._synchronizer = None
+        self._nominal_sampling_rates = None  # channel sampling rates before synchronization
+        self._recorder = None
 
     def __getitem__(self, key):
         """ Access channel via Channel-instance, name or id """
 
-        if isinstance(key, Device):
-            devices = [device for device in self.devices if device is key]
-        elif isinstance(key, str):
-            devices = [device for device in self.devices if device.name == key]
+        if isinstance(key, (Device, str)):
+            indices = self._get_device_map().get(key if isinstance(key, str) else id(key), ())
+            devices = [self._devices[i] for i in indices]
         elif isinstance(key, int):
             return self.devices[key]
         elif hasattr(key, '__iter__'):
@@ -52,6 +59,35 @@ class Setup(Loadable):
         if len(devices) == 1:
             return devices[0]
 
+    def _get_device_map(self) -> dict:
+        """ Mapping of device ids (`id(device)`) and device names to tuples of device indices,
+            rebuilt if the `devices` have changed """
+        if self._device_map is None:
+            device_map = {}
+            for i, device in enumerate(self._devices):
+                device_map[id(device)] = (i, )
+                device_map[device.name] = device_map.get(device.name, ()) + (i, )
+
+            self._device_map = device_map
+
+        return self._device_map
+
+    def get_device_index(self, device: (Device, int, str)) -> int:
+        """ Index of a `Device` in the `Setup` (O(1) lookup)
+
+        :param device: `Device` instance, label or id
+        :return: index of the `Device` in the `devices` list
+        :raises AttributeError: if the `Device` is not found (or the label is not unique)
+        """
+        if isinstance(device, int):
+            return device
+
+        indices = self._get_device_map().get(device if isinstance(device, str) else id(device), ())
+        if len(indices) != 1:
+            raise AttributeError(f"Device {device} not found.")
+
+        return indices[0]
+
     @classmethod
     def from_streams(cls, receiver_cls, streams, stream_kwargs=(), devices_location=None, **setup_kwargs):
         """ Initialize `Setup` instance based on the `biofb.pipeline.Receiver` multi-stream-configuration,
@@ -115,6 +151,13 @@ class Setup(Loadable):
 
             self._receivers = None
 
+        if self._synchronizer is not None:
+            self._synchronizer.reset()
+
+        for device in self.devices:
+            if device.streaming_filter is not None:
+                device.streaming_filter.reset()
+
     @property
     def name(self) -> str:
         return self._name
@@ -139,6 +182,54 @@ class Setup(Loadable):
             d._setup = self
             self._devices.append(d)
 
+        self._device_map = None
+        self._buffers = {}
+        self._timestamp_buffers = {}
+        self._nominal_sampling_rates = None
+
+    @property
+    def synchronizer(self) -> (Synchronizer, None):
+        """ `biofb.pipeline.Synchronizer` which aligns the received data of all `Device`s on a common time base
+            (see `receive_data`), created from the `Device` sampling rates on first use if not specified. """
+        return self._synchronizer
+
+    @synchronizer.setter
+    def synchronizer(self, value: (Synchronizer, dict, None)):
+        """ Set the `Synchronizer` of the `Setup`
+
+        Since synchronized data is resampled at the `synchronizer.sampling_rate`, the sampling rates of all `Channel`s
+        are set to the synchronized rate (and the device-data buffers are resized accordingly, see
+        `Device.buffer_duration`), the nominal sampling rates are restored if the synchronizer is removed (None).
+        """
+        if isinstance(value, dict):
+            value = Synchronizer(**value)
+
+        assert value is None or value.n_streams == self.n_devices, "One synchronized stream per device required."
+        self._synchronizer = value
+
+        if self._nominal_sampling_rates is None:
+            self._nominal_sampling_rates = [device.sampling_rates for device in self.devices]
+
+        for device, sampling_rates in zip(self.devices, self._nominal_sampling_rates):
+            for channel, sampling_rate in zip(device.channels, sampling_rates):
+                channel.sampling_rate = sampling_rate if value is None else value.sampling_rate
+
+        if value is None:
+            self._nominal_sampling_rates = None
+
+        self._buffers = {}  # buffer capacities depend on the sampling rates
+
+    @property
+    def recorder(self) -> (Recorder, None):
+        """ (Optional) running `biofb.pipeline.Recorder` to which every received data-chunk is written
+            (see `receive_data`), one recorded stream per `Device` (see `Recorder.get_streams`). """
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, value: (Recorder, None)):
+        assert value is None or len(value.streams) == self.n_devices, "One recorded stream per device required."
+        self._recorder = value
+
     @property
     def device_names(self) -> list:
         return [d.name for d in self.devices]
@@ -194,16 +285,7 @@ class Setup(Loadable):
         :param device: `Device` instance, label or id
         :return: `Device`-data array or None
         """
-        if not isinstance(device, Device):
-            device = self[device]
-
-        for i, device_i in enumerate(self.devices):
-            if device_i is not device:
-                continue
-
-            return self.data[i]
-
-        raise AttributeError(f"Device {device} not found.")
+        return self.data[self.get_device_index(device)]
 
     def set_device_data(self, value: (None, ndarray), device: (Device, int, str)):
         """ Set data of specific `Device`
@@ -211,43 +293,81 @@ class Setup(Loadable):
         :param value: `Device`-specific data array
         :param device: `Device` instance, label or id
         """
-        if not isinstance(device, Device):
-            device = self[device]
+        i = self.get_device_index(device)
+        if value is not None:
+            value = asarray(value)
 
-        for i, device_i in enumerate(self.devices):
-            if device_i is not device:
-                continue
-
-            if value is not None:
-                value = asarray(value)
-
-            self.data[i] = value
-            return
+        self.data[i] = value
 
-        raise AttributeError(f"Device {device} not found.")
+    def append_device_data(self, value: (None, ndarray), device: (Device, int, str),
+                           timestamps: (ndarray, None) = None):
+        """ Append data to specific `Device`-data
 
-    def append_device_data(self, value: (None, ndarray), device: (Device, int, str)):
-        """ Append/Concatenate data to specific `Device`-data
+        The data of each `Device` is stored in a preallocated `biofb.io.DataBuffer` (amortized O(1) per appended
+        chunk, see also `Device.buffer_duration`), the `Setup`-data list holds views on the buffered data.
 
         :param value: `Device`-specific (to be appended) data array
         :param device: `Device` instance, label or id
+        :param timestamps: (Optional) timestamps of the appended samples, which are kept in a parallel buffer
+                           (see `timestamps`).
         """
-        if not isinstance(device, Device):
-            device = self[device]
+        i = self.get_device_index(device)
+        device = self.devices[i]
 
-        for i, device_i in enumerate(self.devices):
-            if device_i is not device:
-                continue
+        data = self.data
+        self._buffers[i] = device.get_data_buffer(data=data[i], buffer=self._buffers.get(i, None))
+        n_buffered = len(self._buffers[i])
+        data[i] = self._buffers[i].append(value)
+        self.data = data
 
-            data = self.data
-            data[i] = concatenate([data[i], value]) if data[i] is not None else asarray(value)
-            self.data = data
+        self._append_timestamps(i, timestamps, n_buffered=n_buffered, n_appended=len(atleast_1d(asarray(value))))
 
+    def _append_timestamps(self, i: int, timestamps: (ndarray, None), n_buffered: int, n_appended: int):
+        """ Append the timestamps of appended device data to the parallel timestamp buffer of the device
+
+        Timestamps are only kept as long as they are provided for every appended sample,
+        otherwise the timestamp buffer of the device is discarded.
+        """
+        buffer = self._timestamp_buffers.pop(i, None)
+        if timestamps is None:
+            return
+
+        timestamps = atleast_1d(asarray(timestamps, dtype=float))
+        if len(timestamps) != n_appended:
             return
 
-        raise AttributeError(f"Device {device} not found.")
+        if buffer is None:
+            if n_buffered > 0:
+                return  # previous data without timestamps
+
+            buffer = DataBuffer(capacity=self._buffers[i].capacity)
+
+        elif len(buffer) != n_buffered:
+            return  # data has been modified externally
 
-    def receive_data(self, receivers: (list, None) = None, receivers_kwargs: (None, list, dict) = None):
+        elif buffer.capacity != self._buffers[i].capacity:  # data buffer has been resized
+            buffer = DataBuffer(capacity=self._buffers[i].capacity, data=buffer.data)
+
+        buffer.append(timestamps.reshape(-1, 1))
+        self._timestamp_buffers[i] = buffer
+
+    @property
+    def timestamps(self) -> list:
+        """ List of the timestamps of the received data of each `Device` (views on 1D arrays, parallel to the
+            `Device`-data), or None for `Device`s whose data has not been received with timestamps """
+        return [self._timestamp_buffers[i].data[:, 0] if i in self._timestamp_buffers else None
+                for i in range(self.n_devices)]
+
+    def get_recent_data(self, duration: (float, None) = None) -> list:
+        """ Views on the most recent data of all `Device`s
+
+        :param duration: Duration in seconds of the most recent data (defaults to None, i.e. all data).
+        :return: list of views on the `Device`-data of the last `duration` seconds (no copies of the data are made).
+        """
+        return [device.get_recent_data(duration) for device in self.devices]
+
+    def receive_data(self, receivers: (list, None) = None, receivers_kwargs: (None, list, dict) = None,
+                     drain: bool = False, synchronize: bool = False):
         """ Retrieve sample-data(-chunk) from the specified associated list of receivers related to
             each device (blocking, until a sample-data(-chunk) has been retrieved for each device)
 
@@ -259,9 +379,21 @@ class Setup(Loadable):
                                  If dict is provided, all `receivers` are instantiated with the same
                                  `receivers_kwargs`; otherwise, each element of `receivers` is related
                                  to the corresponding element in `receivers_kwargs`
+        :param drain: Boolean controlling whether all queued sample-data-chunks of each receiver are retrieved
+                      at once and merged (if True, see `Receiver.pull_available`), or whether a single
+                      sample-data-chunk is retrieved per device (if False, default). Draining lets a consumer
+                      which fell behind real time catch up in one step.
+        :param synchronize: Boolean controlling whether the retrieved data of all devices is aligned on a common
+                            time base by the `synchronizer` (if True, which estimates clock offset and drift of each
+                            device and resamples the data at the `synchronizer.sampling_rate`, i.e. the stored
+                            device-data is resampled as well and the `Channel` sampling rates are set to the
+                            synchronized rate, see `synchronizer`), or whether the data is used as retrieved
+                            (if False, default).
         :return: list of `Device.receive_data()` results, i.e.,
                  list of tuples of (timestamps_device_i, sample_chunk_device_i) arrays, specifying
-                 the timestamps and retrieved device data.
+                 the timestamps and retrieved device data (filtered by the `Device.streaming_filter`s; if
+                 synchronized, all devices share the same timestamps, and the chunks may be empty until all
+                 devices have covered a common instant). If a `recorder` is set, the chunks are recorded as well.
 
         The data-retrieval of each Device is performed in separate `multiprocessing.Process`es
         (using the `Retriever`s' background data-retrieval functionality, eventually, the `stop()` method
@@ -289,13 +421,27 @@ class Setup(Loadable):
             self._receivers = [d.receiver for d in self.devices]
             [r.start() for r in self._receivers]
 
-        chunk_data = [receiver.pull_data() for receiver in self._receivers]
+        if drain:  # wait for at least one chunk per device, but merge all queued chunks
+            chunk_data = [receiver.pull_available(timeout=None) for receiver in self._receivers]
+        else:
+            chunk_data = [receiver.pull_data() for receiver in self._receivers]
+
+        # filter each data-chunk incrementally (see `Device.streaming_filter`)
+        chunk_data = [(time, device.filter_data(value)) for (time, value), device in zip(chunk_data, self.devices)]
 
-        # here data-preprocessing can be done:
-        # - synchronize data of different devices using the time-stamps
-        # - apply filters
+        if synchronize:
+            if self._synchronizer is None:
+                self.synchronizer = Synchronizer(sampling_rates=[max(d.sampling_rates) for d in self.devices])
+
+            timestamps, aligned_data = self._synchronizer.update(chunk_data)
+            chunk_data = [(timestamps, value) for value in aligned_data]
+
+        # here further data-preprocessing can be done
         # - ...
-        for (time, value), device in zip(chunk_data, self.devices):
-            self.append_device_data(value=value, device=device)
+        for i, ((time, value), device) in enumerate(zip(chunk_data, self.devices)):
+            if self._recorder is not None:
+                self._recorder.record_data(i, timestamps=time, data=value)
+
+            self.append_device_data(value=value, device=device, timestamps=time)
 
         return chunk_data
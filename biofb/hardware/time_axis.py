@@ -0,0 +1,42 @@
+from numpy import ndarray, arange
+from collections import OrderedDict
+
+
+TIME_AXIS_CACHE_SIZE = 16
+""" Maximum number of sampling rates whose time axes are kept in the time-axis cache (least recently used are dropped) """
+
+_TIME_AXES = OrderedDict()  # sampling rate -> read-only time axis, extended on demand, in least recently used order
+
+
+def get_time_axis(n_samples: int, sampling_rate: float) -> ndarray:
+    """ Time axis `arange(n_samples) / sampling_rate` of data sampled at `sampling_rate`
+
+    The time axes are cached per sampling rate (one 1D array each, shared by all channels, devices and samples):
+    the time axis of `n_samples` samples is a read-only view on the first `n_samples` entries of the cached axis,
+    which is only regenerated (doubling its length) if more samples are requested, e.g. once the data has grown.
+    At most `TIME_AXIS_CACHE_SIZE` sampling rates are cached, the least recently used axes are released first.
+
+    :param n_samples: Number of samples.
+    :param sampling_rate: Sampling rate in Hz.
+    :return: Read-only 1D view of length `n_samples` (time in seconds relative to the first sample),
+             use `copy()` to obtain a modifiable array.
+    """
+    assert sampling_rate is not None and sampling_rate > 0, f"Invalid sampling rate `{sampling_rate}`."
+
+    axis = _TIME_AXES.get(sampling_rate, None)
+    if axis is None or len(axis) < n_samples:
+        n_cached = 0 if axis is None else len(axis)
+        axis = arange(max(n_samples, 2 * n_cached)) / sampling_rate
+        axis.flags.writeable = False
+        _TIME_AXES[sampling_rate] = axis
+
+    _TIME_AXES.move_to_end(sampling_rate)
+    while len(_TIME_AXES) > TIME_AXIS_CACHE_SIZE:
+        _TIME_AXES.popitem(last=False)
+
+    return axis[:n_samples]
+
+
+def clear_time_axes():
+    """ Release all cached time axes (see `get_time_axis`) """
+    _TIME_AXES.clear()
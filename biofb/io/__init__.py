@@ -1,4 +1,12 @@
 """bio-controller io module"""
 
-from .loadable import Loadable
+from .loadable import Loadable, locate_class
+from .data_buffer import DataBuffer
+from .binary_cache import load_cached, get_cache_filename, remove_stale_caches
+from .data_cache import DataCache, get_nbytes, is_memory_mapped
+from .mapped_array import MappedArray
+from .hdf5 import read_hdf5, create_hdf5_dataset, append_hdf5, actions_to_records, records_to_actions
+from .sample_index import SampleIndex
+from .timestamp_index import TimestampIndex
+from .catalog import read_catalog, write_catalog
 from .session_database import SessionDatabase
@@ -0,0 +1,82 @@
+from numpy import ndarray, asarray, load, save
+from hashlib import sha1
+from glob import glob, escape
+import re
+import os
+
+
+_DIGEST_LENGTH = 12
+
+
+def _digest(value) -> str:
+    """ Short hex digest of the repr of a value """
+    return sha1(repr(value).encode()).hexdigest()[:_DIGEST_LENGTH]
+
+
+def get_cache_filename(filename: str, *key) -> str:
+    """ Filename of the binary (`.npy`) sidecar cache of a data file
+
+    The cache is keyed by an additional `key` (e.g. the loaded columns) and by the size and the modification time
+    of the data file, such that a modified data file (or a different selection) is not served from an outdated
+    cache.
+
+    :param filename: Path to the data file.
+    :param key: Additional (repr-able) key components.
+    :return: Path to the sidecar cache file, i.e. `<filename>.<key hash>.<file-state hash>.npy`.
+    """
+    stat = os.stat(filename)
+    return f"{filename}.{_digest(key)}.{_digest((stat.st_size, stat.st_mtime_ns))}.npy"
+
+
+def remove_stale_caches(filename: str) -> list:
+    """ Remove the sidecar caches of a data file which refer to a former state (size or modification time)
+        of the data file (see `get_cache_filename`)
+
+    :param filename: Path to the data file.
+    :return: List of the removed cache files (caches which are in use, e.g. memory-mapped on Windows, are kept).
+    """
+    stat = os.stat(filename)
+    state = _digest((stat.st_size, stat.st_mtime_ns))
+    pattern = re.compile(rf"\.[0-9a-f]{{{_DIGEST_LENGTH}}}\.([0-9a-f]{{{_DIGEST_LENGTH}}})\.npy")
+
+    removed = []
+    for cache_filename in glob(f"{escape(filename)}.*.*.npy"):
+        match = pattern.fullmatch(cache_filename[len(filename):])
+        if match is None or match.group(1) == state:
+            continue
+
+        try:
+            os.remove(cache_filename)
+            removed.append(cache_filename)
+        except OSError:
+            pass
+
+    return removed
+
+
+def load_cached(filename: str, loader, *key, mmap_mode: (str, None) = 'c') -> ndarray:
+    """ Load data via a binary (`.npy`) sidecar cache of a data file, which is created on first use
+
+    Once the data file has been modified, the outdated sidecar caches of the data file (of any `key`) are removed
+    when the new cache is written (see `remove_stale_caches`), i.e. only caches of the current data file are kept.
+
+    :param filename: Path to the data file.
+    :param loader: Callable without arguments which parses the data file and returns the data array
+                   (only called if no valid cache exists).
+    :param key: Additional (repr-able) key components of the cache (see `get_cache_filename`).
+    :param mmap_mode: Memory-map mode of `numpy.load` (defaults to 'c', i.e. copy-on-write: the cache file is
+                      memory-mapped, modifications of the data are kept in memory only).
+    :return: Memory-mapped data array (or loaded array if `mmap_mode` is None).
+    """
+    cache_filename = get_cache_filename(filename, *key)
+
+    if not os.path.exists(cache_filename):
+        remove_stale_caches(filename)
+
+        temporary_filename = f"{cache_filename}.{os.getpid()}.tmp"
+        with open(temporary_filename, 'wb') as f:
+            save(f, asarray(loader()))
+
+        os.replace(temporary_filename, cache_filename)  # atomic, concurrent readers never see partial caches
+
+    return load(cache_filename, mmap_mode=mmap_mode)
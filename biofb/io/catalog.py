@@ -0,0 +1,155 @@
+from collections import Counter
+from datetime import date, datetime
+import json
+import os
+
+
+CATALOG_VERSION = 2
+SHARED_KEY = '$shared'
+DICT_KEY = '$dict'
+TUPLE_KEY = '$tuple'
+DATE_KEY = '$date'
+DATETIME_KEY = '$datetime'
+JSON_TYPES = (str, int, float, bool, type(None))
+
+
+def get_source_stat(filename: str) -> (list, None):
+    """ Size and modification time of a source file of a catalog (None if the file does not exist) """
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def write_catalog(filename: str, value, sources: (list, tuple)) -> bool:
+    """ Write a compiled (json) catalog of a dict-like `value` which has been compiled from `sources`
+
+    The catalog consists of json lines: a header with the size and modification time of the sources, one line per
+    shared object (containers which are referenced multiple times in `value`, e.g. via yaml anchors, are stored
+    only once) and the value itself.
+
+    Values which json can't represent are tagged such that they are restored by `read_catalog`: tuples, dates and
+    datetimes as well as dicts with non-string keys (or keys starting with `$`). The catalog is not written if
+    the value contains any other type, the source files may be missing (e.g. optional meta-data files), their
+    creation invalidates the catalog.
+
+    :param filename: Path to the catalog file (written atomically).
+    :param value: dict-like value of dicts, lists and tuples, strings, numbers, booleans, dates or None.
+    :param sources: List of the source files of the value.
+    :return: Boolean indicating whether the catalog has been written (False if the value contains unsupported
+             types or the catalog file can't be written).
+    """
+    counts = Counter()
+
+    def count(obj):
+        if isinstance(obj, (dict, list, tuple)):
+            counts[id(obj)] += 1
+            if counts[id(obj)] == 1:
+                for v in (obj.values() if isinstance(obj, dict) else obj):
+                    count(v)
+
+    shared, references = [], {}
+
+    def encode(obj):
+        if isinstance(obj, datetime):
+            return {DATETIME_KEY: obj.isoformat()}
+
+        if isinstance(obj, date):
+            return {DATE_KEY: obj.isoformat()}
+
+        if not isinstance(obj, (dict, list, tuple)):
+            if not isinstance(obj, JSON_TYPES):
+                raise TypeError(f"Type `{type(obj)}` can't be stored in a catalog.")
+
+            return obj
+
+        if id(obj) in references:
+            return {SHARED_KEY: references[id(obj)]}
+
+        if isinstance(obj, dict):
+            if all(isinstance(k, str) and not k.startswith('$') for k in obj):
+                encoded = {k: encode(v) for k, v in obj.items()}
+            else:
+                encoded = {DICT_KEY: [[encode(k), encode(v)] for k, v in obj.items()]}
+
+        elif isinstance(obj, tuple):
+            encoded = {TUPLE_KEY: [encode(v) for v in obj]}
+
+        else:
+            encoded = [encode(v) for v in obj]
+
+        if counts[id(obj)] == 1:
+            return encoded
+
+        # shared objects are stored after the shared objects they refer to
+        references[id(obj)] = len(shared)
+        shared.append(encoded)
+        return {SHARED_KEY: references[id(obj)]}
+
+    try:
+        count(value)
+        value = encode(value)
+        header = dict(version=CATALOG_VERSION, sources=[(s, get_source_stat(s)) for s in sources],
+                      n_shared=len(shared))
+        lines = [json.dumps(line) for line in [header] + shared + [value]]
+
+    except (TypeError, ValueError, OSError):
+        return False
+
+    temporary_filename = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_filename, 'w') as f:
+            f.write('\n'.join(lines))
+
+        os.replace(temporary_filename, filename)  # atomic, concurrent readers never see partial catalogs
+
+    except OSError:
+        return False
+
+    return True
+
+
+def read_catalog(filename: str):
+    """ Read a compiled catalog (see `write_catalog`)
+
+    :param filename: Path to the catalog file.
+    :return: The catalog value, or None if the catalog does not exist, is corrupted or outdated (i.e. one of its
+             source files has been modified).
+    """
+    try:
+        with open(filename, 'r') as f:
+            header = json.loads(f.readline())
+
+            if header.get('version') != CATALOG_VERSION or \
+                    any(get_source_stat(source) != stat for source, stat in header['sources']):
+                return None
+
+            shared = []
+
+            def decode(obj: dict):
+                if len(obj) != 1:
+                    return obj
+
+                key, value = next(iter(obj.items()))
+                if key == SHARED_KEY:
+                    return shared[value]
+                if key == DICT_KEY:
+                    return {k: v for k, v in value}
+                if key == TUPLE_KEY:
+                    return tuple(value)
+                if key == DATE_KEY:
+                    return date.fromisoformat(value)
+                if key == DATETIME_KEY:
+                    return datetime.fromisoformat(value)
+
+                return obj
+
+            for _ in range(header['n_shared']):
+                shared.append(json.loads(f.readline(), object_hook=decode))
+
+            return json.loads(f.readline(), object_hook=decode)
+
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        return None
@@ -0,0 +1,156 @@
+from numpy import ndarray, asarray, empty
+
+
+class DataBuffer(object):
+    """ Preallocated storage for (timestamp-ordered) sample data arrays of shape `(n_samples, n_channels)`.
+
+    The buffer operates in one of two modes:
+
+    - **growable** (`capacity=None`): memory is allocated in blocks which are doubled in size if exhausted,
+      appending a chunk of data is thus an amortized O(1) operation (in contrast to `numpy.concatenate`,
+      which copies the full history on every append).
+    - **ring-buffer** (`capacity=<int>`): only the latest `capacity` samples are kept, older samples are
+      discarded. Twice the capacity is allocated such that the retained samples can always be accessed
+      as one contiguous array (the retained samples are moved to the front of the allocation once the
+      end of the allocation is reached, which again results in an amortized O(1) append).
+
+    The `data` property and the `last` method return **views** on the underlying memory (no copies).
+    Note that views may be invalidated (i.e., refer to outdated memory) once new data is appended.
+    """
+
+    def __init__(self, capacity: (int, None) = None, block_size: int = 4096, data: (ndarray, None) = None):
+        """ Constructs a `DataBuffer` instance
+
+        :param capacity: (Optional) maximum number of retained samples (ring-buffer mode),
+                         defaults to None (growable mode).
+        :param block_size: Minimum number of samples which are allocated at once (int, defaults to 4096).
+        :param data: (Optional) initial data array which is copied into the buffer.
+        """
+
+        assert capacity is None or capacity > 0, f"Capacity must be positive (provided `{capacity}`)."
+        assert block_size > 0, f"Block size must be positive (provided `{block_size}`)."
+
+        self._capacity = capacity
+        self._block_size = block_size
+
+        self._memory = None  # allocated array
+        self._start = 0      # first valid sample in memory
+        self._end = 0        # one past the last valid sample in memory
+        self._view = None    # cached view on valid samples
+
+        if data is not None:
+            self.append(data)
+
+    @property
+    def capacity(self) -> (int, None):
+        """ Maximum number of retained samples (or None, if the buffer is growable) """
+        return self._capacity
+
+    @property
+    def allocated(self) -> int:
+        """ Number of allocated samples """
+        return 0 if self._memory is None else len(self._memory)
+
+    @property
+    def nbytes(self) -> int:
+        """ Number of allocated bytes """
+        return 0 if self._memory is None else self._memory.nbytes
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def data(self) -> (ndarray, None):
+        """ View on the retained samples of the buffer (None if no data has been appended so far) """
+        if self._memory is None:
+            return None
+
+        if self._view is None:
+            self._view = self._memory[self._start:self._end]
+
+        return self._view
+
+    def last(self, n_samples: int) -> (ndarray, None):
+        """ View on the last `n_samples` retained samples of the buffer
+
+        :param n_samples: Number of samples (int).
+        :return: View on the last `n_samples` (or fewer, if less samples are available) of the buffer.
+        """
+        if self._memory is None:
+            return None
+
+        n_samples = max(0, min(int(n_samples), len(self)))
+        return self._memory[self._end - n_samples:self._end]
+
+    def clear(self):
+        """ Discard all retained samples (the allocated memory is kept) """
+        self._start = self._end = 0
+        self._view = None
+
+    def append(self, value: (ndarray, list)) -> ndarray:
+        """ Append data chunk to the buffer
+
+        :param value: Array-like data chunk of shape `(n_samples, ...)`, the trailing dimensions need
+                      to agree with previously appended data.
+        :return: View on the retained samples of the buffer (see `data` property).
+        """
+        value = asarray(value)
+        if value.ndim == 0:
+            value = value.reshape(1)
+
+        n = len(value)
+        if n == 0:
+            return self.data
+
+        if self._memory is None:
+            self._allocate(shape=value.shape[1:], dtype=value.dtype, n_required=n)
+
+        elif value.shape[1:] != self._memory.shape[1:]:
+            raise ValueError(f"Shape mismatch: cannot append data of shape {value.shape} "
+                             f"to buffer of shape {self._memory.shape}.")
+
+        if self._capacity is not None and n >= self._capacity:
+            # the chunk replaces all retained samples
+            self._memory[:self._capacity] = value[-self._capacity:]
+            self._start, self._end = 0, self._capacity
+
+        else:
+            if self._end + n > len(self._memory):
+                self._make_room(n)
+
+            self._memory[self._end:self._end + n] = value
+            self._end += n
+
+            if self._capacity is not None and self._end - self._start > self._capacity:
+                self._start = self._end - self._capacity
+
+        self._view = None
+        return self.data
+
+    def _allocate(self, shape: tuple, dtype, n_required: int):
+        """ Initial memory allocation """
+        if self._capacity is not None:
+            n_allocate = 2 * self._capacity
+        else:
+            n_allocate = max(self._block_size, 2 * n_required)
+
+        self._memory = empty((n_allocate, *shape), dtype=dtype)
+        self._start = self._end = 0
+
+    def _make_room(self, n: int):
+        """ Make room for `n` additional samples at the end of the memory, either by moving the retained samples
+            to the front of the allocation (ring-buffer mode) or by reallocating a larger memory block """
+        n_keep = self._end - self._start
+
+        if self._capacity is not None:
+            # only keep samples which are retained after appending n samples
+            n_keep = min(n_keep, self._capacity - n)
+            self._memory[:n_keep] = self._memory[self._end - n_keep:self._end]
+
+        else:
+            memory = empty((max(2 * len(self._memory), 2 * (n_keep + n)), *self._memory.shape[1:]),
+                           dtype=self._memory.dtype)
+            memory[:n_keep] = self._memory[self._start:self._end]
+            self._memory = memory
+
+        self._start, self._end = 0, n_keep
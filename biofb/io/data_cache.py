@@ -0,0 +1,114 @@
+from numpy import ndarray, memmap
+from collections import OrderedDict
+from mmap import mmap
+
+
+def is_memory_mapped(data: ndarray) -> bool:
+    """ Boolean indicating whether an array is (a view on) a memory-mapped file """
+    base = data
+    while isinstance(base, ndarray):
+        if isinstance(base, memmap):
+            return True
+        base = base.base
+
+    return isinstance(base, mmap)
+
+
+def get_nbytes(data: (ndarray, list, tuple, None)) -> int:
+    """ Number of in-memory bytes of a (list of) data array(s)
+
+    Memory-mapped arrays are backed by their file (pages are loaded on demand and can be dropped by the OS)
+    and thus don't count towards the in-memory size.
+    """
+    if data is None:
+        return 0
+
+    if isinstance(data, (list, tuple)):
+        return sum(get_nbytes(d) for d in data)
+
+    if not isinstance(data, ndarray) or is_memory_mapped(data):
+        return 0
+
+    return data.nbytes
+
+
+class DataCache(object):
+    """ Least-recently-used (LRU) byte budget for lazily loaded data
+
+    Owners of loaded data (e.g. `biofb.session.Sample`s) `touch` the cache whenever their data is accessed.
+    If the total number of in-memory bytes of all registered owners exceeds `max_bytes`, the least recently
+    used owners are evicted, i.e. their `unload_data` method is called, which releases the data such that it
+    is reloaded upon the next access. The most recently touched owner is never evicted.
+    """
+
+    def __init__(self, max_bytes: (int, None) = None):
+        """ Constructs a `DataCache` instance
+
+        :param max_bytes: (Optional) Maximum number of in-memory bytes of all loaded data
+                          (defaults to None, i.e. loaded data is never evicted).
+        """
+        self._owners = OrderedDict()  # id(owner) -> (owner, nbytes), least recently used first
+        self._nbytes = 0
+        self._max_bytes = None
+        self.max_bytes = max_bytes
+
+    @property
+    def max_bytes(self) -> (int, None):
+        """ Maximum number of in-memory bytes of all loaded data (None if unbounded) """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: (int, None)):
+        assert value is None or value >= 0, f"Byte budget must be non-negative (provided `{value}`)."
+        self._max_bytes = value
+        self.evict()
+
+    @property
+    def nbytes(self) -> int:
+        """ Number of in-memory bytes of all loaded data """
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._owners)
+
+    def __contains__(self, owner) -> bool:
+        return id(owner) in self._owners
+
+    def touch(self, owner, nbytes: int):
+        """ Mark the data of `owner` as most recently used and evict least recently used data beyond the budget
+
+        :param owner: Owner of the loaded data, providing an `unload_data` method.
+        :param nbytes: Number of in-memory bytes of the owner's data (see `get_nbytes`).
+        """
+        key = id(owner)
+        entry = self._owners.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry[1]
+
+        self._owners[key] = (owner, nbytes)
+        self._nbytes += nbytes
+        self.evict()
+
+    def discard(self, owner):
+        """ Remove `owner` from the cache (without unloading its data) """
+        entry = self._owners.pop(id(owner), None)
+        if entry is not None:
+            self._nbytes -= entry[1]
+
+    def evict(self):
+        """ Unload the least recently used data until the budget is met (keeps the most recently used data) """
+        if self._max_bytes is None:
+            return
+
+        while self._nbytes > self._max_bytes and len(self._owners) > 1:
+            _, (owner, nbytes) = self._owners.popitem(last=False)
+            self._nbytes -= nbytes
+            owner.unload_data()
+
+    def clear(self):
+        """ Unload all cached data """
+        while self._owners:
+            _, (owner, nbytes) = self._owners.popitem(last=False)
+            owner.unload_data()
+
+        self._nbytes = 0
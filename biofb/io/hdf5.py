@@ -0,0 +1,171 @@
+from numpy import ndarray, memmap, asarray, empty, isnan, nan, dtype as np_dtype, prod
+from numbers import Number
+import h5py
+
+
+HDF5_CHUNK_BYTES = 2 ** 17  # targeted size of a dataset chunk (128 kB)
+
+
+def get_chunk_shape(shape: tuple, dtype, chunk_size: (int, None) = None) -> tuple:
+    """ Chunk shape of a dataset whose first axis is the (growing) time axis
+
+    :param shape: Shape of the dataset, i.e. `(n_samples, ...)`.
+    :param dtype: Data type of the dataset.
+    :param chunk_size: (Optional) Number of samples per chunk (defaults to None, i.e. chunks of
+                       about `HDF5_CHUNK_BYTES` bytes).
+    :return: Chunk shape, i.e. `(chunk_size, ...)`.
+    """
+    if chunk_size is None:
+        sample_bytes = np_dtype(dtype).itemsize * int(prod(shape[1:]))
+        chunk_size = max(1, HDF5_CHUNK_BYTES // max(sample_bytes, 1))
+
+    return (int(chunk_size), ) + tuple(shape[1:])
+
+
+def create_hdf5_dataset(group: h5py.Group, name: str, data: (ndarray, None) = None, shape: (tuple, None) = None,
+                        dtype=None, chunked: bool = True, chunk_size: (int, None) = None,
+                        compression: (str, None) = None, compression_opts=None, shuffle: bool = False) -> h5py.Dataset:
+    """ Create a dataset whose first axis is the time axis (replaces an existing dataset of the same name)
+
+    Chunked datasets are resizable along the time axis (see `append_hdf5`), optionally compressed, and reads of
+    a time range only touch the chunks covering the range. Contiguous datasets can be memory-mapped (see `read_hdf5`).
+
+    :param group: HDF5 group (or file) of the dataset.
+    :param name: Name of the dataset.
+    :param data: (Optional) Initial data of shape `(n_samples, ...)`.
+    :param shape: (Optional) Initial shape of the dataset (defaults to None, i.e. the shape of the `data`).
+    :param dtype: (Optional) Data type of the dataset (defaults to None, i.e. the data type of the `data`).
+    :param chunked: Boolean controlling whether the dataset is chunked and resizable (defaults to True)
+                    or contiguous (if False).
+    :param chunk_size: (Optional) Number of samples per chunk (see `get_chunk_shape`).
+    :param compression: (Optional) Compression filter of chunked datasets, e.g. 'lzf' (fast) or 'gzip'
+                        (defaults to None, i.e. uncompressed).
+    :param compression_opts: (Optional) Compression options, e.g. the gzip level (0-9).
+    :param shuffle: Boolean controlling whether the byte-shuffle filter is applied before compression
+                    (improves the compression ratio of numeric data, defaults to False).
+    :return: The created `h5py.Dataset`.
+    """
+    if data is not None:
+        data = asarray(data)
+        shape = data.shape if shape is None else shape
+        dtype = data.dtype if dtype is None else dtype
+
+    assert shape is not None, "Either `data` or `shape` needs to be specified."
+    shape = tuple(shape)
+
+    if name in group:
+        del group[name]
+
+    if not chunked:
+        assert compression is None and not shuffle, "Compression requires a chunked dataset."
+        return group.create_dataset(name, shape=shape, dtype=dtype, data=data)
+
+    return group.create_dataset(name, shape=shape, dtype=dtype, data=data,
+                                maxshape=(None, ) + shape[1:], chunks=get_chunk_shape(shape, dtype, chunk_size),
+                                compression=compression, compression_opts=compression_opts, shuffle=shuffle)
+
+
+def append_hdf5(dataset: h5py.Dataset, data: ndarray) -> int:
+    """ Append data along the time axis of a chunked (resizable) dataset (see `create_hdf5_dataset`)
+
+    :param dataset: Resizable `h5py.Dataset`.
+    :param data: Data of shape `(n_samples, ...)`.
+    :return: The number of samples of the dataset after appending.
+    """
+    data = asarray(data)
+    n, m = len(dataset), len(data)
+    if m == 0:
+        return n
+
+    dataset.resize(n + m, axis=0)
+    dataset[n:n + m] = data
+
+    return n + m
+
+
+def read_hdf5(filename: str, key: str, names: (list, tuple), mmap_mode: (str, None) = 'c') -> list:
+    """ Read the datasets `names` of the group `key` of an HDF5 file
+
+    Contiguous, uncompressed datasets are memory-mapped (no data is read until it is accessed), chunked or
+    compressed datasets are read into memory. Missing datasets (e.g. devices without data, see
+    `biofb.session.Sample.dump_data`) are returned as None.
+
+    :param filename: Path to the HDF5 file.
+    :param key: Group of the datasets in the HDF5 file.
+    :param names: Names of the datasets in the group.
+    :param mmap_mode: Memory-map mode of the memory-mapped datasets (see `numpy.memmap`, defaults to 'c', i.e.
+                      copy-on-write: modifications of the data are kept in memory only). If None, all datasets
+                      are read into memory.
+    :return: List of (memory-mapped) data arrays (or None), one for each name.
+    """
+    data = []
+
+    with h5py.File(filename, 'r') as h5:
+        group = h5[key]
+
+        for name in names:
+            if name not in group:
+                data.append(None)
+                continue
+
+            dataset = group[name]
+            offset = dataset.id.get_offset()
+
+            if mmap_mode is not None and offset is not None and dataset.chunks is None and dataset.size > 0:
+                data.append(memmap(filename, dtype=dataset.dtype, mode=mmap_mode, offset=offset, shape=dataset.shape))
+            else:
+                data.append(dataset[()])
+
+    return data
+
+
+def actions_to_records(action_data: list) -> ndarray:
+    """ Convert action data, i.e. a list of `(timestamp, *action_values)` tuples, to a structured array
+
+    The structured array has the fields `timestamp`, `length` (number of action values), `values` (numeric
+    action values, NaN otherwise) and `labels` (utf-8 encoded string representation of non-numeric action
+    values, empty otherwise).
+    """
+    actions = []
+    for timestamp, *action in action_data:
+        if len(action) == 1 and (not hasattr(action[0], '__iter__') or isinstance(action[0], (str, bytes))):
+            action = action[:1]  # single action value
+        elif len(action) == 1:
+            action = list(action[0])  # iterable action, e.g. (key, action_value) pairs
+
+        labels = [b'' if v is None or isinstance(v, Number) else str(v).encode() for v in action]
+        values = [float(v) if isinstance(v, Number) else nan for v in action]
+        actions.append((timestamp, values, labels))
+
+    width = max([len(values) for _, values, _ in actions] + [1])
+    label_size = max([len(label) for _, _, labels in actions for label in labels] + [1])
+
+    records = empty(len(actions), dtype=[('timestamp', 'f8'), ('length', 'i4'), ('values', 'f8', (width, )),
+                                         ('labels', f'S{label_size}', (width, ))])
+    records['values'] = nan
+    records['labels'] = b''
+
+    for record, (timestamp, values, labels) in zip(records, actions):
+        record['timestamp'] = timestamp
+        record['length'] = len(values)
+        record['values'][:len(values)] = values
+        record['labels'][:len(labels)] = labels
+
+    return records
+
+
+def records_to_actions(records: ndarray) -> list:
+    """ Convert a structured array of actions (see `actions_to_records`) to a list of
+        `(timestamp, *action_values)` tuples (`None`-values are restored as `None`) """
+    action_data = []
+    for record in records:
+        action = []
+        for value, label in zip(record['values'][:record['length']], record['labels'][:record['length']]):
+            if len(label) > 0:
+                action.append(label.decode())
+            else:
+                action.append(None if isnan(value) else float(value))
+
+        action_data.append((float(record['timestamp']), *action))
+
+    return action_data
@@ -5,6 +5,32 @@ import csv
 import inspect
 import h5py
 import numpy as np
+from pydoc import locate
+from functools import lru_cache
+from collections import OrderedDict
+from copy import deepcopy
+import threading
+
+
+_PARAMETERS = {}  # Loadable class -> tuple of the parameter names of its constructor (see `get_parameters`)
+_MISSING = object()
+
+YAML_SAFE_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)  # libyaml-based loader, if available
+
+DICT_LIKE_FORMATS = {'.json': 'json', '.yml': 'yml', '.yaml': 'yml', '.csv': 'csv',
+                     '.h5': 'h5', '.hdf5': 'h5', '.h5py': 'h5'}
+HDF5_SIGNATURE = b'\x89HDF\r\n\x1a\n'
+
+DICT_LIKE_CACHE_SIZE = 1024  # number of cached parsed files (see `Loadable.read_dict_like_cached`)
+DICT_LIKE_CACHE_MAX_BYTES = 2 ** 20  # larger files are not cached
+_DICT_LIKE_CACHE = OrderedDict()  # (path, index) -> (mtime, size, parsed value)
+_DICT_LIKE_CACHE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def locate_class(name: str) -> type:
+    """ Locate a class by its import path (cached `pydoc.locate`) """
+    return locate(name)
 
 
 class Loadable(object):
@@ -18,19 +44,26 @@ class Loadable(object):
     def __init__(self, *args, **kwargs):
         pass
 
-    def to_dict(self):
-        signature = inspect.signature(self.__init__)
-        parameters = [p for p in signature.parameters]
-        # defaults = [signature.parameters[p].default for p in parameters]
+    @classmethod
+    def get_parameters(cls) -> tuple:
+        """ Parameter names of the constructor of the class (evaluated once per class) """
+        parameters = _PARAMETERS.get(cls, None)
+        if parameters is None:
+            parameters = tuple(inspect.signature(cls.__init__).parameters)[1:]  # without `self`
+            _PARAMETERS[cls] = parameters
 
-        # return {p: getattr(self, p)
-        #         for p, d in zip(parameters, defaults)
-        #         if getattr(self, p) is not d and getattr(self, p) != d}
+        return parameters
 
+    def to_dict(self):
         dict_repr = {}
-        for p in parameters:
+        for p in self.get_parameters():
             try:
-                v = getattr(self, p, getattr(self, '_'+p))
+                # parameters are represented if the respective private attribute exists
+                private = getattr(self, '_' + p, _MISSING)
+                if private is _MISSING:
+                    continue
+
+                v = getattr(self, p, private)
                 if isinstance(v, Loadable):
                     v = v.to_dict()
                 elif isinstance(v, list):
@@ -58,6 +91,9 @@ class Loadable(object):
         :param value: dict-like representation of Loadable object to be loaded.
         :return: cls instance of provided dict-representation.
         """
+        if type(value) is dict:  # fast path, e.g. when loading a database
+            return cls(**value)
+
         if value is None:
             return cls()
 
@@ -173,12 +209,106 @@ class Loadable(object):
 
         return [value_dict[k] for k in key_order]
 
+    @staticmethod
+    def get_file_format(filename: str) -> str:
+        """ Format of a dict-like file ('json', 'yml', 'csv' or 'h5'), detected by its extension or, for unknown
+            extensions, by its first bytes (HDF5 signature, json objects/arrays, yaml otherwise) """
+        extension = os.path.splitext(filename)[1].lower()
+        if extension in DICT_LIKE_FORMATS:
+            return DICT_LIKE_FORMATS[extension]
+
+        with open(filename, 'rb') as f:
+            head = f.read(512)
+
+        if head.startswith(HDF5_SIGNATURE) or (b'\x00' in head and h5py.is_hdf5(filename)):
+            return 'h5'
+
+        if head.lstrip()[:1] in (b'{', b'['):
+            return 'json'
+
+        return 'yml'
+
+    @staticmethod
+    def read_dict_like(filename: str, file_format: (str, None) = None, index=None) -> (dict, list):
+        """ Parse a dict-like file with the parser of its format (see `get_file_format`)
+
+        Text files whose content does not match the detected format are parsed as yaml (json files) and as
+        csv (yaml files which don't represent a dict or list).
+
+        :param filename: Path to the dict-like file (yml, json, csv, hdf5).
+        :param file_format: (Optional) Format of the file (defaults to None, i.e. detected).
+        :param index: (Optional) index of dict to load from list of dicts (e.g. form csv-file)
+        :return: Parsed dict (or list) representation.
+        """
+        if file_format is None:
+            file_format = Loadable.get_file_format(filename)
+
+        if file_format == 'h5':
+            with h5py.File(filename, 'r') as h5:
+                return Loadable.recursively_load_dict_contents_from_group(h5, '/')
+
+        if file_format == 'json':
+            try:
+                with open(filename, 'r') as s:
+                    return json.load(s)
+            except ValueError:
+                file_format = 'yml'
+
+        if file_format == 'yml':
+            try:
+                with open(filename, 'r') as s:
+                    loaded = yaml.load(s, Loader=YAML_SAFE_LOADER)
+
+                if isinstance(loaded, (dict, list)):
+                    return loaded
+            except yaml.YAMLError:
+                pass
+
+        with open(filename, 'r') as s:
+            data = [line for line in csv.DictReader(s)]
+
+        if index is not None:
+            return data[index]
+
+        return Loadable.list_of_dicts_to_dict_of_lists(data)
+
+    @staticmethod
+    def read_dict_like_cached(filename: str, index=None) -> (dict, list):
+        """ Parse a dict-like file (see `read_dict_like`), parsed results of small files (up to
+            `DICT_LIKE_CACHE_MAX_BYTES`) are cached per path, modification time and size
+
+        :return: Parsed representation (a copy, i.e. it may be modified by the caller).
+        """
+        stat = os.stat(filename)
+        if stat.st_size > DICT_LIKE_CACHE_MAX_BYTES:
+            return Loadable.read_dict_like(filename, index=index)
+
+        key = (filename, index)
+        with _DICT_LIKE_CACHE_LOCK:
+            cached = _DICT_LIKE_CACHE.get(key, None)
+
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            cached = (stat.st_mtime_ns, stat.st_size, Loadable.read_dict_like(filename, index=index))
+
+        with _DICT_LIKE_CACHE_LOCK:
+            _DICT_LIKE_CACHE[key] = cached
+            _DICT_LIKE_CACHE.move_to_end(key)
+            while len(_DICT_LIKE_CACHE) > DICT_LIKE_CACHE_SIZE:
+                _DICT_LIKE_CACHE.popitem(last=False)
+
+        return deepcopy(cached[2])
+
     @classmethod
-    def load_dict_like(cls, value: (str, dict), index=None) -> dict:
+    def load_dict_like(cls, value: (str, dict), index=None, cache: bool = True) -> dict:
         """ Load dict-like object via provided value_dict (path, yaml, json, repr, ...)
 
+        Files are parsed by the parser of their format, which is detected by the file extension or the
+        first bytes of the file (see `get_file_format`).
+
         :param value: Dict-like object or path to dict-like representation (path, yaml, json, repr, ...)
         :param index: (Optional) index of dict to load from list of dicts (e.g. form csv-file)
+        :param cache: Boolean controlling whether parsed files are cached (see `read_dict_like_cached`,
+                      defaults to True).
         :return: Dictionary representation of value_dict
         """
 
@@ -194,34 +324,24 @@ class Loadable(object):
             if os.path.exists(value) or os.path.exists(os.path.abspath(value)):
                 value = os.path.abspath(value)
 
-                try:
-                    loaded = json.loads(value)
-                except ValueError:
-                    try:
-                        with open(value, 'r') as s:
-                            loaded = yaml.safe_load(s)
-
-                        assert isinstance(loaded, dict) or isinstance(loaded, list)
+                if cache:
+                    loaded = Loadable.read_dict_like_cached(value, index=index)
+                else:
+                    loaded = Loadable.read_dict_like(value, index=index)
 
-                    except:
-                        try:
-                            with open(value, 'r') as s:
-                                data = [line for line in csv.DictReader(s)]
-                                if index is not None:
-                                    loaded = data[index]
-                                else:
-                                    loaded = Loadable.list_of_dicts_to_dict_of_lists(data)
-                        except:
-                            with h5py.File(value, 'r') as h5:
-                                loaded = Loadable.recursively_load_dict_contents_from_group(h5, '/')
             elif value:
                 try:
-                    loaded = json.loads(value)
+                    if value.lstrip()[:1] in ('{', '['):
+                        loaded = json.loads(value)
+                    else:
+                        loaded = yaml.load(value, Loader=YAML_SAFE_LOADER)
                 except ValueError:
                     try:
-                        loaded = yaml.safe_load(value)
+                        loaded = yaml.load(value, Loader=YAML_SAFE_LOADER)
                     except Exception:
                         pass
+                except Exception:
+                    pass
             else:
                 loaded = dict()
 
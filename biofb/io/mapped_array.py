@@ -0,0 +1,132 @@
+from numpy import ndarray, memmap, dtype as np_dtype, prod, load
+from mmap import mmap
+
+
+class MappedArray(object):
+    """ Picklable reference to a C-ordered array in a binary file, which is memory-mapped slice by slice
+
+    Only the file name, data type, shape and file offset of the array are pickled, i.e. the array can be passed to
+    other processes (e.g. via a `multiprocessing.Queue`) without copying its data, and the receiving process maps
+    the data itself. Each slice (see `read` and `iter_slices`) is a separate read-only memory-map of its part of the
+    file, which is released once the slice is no longer referenced, i.e. iterating over all slices of an array
+    requires a constant amount of memory, independent of the file size.
+    """
+
+    SLICE_BYTES = 2 ** 20
+    """ Approximate number of bytes per slice when iterating over a mapped array """
+
+    def __init__(self, filename: str, dtype, shape: tuple, offset: int = 0):
+        """ Constructs a MappedArray instance
+
+        :param filename: Path to the binary file.
+        :param dtype: Data type of the array.
+        :param shape: Shape of the (C-ordered) array.
+        :param offset: Offset in bytes of the array in the file (defaults to 0).
+        """
+        assert len(shape) > 0, "Mapped arrays need at least one dimension."
+        assert offset >= 0, f"Offset must not be negative (provided `{offset}`)."
+
+        self._filename = filename
+        self._dtype = np_dtype(dtype)
+        self._shape = tuple(int(s) for s in shape)
+        self._offset = int(offset)
+
+    def __repr__(self):
+        return f"<MappedArray: {self._shape} {self._dtype} at {self._filename}:{self._offset}>"
+
+    def __len__(self):
+        return self._shape[0]
+
+    def __iter__(self):
+        """ Iterate over the rows of the array (mapped slice by slice) """
+        for data in self.iter_slices():
+            yield from data
+
+    def __getitem__(self, item: slice) -> memmap:
+        """ Map a contiguous slice of rows (see `read`) """
+        assert isinstance(item, slice) and item.step in (None, 1), "Only contiguous slices of rows can be mapped."
+        return self.read(*item.indices(len(self))[:2])
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def shape(self) -> tuple:
+        return self._shape
+
+    @property
+    def ndim(self) -> int:
+        return len(self._shape)
+
+    @property
+    def offset(self) -> int:
+        return self._offset
+
+    @property
+    def row_nbytes(self) -> int:
+        """ Number of bytes per row (i.e. per element of the first axis) """
+        return int(prod(self._shape[1:], dtype=int)) * self._dtype.itemsize
+
+    @property
+    def nbytes(self) -> int:
+        return len(self) * self.row_nbytes
+
+    def read(self, start: int = 0, stop: (int, None) = None) -> (memmap, ndarray):
+        """ Map the rows `[start, stop)` of the array (read-only)
+
+        :param start: Index of the first row (defaults to 0).
+        :param stop: Index after the last row (defaults to None, i.e. the length of the array).
+        :return: read-only `numpy.memmap` of the rows (an empty array if there are no rows).
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        start = min(max(start, 0), stop)
+
+        if start == stop or self.row_nbytes == 0:
+            return ndarray((stop - start, *self._shape[1:]), dtype=self._dtype)
+
+        return memmap(self._filename, dtype=self._dtype, mode='r', offset=self._offset + start * self.row_nbytes,
+                      shape=(stop - start, *self._shape[1:]))
+
+    def iter_slices(self, n_rows: (int, None) = None):
+        """ Iterate over consecutive slices of rows, each mapped separately
+
+        :param n_rows: (Optional) Number of rows per slice (defaults to None, i.e. about `SLICE_BYTES` per slice).
+        """
+        if n_rows is None:
+            n_rows = max(self.SLICE_BYTES // max(self.row_nbytes, 1), 1)
+
+        for start in range(0, len(self), n_rows):
+            yield self.read(start, start + n_rows)
+
+    @classmethod
+    def from_array(cls, array: ndarray) -> 'MappedArray':
+        """ Reference to a C-contiguous (view on a) memory-mapped array, e.g. loaded via `numpy.load(mmap_mode=...)`
+
+        :param array: C-contiguous `numpy.memmap` or view thereof.
+        :return: `MappedArray` of the same data in the mapped file.
+        """
+        assert array.flags.c_contiguous, "Only C-contiguous arrays can be referenced."
+
+        # the outermost memmap is created on the memory-map of the file (its offset is the file offset of its data)
+        root = array
+        while isinstance(root.base, ndarray):
+            root = root.base
+        assert isinstance(root, memmap) and isinstance(root.base, mmap) and root.filename is not None, \
+            "Only memory-mapped arrays of files can be referenced."
+
+        offset = root.offset + (array.__array_interface__['data'][0] - root.__array_interface__['data'][0])
+        return cls(filename=root.filename, dtype=array.dtype, shape=array.shape, offset=offset)
+
+    @classmethod
+    def from_file(cls, filename: str) -> 'MappedArray':
+        """ Reference to the (C-ordered) array of a `.npy` file (e.g. a binary cache, see `biofb.io.load_cached`)
+
+        :param filename: Path to the `.npy` file.
+        :return: `MappedArray` of the array in the file.
+        """
+        return cls.from_array(load(filename, mmap_mode='r'))  # maps the file, no data are read
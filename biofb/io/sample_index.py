@@ -0,0 +1,124 @@
+from numpy import ndarray, asarray, array, argsort, searchsorted, intersect1d, unique, concatenate, arange, sort, inf
+from collections import defaultdict
+from datetime import datetime, date
+
+
+class SampleIndex(object):
+    """ Metadata query index of a list of `biofb.session.Sample`s
+
+    The index consists of hash indexes (value -> sorted sample indices) of the subject identity, the setting,
+    location and controller names and the device names of each sample, and of a sorted timestamp index for
+    range queries. A query intersects the (sorted) candidate indices of all specified criteria, starting with
+    the most selective one, without touching the samples themselves.
+
+    The index reflects the meta-data at construction time, it has to be rebuilt if the meta-data of the
+    indexed samples is modified.
+    """
+
+    KEYS = ('subject', 'setting', 'location', 'controller', 'device')
+
+    def __init__(self, samples: (list, tuple) = ()):
+        """ Constructs a `SampleIndex` instance
+
+        :param samples: List of `biofb.session.Sample` instances to be indexed.
+        """
+        hash_lists = {key: defaultdict(list) for key in self.KEYS}
+        timestamps = []
+
+        for i, sample in enumerate(samples):
+            for key, values in self.get_keys(sample).items():
+                for value in values:
+                    hash_lists[key][value].append(i)
+
+            timestamps.append(sample.timestamp)
+
+        self._n_samples = len(timestamps)
+        self._hash = {key: {value: array(indices, dtype=int) for value, indices in values.items()}
+                      for key, values in hash_lists.items()}
+
+        timestamps = asarray(timestamps, dtype=float)
+        self._timestamp_order = argsort(timestamps, kind='stable')
+        self._timestamps = timestamps[self._timestamp_order]
+
+    @staticmethod
+    def get_keys(sample) -> dict:
+        """ Indexed meta-data of a sample, i.e. a dict of key -> list of values (see `KEYS`) """
+        setting = sample.setting
+        location = getattr(setting, 'location', None)
+        controller = getattr(setting, 'controller', None)
+
+        return dict(
+            subject=[sample.subject.identity],
+            setting=[getattr(setting, 'name', None)],
+            location=[getattr(location, 'name', None)],
+            controller=[getattr(controller, 'name', None)],
+            device=list({d.name for d in sample.setup.devices}),
+        )
+
+    def __len__(self):
+        return self._n_samples
+
+    def values(self, key: str) -> list:
+        """ List of all indexed values of a meta-data `key` (see `KEYS`) """
+        assert key in self._hash, f"Unknown index key `{key}`, use one of {self.KEYS}."
+        return list(self._hash[key].keys())
+
+    @staticmethod
+    def to_timestamp(value: (int, float, str, datetime, date, None), default: float) -> float:
+        """ Convert a time specification (timestamp, `datetime`, `date` or iso-format string) to a timestamp """
+        if value is None:
+            return default
+
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+
+        if isinstance(value, date) and not isinstance(value, datetime):
+            value = datetime(value.year, value.month, value.day)
+
+        if isinstance(value, datetime):
+            return value.timestamp()
+
+        return float(value)
+
+    def query(self, start=None, stop=None, **criteria) -> ndarray:
+        """ Indices of all samples matching the specified criteria
+
+        :param start: (Optional) Earliest timestamp (inclusive) of the selected samples (timestamp, `datetime`,
+                      `date` or iso-format string, defaults to None, i.e. unbounded).
+        :param stop: (Optional) Latest timestamp (exclusive) of the selected samples (defaults to None, i.e. unbounded).
+        :param criteria: Value (or list of alternative values) of meta-data keys (see `KEYS`), e.g.
+                         `subject='Test Person', device=['Bioplux', 'Unicorn']`. Criteria which are None are ignored.
+        :return: Sorted array of the sample indices.
+        """
+        candidates = []
+
+        for key, value in criteria.items():
+            if value is None:
+                continue
+
+            assert key in self._hash, f"Unknown index key `{key}`, use one of {self.KEYS}."
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            matches = [self._hash[key][v] for v in values if v in self._hash[key]]
+
+            if len(matches) == 0:
+                return array([], dtype=int)
+
+            candidates.append(matches[0] if len(matches) == 1 else unique(concatenate(matches)))
+
+        if start is not None or stop is not None:
+            lower = searchsorted(self._timestamps, self.to_timestamp(start, -inf), side='left')
+            upper = searchsorted(self._timestamps, self.to_timestamp(stop, inf), side='left')
+            candidates.append(sort(self._timestamp_order[lower:upper]))
+
+        if len(candidates) == 0:
+            return arange(self._n_samples)
+
+        # intersect starting with the most selective criterion
+        candidates.sort(key=len)
+        indices = candidates[0]
+        for c in candidates[1:]:
+            if len(indices) == 0:
+                break
+            indices = intersect1d(indices, c, assume_unique=True)
+
+        return indices
@@ -1,9 +1,17 @@
 from __future__ import annotations
-from biofb.io import Loadable
+from biofb.io import Loadable, locate_class
+from biofb.io import DataCache
+from biofb.io import SampleIndex
+from biofb.io import read_catalog, write_catalog
 from os import path
 import yaml
 from collections import OrderedDict
-from pydoc import locate
+from numpy import ndarray
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections.abc import Hashable
+
+
+YAML_LOADER = getattr(yaml, 'CLoader', yaml.Loader)  # libyaml-based loader, if available
 
 
 class SessionDatabase(Loadable):
@@ -18,10 +26,21 @@ class SessionDatabase(Loadable):
         ("settings", "biofb.session.Setting"),
     ))
 
-    def __init__(self, samples: (list, tuple) = (), **kwargs):
+    def __init__(self, samples: (list, tuple) = (), max_bytes: (int, None) = None, **kwargs):
+        """ Constructs a `SessionDatabase` instance
+
+        :param samples: List of `Sample` instances (or `dict` representations).
+        :param max_bytes: (Optional) Byte budget of the loaded sample data (see `data_cache`,
+                          defaults to None, i.e. unbounded).
+        :param kwargs: Further database entries (such as `meta_data`).
+        """
 
         Loadable.__init__(self)
 
+        self._data_cache = DataCache(max_bytes=max_bytes)
+        self._load_errors = {}
+        self._index = None
+
         self._samples = None
         self.samples = samples
 
@@ -39,6 +58,60 @@ class SessionDatabase(Loadable):
             return
 
         self._samples = [(m if isinstance(m, Sample) else Sample(**m)) for m in value]
+        self._index = None
+
+    def __len__(self):
+        return len(self._samples)
+
+    @property
+    def index(self) -> SampleIndex:
+        """ Metadata query index of the samples (see `biofb.io.SampleIndex`), built upon first use """
+        if self._index is None:
+            self._index = SampleIndex(self._samples)
+
+        return self._index
+
+    def reindex(self):
+        """ Rebuild the metadata query `index` (required if the meta-data of the samples has been modified) """
+        self._index = None
+
+    def select(self, indices: (list, tuple, ndarray)) -> SessionDatabase:
+        """ `SessionDatabase` of the samples with the specified indices
+
+        The samples are not copied and their data is not loaded, i.e. the selection shares the (lazily loaded)
+        samples and the `data_cache` of this database.
+        """
+        selection = SessionDatabase(samples=[self._samples[i] for i in indices], **self.other_kwargs)
+        selection._data_cache = self._data_cache
+        return selection
+
+    def query(self, start=None, stop=None, **criteria) -> SessionDatabase:
+        """ Select the samples matching the specified meta-data criteria via the metadata query `index`
+
+        Example: `db.query(subject='Test Person', setting='Melomind Test', start='2020-12-01', stop='2021-01-01')`
+
+        :param start: (Optional) Earliest timestamp (inclusive) of the selected samples (timestamp, `datetime`,
+                      `date` or iso-format string, defaults to None, i.e. unbounded).
+        :param stop: (Optional) Latest timestamp (exclusive) of the selected samples (defaults to None, i.e. unbounded).
+        :param criteria: Value (or list of alternative values) of the `subject` identity, the `setting`, `location`
+                         or `controller` name, or a `device` name of the selected samples.
+        :return: `SessionDatabase` of the matching samples (see `select`).
+        """
+        return self.select(self.index.query(start=start, stop=stop, **criteria))
+
+    @property
+    def data_cache(self) -> DataCache:
+        """ LRU byte budget of the loaded sample data: the data of the least recently used samples is unloaded
+            (and reloaded from file upon the next access) if the loaded data exceeds `max_bytes` """
+        return self._data_cache
+
+    @property
+    def max_bytes(self) -> (int, None):
+        return self._data_cache.max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: (int, None)):
+        self._data_cache.max_bytes = value
 
     @property
     def meta(self) -> list:
@@ -59,65 +132,190 @@ class SessionDatabase(Loadable):
             if not hasattr(indexer, '__iter__'):
                 indexer = [indexer]
 
-            data.extend([self._samples[i].data for i in range(indexer)])
+            data.extend([self._samples[i].data for i in indexer])
 
         return data
 
+    @property
+    def load_errors(self) -> dict:
+        """ Errors of the latest (non-lazy) `load_data` call, i.e. a dict of sample index -> exception """
+        return self._load_errors
+
+    def load_data(self, lazy: bool = False, workers: (int, None) = None, executor: str = 'auto', **kwargs) -> dict:
+        """ Load the device data of all samples
+
+        If the data is loaded immediately (`lazy=False`), a failure to load a sample doesn't abort the loading of
+        the other samples: the data of failed samples remains unloaded, the errors are returned (and stored in
+        `load_errors`).
+
+        :param lazy: Boolean controlling whether the data of each sample is loaded upon first access (if True)
+                     or immediately (if False, default). Loaded data is subject to the `data_cache` byte budget.
+                     Note that side effects of the device loaders, such as updating the devices and channels of
+                     a sample from the header of its data file (e.g. `Bioplux.load_data`), are deferred as well,
+                     i.e. the meta-data of lazily loaded samples may differ until their data is accessed.
+        :param workers: (Optional) Number of parallel workers for immediate loading
+                        (defaults to None, i.e. the samples are loaded one after another).
+        :param executor: Pool of the parallel workers, either 'process' (for CPU-bound parsing of text files),
+                         'thread' (for I/O-bound reading of HDF5 files) or 'auto' (default, a thread pool if all
+                         samples are stored in HDF5 files, a process pool otherwise). Note that the devices of
+                         samples loaded in worker processes are not updated from the data files.
+        :param kwargs: Keyword arguments forwarded to `Sample.load_data` (such as `cache=True`).
+        :return: dict of sample index -> exception of all samples which could not be loaded.
+        """
+        assert executor in ('auto', 'process', 'thread'), f"Unknown executor `{executor}`."
+
+        for sample in self._samples:
+            sample.load_data(lazy=True, data_cache=self._data_cache, **kwargs)
+
+        if lazy:
+            return {}
+
+        self._load_errors = {}
+
+        if workers is None or workers <= 1:
+            for i, sample in enumerate(self._samples):
+                try:
+                    sample.set_loaded_data(sample.read_data())
+                except Exception as ex:
+                    self._load_errors[i] = ex
+
+            return self._load_errors
+
+        if executor == 'auto':
+            executor = 'thread' if all(sample.is_hdf5 for sample in self._samples) else 'process'
+
+        pool_cls = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+        with pool_cls(max_workers=workers) as pool:
+            futures = [pool.submit(sample.read_data) for sample in self._samples]
+
+            # attach data in order (in the main thread, the data cache is not thread-safe)
+            for i, (sample, future) in enumerate(zip(self._samples, futures)):
+                try:
+                    sample.set_loaded_data(future.result())
+                except Exception as ex:
+                    self._load_errors[i] = ex
+
+        return self._load_errors
+
     @staticmethod
-    def load(filename: str, **kwargs) -> SessionDatabase:
+    def load(filename: str, lazy: bool = False, workers: (int, None) = None, load_data_kwargs: (dict, None) = None,
+             catalog: bool = True, **kwargs) -> SessionDatabase:
+        """ Load a `SessionDatabase` from a yaml file
+
+        The meta-data of all samples is evaluated immediately, the device data of the samples is loaded immediately
+        by default or lazily (upon first access, see `load_data`).
+
+        :param filename: Path to the yaml database file.
+        :param lazy: Boolean controlling whether the sample data is loaded upon first access (defaults to False,
+                     see `load_data`).
+        :param workers: (Optional) Number of parallel workers for immediate (`lazy=False`) loading, see `load_data`.
+        :param load_data_kwargs: (Optional) Keyword arguments forwarded to `load_data` (such as `cache=True`).
+        :param catalog: Boolean controlling whether the database is read via its compiled catalog (see `read`,
+                        defaults to True).
+        :param kwargs: Keyword arguments forwarded to the `SessionDatabase` constructor (such as `max_bytes`).
+        :return: `SessionDatabase` instance.
+        """
 
         try:
-            with open(filename, 'r') as s:
+            db = SessionDatabase.read(filename, catalog=catalog)
 
-                db = yaml.load(s, Loader=yaml.Loader)
+        except FileNotFoundError as fnfe:
+            if path.isabs(filename):
+                raise fnfe
 
-                if 'meta_data' in db and isinstance(db['meta_data'], str):
+            return SessionDatabase.load(path.abspath(filename), lazy=lazy, workers=workers,
+                                        load_data_kwargs=load_data_kwargs, catalog=catalog, **kwargs)
 
-                    meta_data = db['meta_data']
-                    if path.isfile(path.abspath(meta_data)):
-                        meta_data = Loadable.load_dict_like(meta_data)
+        db = SessionDatabase(**{**db, **kwargs})
+        db.load_data(lazy=lazy, workers=workers, **(load_data_kwargs or {}))
 
-                        if 'ids' in meta_data:
-                            ids = meta_data['ids']
+        return db
 
-                            for sample in db['samples']:
-                                keys = sample.keys()
+    @staticmethod
+    def get_catalog_filename(filename: str) -> str:
+        """ Filename of the compiled catalog of a yaml database file, i.e. `<filename>.catalog.json` """
+        return f"{filename}.catalog.json"
 
-                                for k in keys:
-                                    try:
-                                        possible_meta_data_key = sample[k]
-                                        sample[k] = ids[possible_meta_data_key]
+    @staticmethod
+    def read(filename: str, catalog: bool = True) -> dict:
+        """ Read the dict representation of a yaml database file (with resolved meta-data ids, see `compile`)
 
-                                    except (TypeError, KeyError):
-                                        pass
+        The compiled representation is stored in a json catalog next to the yaml file (see `get_catalog_filename`
+        and `biofb.io.write_catalog`), which is rebuilt only if the yaml file or the referenced meta-data file have
+        changed (size or modification time). Repeated reads thus skip yaml parsing and id resolution.
 
-                db = SessionDatabase(**{**db, **kwargs})
+        :param filename: Path to the yaml database file.
+        :param catalog: Boolean controlling whether the compiled catalog is used (and created, defaults to True).
+        :return: dict representation of the database (with `samples` and `meta_data` entries).
+        """
+        if not catalog:
+            return SessionDatabase.compile(filename)[0]
 
-                for sample in db.samples:
-                    sample.load_data()
+        catalog_filename = SessionDatabase.get_catalog_filename(filename)
 
-                return db
-        except FileNotFoundError as fnfe:
-            if path.isabs(filename):
-                raise fnfe
+        db = read_catalog(catalog_filename)
+        if db is None:  # missing, outdated or corrupted catalog
+            db, sources = SessionDatabase.compile(filename)
+            write_catalog(catalog_filename, db, sources)  # no catalog is written if e.g. the folder is read-only
+
+        return db
+
+    @staticmethod
+    def compile(filename: str) -> (dict, list):
+        """ Parse a yaml database file and resolve the meta-data ids of the samples
+
+        If the `meta_data` entry of the database is a path to a meta-data file (absolute or relative to the folder
+        of the database file) with an `ids` entry, sample entries which refer to one of the `ids` are replaced by
+        the corresponding meta-data.
+
+        :param filename: Path to the yaml database file.
+        :return: Tuple of the dict representation of the database and the list of (absolute) source files.
+        """
+        with open(filename, 'r') as s:
+            db = yaml.load(s, Loader=YAML_LOADER)
+
+        sources = [path.abspath(filename)]
+
+        if 'meta_data' in db and isinstance(db['meta_data'], str):
+
+            # relative to the folder of the database file (independent of the working directory)
+            meta_data = path.join(path.dirname(path.abspath(filename)), db['meta_data'])
+            sources.append(meta_data)  # missing meta-data files are tracked as well (see `biofb.io.write_catalog`)
+
+            if path.isfile(meta_data):
+                meta_data = Loadable.load_dict_like(meta_data)
+
+                if 'ids' in meta_data:
+                    ids = meta_data['ids']
+
+                    for sample in db['samples']:
+                        for k, v in sample.items():
+                            if isinstance(v, Hashable) and v in ids:
+                                sample[k] = ids[v]
 
-            return SessionDatabase.load(path.abspath(filename), **kwargs)
+        return db, sources
 
     @staticmethod
-    def load_metadata(filename: str, meta_data_map: (dict, ) = None) -> (dict, list):
-        """ Load """
+    def load_metadata(filename: str, meta_data_map: (dict, None) = None) -> dict:
+        """ Load the meta-data entries of a meta-data (or database) file as `Loadable` instances
+
+        :param filename: Path to the meta-data file (with an optional nested `meta_data` entry).
+        :param meta_data_map: (Optional) dict of meta-data key -> `Loadable` class (or its import path)
+                              (defaults to None, i.e. `META_DATA_MAP`).
+        :return: dict of meta-data key -> list of loaded instances.
+        """
         assert path.isfile(path.abspath(filename))
         meta_data = Loadable.load_dict_like(filename)
-        meta_data = meta_data.get(['meta_data'], meta_data)  # try nested meta_data structure
+        meta_data = meta_data.get('meta_data', meta_data)  # try nested meta_data structure
 
         meta_data_evaluated = {}
 
         if meta_data_map is None:
-            meta_data = SessionDatabase.META_DATA_MAP.items()
+            meta_data_map = SessionDatabase.META_DATA_MAP
 
-        for k, k_cls in meta_data_map:
+        for k, k_cls in dict(meta_data_map).items():
             try:
-                meta_data_cls = locate(k_cls) if not isinstance(k_cls, type) else k_cls
+                meta_data_cls = locate_class(k_cls) if not isinstance(k_cls, type) else k_cls
 
                 assert hasattr(meta_data_cls, 'load')
 
@@ -146,7 +344,7 @@ class SessionDatabase(Loadable):
             assert hasattr(other, '__iter__'), "Other must be iterable of samples or SessionDatabase instance."
             other_samples = [o for o in other]
 
-        return SessionDatabase(samples=self_samples + other_samples, **self.other_kwargs)
+        return SessionDatabase(samples=self_samples + other_samples, max_bytes=self.max_bytes, **self.other_kwargs)
 
     def __iadd__(self, other):
 
@@ -156,6 +354,6 @@ class SessionDatabase(Loadable):
             assert hasattr(other, '__iter__'), "Other must be iterable of samples or SessionDatabase instance."
             other_samples = [o for o in other]
 
-        self.samples.extend(other_samples)
+        self.samples = self.samples + other_samples  # converts sample dicts and resets the index
 
         return self
@@ -0,0 +1,68 @@
+from numpy import ndarray, searchsorted
+import h5py
+
+
+class TimestampIndex(object):
+    """ Mapping of sample indices to (monotonically increasing) timestamps and vice versa
+
+    The timestamps may be an in-memory (or memory-mapped) array or an on-disk `h5py.Dataset`. Timestamp lookups
+    (`index`) are binary searches, i.e. O(log n): on datasets, the search is narrowed down by reading single
+    timestamps until the remaining range fits into one block of `block_size` timestamps (about one dataset chunk),
+    which is read at once, such that only O(log n) chunks are touched instead of the full dataset.
+    """
+
+    def __init__(self, timestamps: (ndarray, h5py.Dataset), block_size: (int, None) = None):
+        """ Constructs a `TimestampIndex` instance
+
+        :param timestamps: 1D array or dataset of monotonically increasing timestamps (one per sample).
+        :param block_size: (Optional) Number of timestamps which are searched in memory (defaults to None, i.e. the
+                           chunk size of datasets).
+        """
+        self._timestamps = timestamps
+
+        if block_size is None:
+            chunks = getattr(timestamps, 'chunks', None)
+            block_size = chunks[0] if chunks else 4096
+
+        assert block_size > 0, f"Block size must be positive (provided `{block_size}`)."
+        self._block_size = block_size
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    @property
+    def timestamps(self) -> (ndarray, h5py.Dataset):
+        return self._timestamps
+
+    def timestamp(self, index: int) -> float:
+        """ Timestamp of the sample at `index` """
+        return float(self._timestamps[index])
+
+    def index(self, timestamp: float, side: str = 'left') -> int:
+        """ Sample index of a timestamp (see `numpy.searchsorted`)
+
+        :param timestamp: Timestamp (e.g. absolute LSL time).
+        :param side: If 'left' (default), the index of the first sample with a timestamp `>= timestamp`,
+                     if 'right' the index of the first sample with a timestamp `> timestamp`.
+        :return: Sample index in `[0, len(self)]`.
+        """
+        assert side in ('left', 'right'), f"Unknown side `{side}`, use 'left' or 'right'."
+
+        if isinstance(self._timestamps, ndarray):
+            return int(searchsorted(self._timestamps, timestamp, side=side))
+
+        lower, upper = 0, len(self._timestamps)
+        while upper - lower > self._block_size:
+            middle = (lower + upper) // 2
+            value = self._timestamps[middle]
+            if value < timestamp or (side == 'right' and value == timestamp):
+                lower = middle + 1
+            else:
+                upper = middle
+
+        return lower + int(searchsorted(self._timestamps[lower:upper], timestamp, side=side))
+
+    def slice(self, start: (float, None) = None, stop: (float, None) = None) -> slice:
+        """ Slice of the sample indices with timestamps in `[start, stop)` (None: unbounded) """
+        return slice(0 if start is None else self.index(start, side='left'),
+                     len(self) if stop is None else self.index(stop, side='left'))
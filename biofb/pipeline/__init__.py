@@ -1,9 +1,16 @@
 """ bio-feedback pipelines package for synchronized data handling """
 
 STREAM_TYPES = ('name', 'type', 'hostname')
+TRANSPORTS = ('queue', 'shared_memory')
+
+from .shared_memory import SharedMemoryQueue
+from .synchronizer import ClockModel, Synchronizer
+from .recorder import Recorder, read_recording, iter_records
+from .pacer import Pacer
 
 from .receiver import Receiver
 from .transmitter import Transmitter
+from .memory import MemoryStream, MemoryReceiver, MemoryTransmitter
 
 try:
     from .lab_streaming_layer_receiver import LSLReceiver
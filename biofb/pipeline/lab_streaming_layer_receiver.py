@@ -1,6 +1,25 @@
-from pylsl import StreamInlet, resolve_stream
+from pylsl import StreamInlet, resolve_stream, cf_float32, cf_double64, cf_int8, cf_int16, cf_int32, cf_int64
+from pylsl import LostError, InvalidArgumentError, InternalError, TimeoutError as LSLTimeoutError
 from biofb.pipeline import Receiver
-from numpy import ndarray, asarray, empty
+from numpy import ndarray, empty
+from ctypes import c_int, c_ulong, c_double, c_void_p, byref
+
+
+LSL_DTYPES = {cf_float32: 'float32',
+              cf_double64: 'float64',
+              cf_int8: 'int8',
+              cf_int16: 'int16',
+              cf_int32: 'int32',
+              cf_int64: 'int64',
+              }
+""" numpy data types of the numeric LSL channel formats (string streams are received as object arrays) """
+
+LSL_ERRORS = {-1: (LSLTimeoutError, "the operation failed due to a timeout."),
+              -2: (LostError, "the stream has been lost."),
+              -3: (InvalidArgumentError, "an argument was incorrectly specified."),
+              -4: (InternalError, "an internal error has occurred."),
+              }
+""" Exception types (of the public pylsl API) and messages of the liblsl error codes """
 
 
 class LSLReceiver(Receiver):
@@ -11,8 +30,14 @@ class LSLReceiver(Receiver):
         to `ReceiveData.py` with `pylsl`.
         """
 
+    MIN_PULL_TIMEOUT = 0.01
+    """ Minimum timeout in seconds of the blocking pulls from the stream inlet """
+
+    PULL_TIMEOUT = 1.
+    """ Maximum timeout in seconds of the blocking pulls from the stream inlet (and timeout for irregular streams) """
+
     def __init__(self, stream: str, stream_type: str = 'name', chunk_size=1., pull_chunks=False, verbose=True,
-                 **kwargs):
+                 timeout: (float, None) = None, **kwargs):
         """ Creates an LSLReceiver instance
 
         :param stream: String specification of the stream
@@ -22,6 +47,8 @@ class LSLReceiver(Receiver):
         :param pull_chunks: Boolean controlling whether sample data should be pulled as chunks of samples (if True)
                             of sample-by-sample otherwise
         :param verbose: Boolean controlling whether the Receiver prints status messages (if True)
+        :param timeout: (Optional) Timeout in seconds of the blocking pulls from the stream inlet (defaults to None,
+                        i.e. derived from the nominal sampling rate and the chunk size, see `get_pull_timeout`)
         :param kwargs: Optional keyword arguments
         """
         Receiver.__init__(self, stream=stream, stream_type=stream_type, verbose=verbose, **kwargs)
@@ -32,6 +59,9 @@ class LSLReceiver(Receiver):
         self._pull_chunks = None
         self.pull_chunks = pull_chunks
 
+        self._timeout = None
+        self.timeout = timeout
+
         self._stream_inlet = None
         self._stream_info = None
 
@@ -44,6 +74,7 @@ class LSLReceiver(Receiver):
         lsl_receiver_data = dict(
             chunk_size=self.chunk_size,
             pull_chunks=self.pull_chunks,
+            timeout=self.timeout,
         )
 
         return dict(**data, **lsl_receiver_data)
@@ -101,6 +132,13 @@ class LSLReceiver(Receiver):
          """
         self._chunk_size = value
 
+    def get_chunk_size(self) -> int:
+        """ Number of samples of a received chunk (see `chunk_size`) """
+        if isinstance(self.chunk_size, float):
+            return int(self.stream_info['meta_data']['nominal_srate'] * self.chunk_size)
+
+        return self.chunk_size
+
     @property
     def pull_chunks(self) -> bool:
         """ Boolean property (getter) controlling whether the LSLReceiver tries to receive data in chunks
@@ -123,6 +161,19 @@ class LSLReceiver(Receiver):
         """
         self._pull_chunks = value
 
+    @property
+    def timeout(self) -> (float, None):
+        """ Timeout in seconds of the blocking pulls from the stream inlet
+
+        If None, the timeout is derived from the nominal sampling rate and the chunk size (see `get_pull_timeout`).
+        """
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: (float, None)):
+        assert value is None or value > 0, f"Timeout must be positive (provided `{value}`)."
+        self._timeout = value
+
     def receive_data(self) -> [ndarray, ndarray]:
         """ Receive a data chunk from the LSL (blocking)
 
@@ -136,7 +187,8 @@ class LSLReceiver(Receiver):
         return LSLReceiver.get_data_chunk(stream_inlet=self.stream_inlet,
                                           stream_info=self.stream_info,
                                           chunk_size=self.chunk_size,
-                                          pull_chunks=self.pull_chunks)
+                                          pull_chunks=self.pull_chunks,
+                                          timeout=self.timeout)
 
     def connect(self) -> [StreamInlet, dict]:
         """ Connect to the specified LSL stream
@@ -224,48 +276,102 @@ class LSLReceiver(Receiver):
 
         return stream_meta_data, stream_channels
 
+    @classmethod
+    def get_pull_timeout(cls, stream_info: dict, chunk_size: int) -> float:
+        """ Timeout of the blocking pulls from the stream inlet, derived from the nominal sampling rate and chunk size
+
+        The timeout is twice the nominal duration of a chunk (i.e., a chunk is usually received with a single pull,
+        tolerating some transmission jitter), bounded to [`MIN_PULL_TIMEOUT`, `PULL_TIMEOUT`] seconds, and
+        `PULL_TIMEOUT` for streams with an irregular sampling rate.
+
+        :param stream_info: stream-info dict-representation, providing the nominal sampling rate
+        :param chunk_size: Number of data-samples which are considered a chunk of samples
+        :return: timeout in seconds
+        """
+        sampling_rate = stream_info['meta_data'].get('nominal_srate', 0)
+        if not sampling_rate:
+            return cls.PULL_TIMEOUT
+
+        return min(max(2. * chunk_size / sampling_rate, cls.MIN_PULL_TIMEOUT), cls.PULL_TIMEOUT)
+
     @staticmethod
     def get_data_chunk(stream_inlet: StreamInlet, stream_info: dict, chunk_size: (float, int),
-                       pull_chunks=True) -> [ndarray, ndarray]:
+                       pull_chunks=True, timeout: (float, None) = None) -> [ndarray, ndarray]:
         """ Receive a data-chunk from the provided StreamInlet instance
 
+        The chunk arrays are allocated once per chunk: in chunk-mode, the samples and timestamps are pulled directly
+        into the remaining rows of the chunk (see `pull_chunk`), at most the number of missing samples per pull, such
+        that samples exceeding the chunk remain in the inlet's buffer and are received with the next chunk.
+        All pulls block for at most `timeout` seconds until samples are available (i.e., no busy waiting).
+
         :param stream_inlet: pylsl.StreamInlet instance used to pull data from the LSL
         :param stream_info: stream-info dict-representation, providing meta-data about
                             the number of channels, ..., necessary to receive the data
         :param chunk_size: Fraction of a the streams sampling rate (if float) or the number of
                            data-samples (if int) which are considered a chunk of samples
         :param pull_chunks: Boolean controlling, whether data are pulled as chunks from the LSL (if True)
-                            or sample-by-sample otherwise (the former is usually faster but the number
-                            of received data-points can differ from the specified chunk-size)
-        :return: tuple of (timestamp, chunk-of-received-samples) `numpy.ndarray`s,
-                 the len of the chunk is defined by `chunk_size` and `pull_chunks`
-                 attributes
+                            or sample-by-sample otherwise (the former is usually faster, string streams
+                            are always pulled sample-by-sample)
+        :param timeout: Timeout in seconds of a single (blocking) pull from the inlet, defaults to None,
+                        i.e. derived from the nominal sampling rate and the chunk size (see `get_pull_timeout`).
+        :return: tuple of (timestamp, chunk-of-received-samples) `numpy.ndarray`s of `chunk_size` samples
+                 (the data type of the samples corresponds to the channel format of the stream, see `LSL_DTYPES`)
         """
 
+        meta_data = stream_info['meta_data']
         if isinstance(chunk_size, float):
-            chunk_size = int(stream_info['meta_data']['nominal_srate'] * chunk_size)
+            chunk_size = int(meta_data['nominal_srate'] * chunk_size)
         assert isinstance(chunk_size, int)
 
-        # if the data are pulled as chunks, we us a list to append new chunks
-        # if the data are pulled as samples, we know in advance, how many samples we expect
-        samples = [] if pull_chunks else empty((chunk_size, stream_info['meta_data']['channel_count']))
-        timestamp = [] if pull_chunks else empty(chunk_size)
-        sample_count = 0
+        if timeout is None:
+            timeout = LSLReceiver.get_pull_timeout(stream_info, chunk_size)
 
-        if pull_chunks:                       # pull data from the inlet as chunks
-            while len(samples) < chunk_size:  # until at least a number of 'chunk_size' samples are received
-                sample, chunk_timestamp = stream_inlet.pull_chunk()
+        dtype = LSL_DTYPES.get(meta_data.get('channel_format'))
+        samples = empty((chunk_size, meta_data['channel_count']), dtype=dtype or object)
+        timestamps = empty(chunk_size)
+        sample_count = 0
 
-                if len(sample) > 0:           # also no-data can be received, we await the next chunk then
-                    samples.extend(sample)
-                    timestamp.extend(chunk_timestamp)
+        if pull_chunks and dtype is not None:  # pull data from the inlet as chunks into the chunk array
+            while sample_count < chunk_size:
+                # also no-data can be received (timeout), we await the next chunk
+                sample_count += LSLReceiver.pull_chunk(stream_inlet, samples[sample_count:],
+                                                       timestamps[sample_count:], timeout=timeout)
 
         else:
             while sample_count < chunk_size:  # pull data as single samples from the inlet
-                sample, sample_timestamp = stream_inlet.pull_sample()
+                sample, sample_timestamp = stream_inlet.pull_sample(timeout=timeout)
+                if sample is None:            # timeout, we await the next sample
+                    continue
 
-                samples[sample_count, :] = sample           # assign the sample data
-                timestamp[sample_count] = sample_timestamp  # assigned the time-stamps
+                samples[sample_count, :] = sample            # assign the sample data
+                timestamps[sample_count] = sample_timestamp  # assigned the time-stamps
                 sample_count += 1
 
-        return asarray(timestamp), asarray(samples)
+        return timestamps, samples
+
+    @staticmethod
+    def pull_chunk(stream_inlet: StreamInlet, samples: ndarray, timestamps: ndarray, timeout: float) -> int:
+        """ Pull at most `len(timestamps)` samples from a numeric stream inlet into preallocated arrays
+
+        In contrast to `pylsl.StreamInlet.pull_chunk`, which allocates (and caches) ctypes buffers for every distinct
+        number of requested samples and returns the timestamps as list, the samples and timestamps are written
+        directly into the provided arrays.
+
+        :param stream_inlet: pylsl.StreamInlet instance of a numeric stream
+        :param samples: C-contiguous array of shape `(n_samples, channel_count)` of the stream's dtype
+                        (see `LSL_DTYPES`), the pulled samples are written into its first rows
+        :param timestamps: C-contiguous float64 array of `n_samples` timestamps
+        :param timeout: Timeout in seconds of the (blocking) pull
+        :return: Number of pulled samples
+        """
+        assert samples.flags.c_contiguous and timestamps.flags.c_contiguous, "Arrays need to be C-contiguous."
+
+        errcode = c_int()
+        n_values = stream_inlet.do_pull_chunk(stream_inlet.obj, c_void_p(samples.ctypes.data),
+                                              c_void_p(timestamps.ctypes.data), c_ulong(samples.size),
+                                              c_ulong(len(timestamps)), c_double(timeout), byref(errcode))
+        if errcode.value < 0:
+            error, message = LSL_ERRORS.get(errcode.value, (RuntimeError, "an unknown error has occurred."))
+            raise error(message)
+
+        return n_values // samples.shape[1]
@@ -0,0 +1,346 @@
+from biofb.io import Loadable
+from biofb.pipeline import Receiver, Transmitter, Pacer
+from biofb.pipeline.transmitter import channels_to_list_of_dicts
+from numpy import ndarray, asarray, atleast_2d, arange, empty, full, ndim
+from multiprocessing import Queue
+from queue import Empty
+from collections import defaultdict
+import time
+
+
+MEMORY_STREAMS = {}
+""" Registry of the in-process `MemoryStream`s by name (inherited by forked background processes) """
+
+
+class MemoryStream(object):
+    """ In-process stream of (timestamps, data)-chunks from a `MemoryTransmitter` to a `MemoryReceiver`
+
+    The chunks are exchanged via a `multiprocessing.Queue`, i.e. transmitter and receiver may run in background
+    processes, as long as the stream is created (see `MemoryTransmitter.connect`) before the processes are forked.
+    Each chunk is received once, i.e. a stream is supposed to be received by a single `MemoryReceiver`, and a
+    transmitting background process only terminates once its chunks are received (see `multiprocessing.Queue`).
+    """
+
+    def __init__(self, name: str, info: dict, maxsize: int = 0):
+        """ Constructs a MemoryStream instance
+
+        :param name: Name of the stream.
+        :param info: Stream-info dict-representation (with 'meta_data' and 'channels', see `Receiver.stream_info`).
+        :param maxsize: Maximum number of queued chunks (defaults to 0, i.e. unbounded).
+        """
+        self.name = name
+        self.info = info
+        self.queue = Queue(maxsize)
+
+    @classmethod
+    def get(cls, name: str, info: (dict, None) = None, maxsize: int = 0) -> 'MemoryStream':
+        """ Get a registered stream by name, or register a new stream if `info` is provided
+
+        :param name: Name of the stream.
+        :param info: (Optional) Stream-info dict-representation of a new stream.
+        :param maxsize: Maximum number of queued chunks of a new stream (defaults to 0, i.e. unbounded).
+        :return: The registered `MemoryStream` instance of the `name`.
+        """
+        if name not in MEMORY_STREAMS:
+            assert info is not None, f"No memory stream `{name}` registered, connect a `MemoryTransmitter` first."
+            MEMORY_STREAMS[name] = cls(name=name, info=info, maxsize=maxsize)
+
+        return MEMORY_STREAMS[name]
+
+    def close(self):
+        """ Close the queue and remove the stream from the registry """
+        self.queue.close()
+        if MEMORY_STREAMS.get(self.name) is self:
+            del MEMORY_STREAMS[self.name]
+
+
+class MemoryReceiver(Receiver):
+    """ Receiver of in-memory data without Lab Streaming Layer, e.g. for testing, replay and benchmarks
+
+    The data are either
+
+    - replayed from an array of sample data or from a `biofb.hardware.Device` with (loaded) data, e.g. a
+      recorded Bioplux or Unicorn file, at real-time (`speed=1`), at `speed` times real-time or as fast as possible
+      (`speed=None`, see `biofb.pipeline.Pacer`), in chunks of `chunk_size`, timestamped relative to the start of
+      the replay, or
+    - received from a `MemoryStream`, which is fed by a `MemoryTransmitter` of the same `stream` name
+      (if no `data` are provided).
+
+    Once all data are replayed (without `loop`), or if no chunk is transmitted within `timeout` seconds, empty chunks
+    are received.
+    """
+
+    def __init__(self, stream: str, stream_type: str = 'name', data: (ndarray, Loadable, None) = None,
+                 timestamps: (ndarray, None) = None, sampling_rate: (float, None) = None,
+                 channels: (list, None) = None, chunk_size: (float, int) = 0.1, speed: (float, None) = 1.,
+                 loop: bool = False, timeout: float = 1., verbose: bool = True, **kwargs):
+        """ Creates a MemoryReceiver instance
+
+        :param stream: Name of the (replayed) stream.
+        :param stream_type: Type of the stream (name/hostname/type).
+        :param data: (Optional) to-be-replayed sample data (array of shape `n_samples x n_channels`) or
+                     `biofb.hardware.Device` instance with data (defaults to None, i.e. receive from the
+                     `MemoryStream` of a `MemoryTransmitter`).
+        :param timestamps: (Optional) timestamps of the replayed samples (defaults to None, i.e. derived from the
+                           `sampling_rate`), only the time differences to the first sample are replayed.
+        :param sampling_rate: Sampling rate of replayed data arrays (defaults to the sampling rate of the device).
+        :param channels: (Optional) list of Channel instances (or dict-representations or channel names) of replayed
+                         data arrays (defaults to the channels of the device, or to `CH0, CH1, ...`).
+        :param chunk_size: Fraction of a the streams sampling rate (if float) or the number of data-samples
+                           (if int) which are considered a chunk of replayed samples (defaults to 0.1).
+        :param speed: Replay speed relative to real-time (defaults to 1), None replays as fast as possible.
+        :param loop: Boolean controlling whether the replay restarts after the last sample (defaults to False).
+        :param timeout: Timeout in seconds to wait for a transmitted chunk of a `MemoryStream` (defaults to 1).
+        :param verbose: Boolean controlling whether the Receiver prints status messages (if True).
+        :param kwargs: Optional keyword arguments
+        """
+        Receiver.__init__(self, stream=stream, stream_type=stream_type, verbose=verbose, **kwargs)
+
+        from biofb.hardware import Device
+        if isinstance(data, Device):
+            assert data.data is not None, f"Device `{data.name}` has no data to replay."
+            sampling_rate = data.sampling_rate if sampling_rate is None else sampling_rate
+            channels = data.channels if channels is None else channels
+            data = data.data
+
+        if data is not None:
+            data = asarray(data)
+            data = data[:, None] if data.ndim == 1 else data
+            assert sampling_rate, "A sampling rate is required to replay data."
+            assert timestamps is None or len(timestamps) == len(data), "Provide a timestamp per sample."
+
+        self._data = data
+        self._timestamps = None if timestamps is None else asarray(timestamps, dtype=float)
+        self._sampling_rate = sampling_rate
+        self._channels = channels
+
+        self._chunk_size = None
+        self.chunk_size = chunk_size
+
+        self._speed = None
+        self.speed = speed
+
+        self.loop = loop
+        self.timeout = timeout
+
+        self._memory_stream = None
+        self._stream_info = None
+        self._position = 0      # index of the next replayed sample
+        self._n_replayed = 0    # number of replayed samples (including loops)
+        self._start_time = None
+        self._pacer = None
+
+    def to_dict(self) -> dict:
+        """ Create dict representation of the current MemoryReceiver instance
+
+        :return: dict representation of the Receiver instance
+        """
+        data = Receiver.to_dict(self)
+        memory_receiver_data = dict(
+            data=self._data,
+            timestamps=self._timestamps,
+            sampling_rate=self._sampling_rate,
+            channels=self._channels,
+            chunk_size=self.chunk_size,
+            speed=self.speed,
+            loop=self.loop,
+            timeout=self.timeout,
+        )
+
+        return dict(**data, **memory_receiver_data)
+
+    @property
+    def chunk_size(self) -> (float, int):
+        """ Chunk size of replayed data, the fraction of the sampling rate (if float) or number of samples (if int) """
+        return self._chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, value: (float, int)):
+        assert value > 0, f"Chunk size must be positive (provided `{value}`)."
+        self._chunk_size = value
+
+    @property
+    def speed(self) -> (float, None):
+        """ Replay speed relative to real-time, None if data are replayed as fast as possible """
+        return self._speed
+
+    @speed.setter
+    def speed(self, value: (float, None)):
+        assert value is None or value > 0, f"Speed must be positive or None (provided `{value}`)."
+        self._speed = value
+
+    @property
+    def n_replayed(self) -> int:
+        """ Number of replayed samples (including loops) """
+        return self._n_replayed
+
+    @property
+    def pacer(self) -> (Pacer, None):
+        """ `biofb.pipeline.Pacer` of the replay (None if not connected), e.g. to report the actual replay rate """
+        return self._pacer
+
+    @property
+    def is_connected(self) -> bool:
+        return self._stream_info is not None
+
+    def connect(self) -> tuple:
+        """ Connect to the `MemoryStream` (if no data are replayed) or start the replay
+
+        :return: tuple of (`MemoryStream` or `MemoryReceiver` instance, stream-info dict-repr)
+        """
+        if self._data is None:
+            self._memory_stream = MemoryStream.get(self.stream)
+            self._stream_info = self._memory_stream.info
+
+        else:
+            from biofb.hardware import Channel
+
+            n_channels = self._data.shape[1]
+            channels = self._channels if self._channels is not None else [f'CH{i}' for i in range(n_channels)]
+            channels = [c if isinstance(c, Channel) else
+                        Channel.load(dict(name=c, sampling_rate=self._sampling_rate) if isinstance(c, str) else
+                                     dict(sampling_rate=self._sampling_rate, **c))
+                        for c in channels]
+            assert len(channels) == n_channels, f"Provide {n_channels} channels (provided {len(channels)})."
+
+            meta_data = dict(name=self.stream, type='memory', channel_count=n_channels,
+                             channel_format=self._data.dtype.name, nominal_srate=self._sampling_rate,
+                             source_id=self.stream)
+            self._stream_info = dict(meta_data=meta_data, channels=channels_to_list_of_dicts(channels))
+
+        self._position, self._n_replayed = 0, 0
+        self._start_time = time.time()
+        self._pacer = Pacer(sampling_rate=self._sampling_rate or 0., speed=self.speed).start()
+
+        return self._memory_stream or self, self._stream_info
+
+    @property
+    def stream_info(self) -> dict:
+        """ Stream-info dict-representation of the received stream, connects if necessary """
+        if not self.is_connected:
+            self.connect()
+
+        return self._stream_info
+
+    def get_chunk_size(self) -> (int, None):
+        """ Number of samples of a replayed chunk (None if the chunks of a `MemoryStream` are received) """
+        if self._data is None:
+            return None
+
+        if isinstance(self.chunk_size, float):
+            return max(int(self.chunk_size * self._sampling_rate), 1)
+
+        return self.chunk_size
+
+    def receive_data(self) -> [ndarray, ndarray]:
+        """ Receive the next chunk of replayed or transmitted data
+
+        Replayed chunks are delayed until their last sample is due (relative to the start of the replay).
+
+        :return: tuple of (timestamps, data-chunk) arrays, empty if no data are available
+        """
+        if not self.is_connected:
+            self.connect()
+
+        n_channels = self._stream_info['meta_data']['channel_count']
+
+        if self._memory_stream is not None:
+            try:
+                return self._memory_stream.queue.get(timeout=self.timeout)
+            except Empty:
+                return empty(0), empty((0, n_channels))
+
+        if self._position >= len(self._data):
+            if not self.loop:
+                return empty(0), empty((0, self._data.shape[1]), dtype=self._data.dtype)
+            self._position = 0
+
+        start, stop = self._position, min(self._position + self.get_chunk_size(), len(self._data))
+        offset = self._n_replayed - start  # samples of previous loops
+        self._position = stop
+        self._n_replayed += stop - start
+
+        if self._timestamps is None:
+            timestamps = arange(offset + start, offset + stop) / self._sampling_rate
+        else:
+            loops = (offset // len(self._data)) * (len(self._data) / self._sampling_rate)
+            timestamps = self._timestamps[start:stop] - self._timestamps[0] + loops
+
+        self._pacer.wait(self._n_replayed)  # wait until the last sample of the chunk is due
+
+        return self._start_time + timestamps, self._data[start:stop]
+
+
+class MemoryTransmitter(Transmitter):
+    """ Transmitter of data-chunks to an in-process `MemoryStream`, which can be received by a `MemoryReceiver`
+
+    The stream is created in the calling process on `connect` (or `start`), such that receivers (also in forked
+    background processes) can connect to the stream by its name.
+    """
+
+    def __init__(self, device: Loadable, stream: str, channels: (None, [defaultdict]) = None,
+                 stream_type: str = 'name', maxsize: int = 0, verbose=True, **kwargs):
+        """ Creates a MemoryTransmitter instance
+
+        :param device: bio-feedback Device instance whose data are to be transmitted
+                       (required for stream meta-data)
+        :param stream: String specification of the data-stream
+        :param channels: (Optional) list of device-specific bio-feedback Channel instances
+                         or a dict-representation thereof, defaults to `device.channels` of the
+                        `device` attribute
+        :param stream_type: String, specifying the stream type,
+                            i.e. whether the provided stream is stream-name, a stream-host, a stream-type, ...
+        :param maxsize: Maximum number of queued chunks of the stream (defaults to 0, i.e. unbounded).
+        :param verbose: Boolean controlling whether the Transmitter instance prints status messages (if True).
+        :param kwargs: possible kwargs to be used in derived classes
+        """
+        Transmitter.__init__(self, stream=stream, device=device, channels=channels,
+                             stream_type=stream_type, verbose=verbose, maxsize=maxsize, **kwargs)
+
+        self._memory_stream = None
+
+    @property
+    def memory_stream(self) -> MemoryStream:
+        """ `MemoryStream` instance of the transmitter, connects if necessary """
+        if not self.is_connected:
+            self.connect()
+
+        return self._memory_stream
+
+    @property
+    def stream_info(self) -> dict:
+        return self.memory_stream.info
+
+    @property
+    def is_connected(self) -> bool:
+        return self._memory_stream is not None
+
+    def connect(self) -> tuple:
+        """ Create (or get) the `MemoryStream` of the transmitter
+
+        :return: tuple of (`MemoryStream`, stream-info dict-repr)
+        """
+        info = dict(meta_data=dict(self.device), channels=[dict(c) for c in self.channels or []])
+        self._memory_stream = MemoryStream.get(self.stream, info=info, maxsize=self._kwargs['maxsize'])
+        return self._memory_stream, self._memory_stream.info
+
+    def start(self):
+        """ Create the `MemoryStream` in the calling process and start transmitting data as background process """
+        self.connect()
+        return Transmitter.start(self)
+
+    def transmit_data(self, data: ndarray, sleep: (int, float) = 0.):
+        """ Put data sample or chunk on the memory stream
+
+        The samples are timestamped at transmission, earlier samples of a chunk are back-dated by the nominal
+        sampling rate (as for Lab Streaming Layer chunks).
+
+        :param data: array-like data sample or chunk
+        :param sleep: delay between sample transmission in seconds (to augment sampling rate).
+        """
+        data = atleast_2d(data) if ndim(data) == 1 else asarray(data)
+        sampling_rate, now = self.device['nominal_srate'], time.time()
+        timestamps = now - arange(len(data))[::-1] / sampling_rate if sampling_rate else full(len(data), now)
+
+        self.memory_stream.queue.put((timestamps, data))
+        time.sleep(abs(sleep) * len(data)) if sleep != 0. else None
@@ -0,0 +1,105 @@
+from numpy import inf
+import time
+
+
+class Pacer(object):
+    """ Drift-free pacing of a stream of samples at (a multiple of) its sampling rate
+
+    The samples are paced on a target timeline of the monotonic clock: the `n`-th sample is due at
+    `t0 + n / (sampling_rate * speed)` seconds after `start`. Since every `wait` sleeps until an absolute due time
+    (instead of sleeping a fixed delay per sample or chunk), sleep overhead and processing time do not accumulate, and
+    a pacer which fell behind catches up with the timeline.
+
+    The pacer is unthrottled (never waits) if `speed` is None or the sampling rate is unknown (0).
+    """
+
+    def __init__(self, sampling_rate: float, speed: (float, None) = 1.):
+        """ Constructs a Pacer instance
+
+        :param sampling_rate: Nominal sampling rate of the paced samples in Hz (0 if unknown).
+        :param speed: Speed-up factor relative to the sampling rate (defaults to 1, i.e. real-time),
+                      None for unthrottled pacing.
+        """
+        assert sampling_rate >= 0, f"Sampling rate must not be negative (provided `{sampling_rate}`)."
+        assert speed is None or speed > 0, f"Speed must be positive or None (provided `{speed}`)."
+
+        self._sampling_rate = sampling_rate
+        self._speed = speed
+
+        self._start = None
+        self._n_samples = 0
+        self._max_lag = 0.
+
+    @property
+    def sampling_rate(self) -> float:
+        return self._sampling_rate
+
+    @property
+    def speed(self) -> (float, None):
+        return self._speed
+
+    @property
+    def target_rate(self) -> float:
+        """ Target rate of the paced samples in Hz (`inf` if unthrottled) """
+        if self._speed is None or not self._sampling_rate:
+            return inf
+
+        return self._sampling_rate * self._speed
+
+    @property
+    def n_samples(self) -> int:
+        """ Number of samples which have been paced since `start` """
+        return self._n_samples
+
+    @property
+    def elapsed(self) -> float:
+        """ Time in seconds since `start` """
+        return 0. if self._start is None else time.monotonic() - self._start
+
+    @property
+    def actual_rate(self) -> float:
+        """ Measured rate of the paced samples in Hz since `start` """
+        elapsed = self.elapsed
+        return self._n_samples / elapsed if elapsed > 0 else inf
+
+    def start(self) -> 'Pacer':
+        """ Start the target timeline at the current time """
+        self._start = time.monotonic()
+        self._n_samples = 0
+        self._max_lag = 0.
+        return self
+
+    def due(self, n_samples: int) -> float:
+        """ Monotonic time at which `n_samples` samples are due on the target timeline """
+        return self._start + n_samples / self.target_rate
+
+    def wait(self, n_samples: int) -> float:
+        """ Wait until `n_samples` samples (since `start`) are due on the target timeline
+
+        :param n_samples: Total number of paced samples since `start`.
+        :return: Delay in seconds, i.e. the waiting time if ahead of the timeline, or the (negative) lag behind
+                 the timeline.
+        """
+        if self._start is None:
+            self.start()
+
+        self._n_samples = n_samples
+        if self.target_rate == inf:
+            return 0.
+
+        delay = self.due(n_samples) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            self._max_lag = max(self._max_lag, -delay)
+
+        return delay
+
+    def report(self) -> dict:
+        """ Report of the target and the measured (actual) rate of the paced samples since `start`
+
+        :return: dict of `n_samples`, `elapsed` (seconds), `target_rate` and `actual_rate` (Hz) and `max_lag`,
+                 the maximum lag (seconds) behind the target timeline.
+        """
+        return dict(n_samples=self.n_samples, elapsed=self.elapsed, target_rate=self.target_rate,
+                    actual_rate=self.actual_rate, max_lag=self._max_lag)
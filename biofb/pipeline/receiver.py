@@ -1,9 +1,14 @@
 from biofb.io import Loadable
-from numpy import ndarray
+from numpy import ndarray, empty, atleast_1d, concatenate
 from abc import ABCMeta, abstractmethod
 from multiprocessing import Process, Queue
 from queue import Empty
+from collections import deque
+import pickle
+import time
 from biofb.pipeline import STREAM_TYPES
+from biofb.pipeline import TRANSPORTS
+from biofb.pipeline import SharedMemoryQueue
 
 
 class Receiver(Loadable, metaclass=ABCMeta):
@@ -17,6 +22,13 @@ class Receiver(Loadable, metaclass=ABCMeta):
     - use the start() method to start receiving (and end the receiving with stop())
       or, alternatively, declare the Receiver in a `with` environment
     - use pull_data() to extract a chunk of data (blocking but filled by a worker process in the background)
+    - use pull_available() to extract all queued chunks at once as one contiguous (timestamp, data) pair
+      (non-blocking), and poll() to check the number of pending samples
+    - errors of the worker process are re-raised by pull_data() and pull_available() in the calling process
+
+    The data-chunks are transported from the background process to the calling process either via a
+    `multiprocessing.Queue` (`transport='queue'`, pickles each chunk) or via a shared memory ring-buffer
+    (`transport='shared_memory'`, see `biofb.pipeline.SharedMemoryQueue`, `pull_data` returns views).
 
     Methods to override:
 
@@ -24,9 +36,23 @@ class Receiver(Loadable, metaclass=ABCMeta):
     - connect
     - stream_info
     - get_chunk
+    - get_chunk_size (optional, sizes the shared memory transport)
     """
 
-    def __init__(self, stream: str, stream_type: str = 'name', verbose: bool = True, **kwargs):
+    DEFAULT_TRANSPORT_CAPACITY = 4096
+    """ Number of samples of a shared memory transport if the nominal sampling rate of a stream is unknown """
+
+    MIN_BACKOFF = 1e-3
+    """ Initial delay in seconds of the background receiving loop if no data is available """
+
+    MAX_BACKOFF = 0.1
+    """ Maximum delay in seconds of the background receiving loop if no data is available (exponential backoff) """
+
+    ERROR_INTERVAL = 0.1
+    """ Interval in seconds in which a blocking pull checks the background process for errors """
+
+    def __init__(self, stream: str, stream_type: str = 'name', verbose: bool = True, transport: str = 'queue',
+                 transport_duration: float = 10., **kwargs):
         """ Construct a Receiver instance
 
         :param stream: stream specifier, either a name of a stream, the hostname of a streaming-machine,
@@ -34,6 +60,10 @@ class Receiver(Loadable, metaclass=ABCMeta):
         :param stream_type: String, specifying the stream type,
                             i.e. whether the provided stream is stream-name, a stream-host, a stream-type, ...
         :param verbose: Boolean controlling whether the Receiver instance prints status messages (if True).
+        :param transport: String, specifying how data-chunks are transported from the background process,
+                          needs to be an element of `biofb.pipeline.TRANSPORTS` (defaults to 'queue').
+        :param transport_duration: Duration in seconds of stream data which can be buffered by a shared memory
+                                   transport (defaults to 10.).
         :param kwargs: possible kwargs to be used in derived classes
         """
 
@@ -48,10 +78,19 @@ class Receiver(Loadable, metaclass=ABCMeta):
         self._verbose = None
         self.verbose = verbose
 
+        self._transport = None
+        self.transport = transport
+
+        self._transport_duration = None
+        self.transport_duration = transport_duration
+
         self._kwargs = kwargs
 
         self._puller = None
         self._queue = None
+        self._errors = None      # queue of the errors of the background process
+        self._pending = deque()  # chunks which have been fetched from the queue but not yet pulled
+        self._n_channels = 0     # number of channels of the last pulled chunk
 
     def to_dict(self) -> dict:
         """ Create dict representation of the current Receiver instance
@@ -61,6 +100,8 @@ class Receiver(Loadable, metaclass=ABCMeta):
         return dict(stream=self.stream,
                     stream_type=self.stream_type,
                     verbose=self.verbose,
+                    transport=self.transport,
+                    transport_duration=self.transport_duration,
                     **self._kwargs)
 
     def __enter__(self):
@@ -82,6 +123,12 @@ class Receiver(Loadable, metaclass=ABCMeta):
             self._queue.close()
             self._queue = None
 
+        if self._errors is not None:
+            self._errors.close()
+            self._errors = None
+
+        self._pending.clear()
+
     def __str__(self):
         return f"<{self.__class__.__name__}: {self.stream}-stream>"
 
@@ -125,6 +172,30 @@ class Receiver(Loadable, metaclass=ABCMeta):
         """
         self._verbose = value
 
+    @property
+    def transport(self) -> str:
+        """ Transport specification property (how data-chunks are transported from the background process) """
+        return self._transport
+
+    @transport.setter
+    def transport(self, value: str):
+        """ Transport specification property
+
+        :param value: the transport of data-chunks, needs to be an element of `biofb.pipeline.TRANSPORTS`
+        """
+        assert value in TRANSPORTS, f"Transport `{value}` not in {TRANSPORTS}."
+        self._transport = value
+
+    @property
+    def transport_duration(self) -> float:
+        """ Duration in seconds of stream data which can be buffered by a shared memory transport """
+        return self._transport_duration
+
+    @transport_duration.setter
+    def transport_duration(self, value: float):
+        assert value > 0, f"Transport duration must be positive (provided `{value}`)."
+        self._transport_duration = value
+
     @property
     @abstractmethod
     def is_connected(self) -> bool:
@@ -151,10 +222,17 @@ class Receiver(Loadable, metaclass=ABCMeta):
         """
         pass
 
+    def get_chunk_size(self) -> (int, None):
+        """ Maximum number of samples of a received chunk (None if unknown), see `make_queue` """
+        return None
+
     @abstractmethod
     def receive_data(self) -> [ndarray, ndarray]:
         """ receive data chunk from the established stream connection
 
+        Should block (with a timeout) until data are available, non-blocking implementations may
+        return None or an empty chunk if no data are available.
+
         :return (timestamp-ndarray, data-ndarray) tuple for a pulled data chunk from the stream
         """
         pass
@@ -167,16 +245,35 @@ class Receiver(Loadable, metaclass=ABCMeta):
         :return: The calling Receiver instance
         """
 
-        self._queue = Queue()
+        self._queue = self.make_queue()
+        self._errors = Queue()
+        self._pending.clear()
         self._puller = Process(name='pull data',
                                target=type(self).start_receiving_data,
-                               args=(self._queue, ),
+                               args=(self._queue, self._errors),
                                kwargs=self.to_dict())
         self._puller.start()
         return self
 
+    def make_queue(self) -> (Queue, SharedMemoryQueue):
+        """ Create the data-queue for the specified `transport`
+
+        A shared memory transport buffers `transport_duration` seconds of data, but at least three chunks
+        (see `get_chunk_size` and `biofb.pipeline.SharedMemoryQueue`).
+
+        :return: `multiprocessing.Queue` or `biofb.pipeline.SharedMemoryQueue` instance
+        """
+        if self.transport == 'shared_memory':
+            meta_data = self.stream_info['meta_data']
+            sampling_rate = meta_data.get('nominal_srate', 0)
+            capacity = int(self.transport_duration * sampling_rate) if sampling_rate else self.DEFAULT_TRANSPORT_CAPACITY
+            capacity = max(capacity, 3 * (self.get_chunk_size() or 0))
+            return SharedMemoryQueue(n_channels=meta_data['channel_count'], capacity=capacity)
+
+        return Queue()
+
     @classmethod
-    def start_receiving_data(cls, queue: Queue, **kwargs):
+    def start_receiving_data(cls, queue: (Queue, SharedMemoryQueue), errors: (Queue, None) = None, **kwargs):
         """ Class-method which creates, connects and starts a `Receiver`
         of type `cls` based on the `kwargs` specification.
 
@@ -185,28 +282,156 @@ class Receiver(Loadable, metaclass=ABCMeta):
         communicates with the main process via the specified
         `queue`.
 
-        :param queue: `multiprocessing.Queue` instance used for data-communication between main and child process.
+        If no data are available (`receive_data` returns None or an empty chunk), the loop
+        backs off exponentially from `MIN_BACKOFF` to `MAX_BACKOFF` seconds instead of
+        polling the stream without pause.
+
+        Errors terminate the loop and are sent to the main process via the `errors` queue (where they are
+        re-raised by `pull_data`).
+
+        :param queue: `multiprocessing.Queue` (or `biofb.pipeline.SharedMemoryQueue`) instance used for
+                      data-communication between main and child process.
+        :param errors: (Optional) `multiprocessing.Queue` to which an error of the receiving loop is sent
+                       (defaults to None, i.e. the error is printed).
         :param kwargs: dict representation of to be generated Receiver (`cls`) instance
         """
-        receiver = cls(**kwargs)
-        receiver.connect()
-        receiver._queue = queue
-
+        backoff = cls.MIN_BACKOFF
         try:
+            receiver = cls(**kwargs)
+            receiver.connect()
+            receiver._queue = queue
+
             while True:
                 chunk_data = receiver.receive_data()
+                if chunk_data is None or atleast_1d(chunk_data[0]).size == 0:
+                    time.sleep(backoff)
+                    backoff = min(2. * backoff, cls.MAX_BACKOFF)
+                    continue
+
+                backoff = cls.MIN_BACKOFF
                 receiver._queue.put(chunk_data)
         except Exception as ex:
-            print(ex)
+            if errors is None:
+                print(ex)
+                return
+
+            try:
+                pickle.dumps(ex)
+            except Exception:
+                ex = RuntimeError(f"{type(ex).__name__}: {ex}")  # unpicklable error
+
+            errors.put(ex)
 
     def pull_data(self) -> [ndarray, ndarray]:
         """ Pull received sample data from the data-queue
 
-        :return: tuple of (timestamp, sample-data) data-chunks of the specified chunk-size """
+        :return: tuple of (timestamp, sample-data) data-chunks of the specified chunk-size
+                 (views on the shared memory for the 'shared_memory' transport, which remain valid until
+                 the next chunk is pulled)
+        """
 
         assert self._puller is not None, "Background streaming needs to be `start`ed, use `receiver.start()`."
         assert self._queue is not None, "Background streaming needs to be `start`ed."
-        return self._queue.get()
+        return self._get_chunk()
+
+    def _get_chunk(self, block: bool = True, timeout: (float, None) = None) -> [ndarray, ndarray]:
+        """ Get next chunk from the already fetched pending chunks or from the data-queue
+
+        While waiting for a chunk, the background process is checked for errors every `ERROR_INTERVAL` seconds.
+
+        :raises queue.Empty: if no chunk is available
+        :raises Exception: the error of the background process, if it has failed
+        """
+        if self._pending:
+            chunk = self._pending.popleft()
+        else:
+            chunk = self._get_queued(block, timeout)
+
+        self._n_channels = chunk[1].shape[-1] if chunk[1].ndim > 1 else 1
+        return chunk
+
+    def _get_queued(self, block: bool, timeout: (float, None)) -> [ndarray, ndarray]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.ERROR_INTERVAL if deadline is None else \
+                min(max(deadline - time.monotonic(), 0.), self.ERROR_INTERVAL)
+
+            try:
+                return self._queue.get(block, wait if block else None)
+            except Empty:
+                self._raise_error()
+                if not block or (deadline is not None and time.monotonic() >= deadline):
+                    raise
+
+    def _raise_error(self):
+        """ Raise the error of a failed background process """
+        if self._errors is None or self._puller is None or self._puller.is_alive():
+            return
+
+        try:
+            error = self._errors.get(timeout=self.ERROR_INTERVAL)  # sent before the process terminated
+        except Empty:
+            error = RuntimeError(f"Receiver process terminated (exit code {self._puller.exitcode}).")
+
+        self.stop()
+        raise error
+
+    def poll(self) -> int:
+        """ Number of received samples which are pending in the data-queue (non-blocking)
+
+        :return: Number of samples which can be pulled without blocking.
+        """
+
+        assert self._queue is not None, "Background streaming needs to be `start`ed, use `receiver.start()`."
+
+        if isinstance(self._queue, SharedMemoryQueue):
+            return self._queue.pending_samples()
+
+        # a `multiprocessing.Queue` can't be inspected, queued chunks are fetched to the pending chunks
+        while True:
+            try:
+                self._pending.append(self._queue.get_nowait())
+            except Empty:
+                break
+
+        return sum(len(data) for timestamps, data in self._pending)
+
+    def pull_available(self, max_chunks: (int, None) = None, timeout: (float, None) = 0.) -> [ndarray, ndarray]:
+        """ Pull all received chunks from the data-queue and merge them into one contiguous (timestamp, data) pair
+
+        Allows a consumer which fell behind real time to catch up in one step (instead of pulling one chunk per
+        iteration with `pull_data`).
+
+        :param max_chunks: (Optional) maximum number of merged chunks (defaults to None, i.e. all queued chunks).
+        :param timeout: Time in seconds to wait for the first chunk if no chunk is queued (defaults to 0, i.e.
+                        non-blocking; None blocks until a chunk is available).
+        :return: tuple of (timestamp, sample-data) arrays of all pulled chunks, the arrays are empty if no
+                 chunk is available (the returned arrays never refer to the shared memory of the transport)
+        """
+
+        assert self._puller is not None, "Background streaming needs to be `start`ed, use `receiver.start()`."
+        assert self._queue is not None, "Background streaming needs to be `start`ed."
+
+        copy_chunks = isinstance(self._queue, SharedMemoryQueue)  # views are invalidated by the next `get`
+
+        timestamps, data = [], []
+        while max_chunks is None or len(data) < max_chunks:
+            try:
+                block = not data and (timeout is None or timeout > 0)
+                chunk_timestamps, chunk_data = self._get_chunk(block=block, timeout=timeout if block else None)
+            except Empty:
+                break
+
+            timestamps.append(atleast_1d(chunk_timestamps).copy() if copy_chunks else atleast_1d(chunk_timestamps))
+            data.append(chunk_data.copy() if copy_chunks else chunk_data)
+
+        if not data:
+            return empty(0), empty((0, self._n_channels))
+
+        if len(data) == 1:
+            return timestamps[0], data[0]
+
+        return concatenate(timestamps), concatenate(data)
 
     def stop(self):
         """ Stop background receiving and cleanup started processes and queues """
@@ -0,0 +1,378 @@
+from biofb.io import create_hdf5_dataset, append_hdf5, actions_to_records
+from numpy import ndarray, asarray, array, empty, concatenate
+from numpy.lib.format import write_array, read_array
+from queue import Queue, Empty
+from time import monotonic
+from io import BytesIO
+import threading
+import struct
+import json
+import zlib
+import h5py
+import os
+
+
+RECORDING_MAGIC = b'BIOFBREC'
+RECORDING_VERSION = 1
+
+RECORD_STREAMS = 0  # json list of stream descriptions (name, channels, sampling_rate)
+RECORD_DATA = 1     # npy timestamps and npy data chunk of one stream
+RECORD_ACTION = 2   # json list `[timestamp, *action_values]`
+
+RECORDING_BATCH_BYTES = 2 ** 20  # data of consecutive records which is appended at once in `Recorder.to_hdf5`
+
+_FILE_HEADER = struct.Struct('<8sI')   # magic, version
+_RECORD_HEADER = struct.Struct('<BHI')  # kind, stream index, payload size
+_RECORD_CRC = struct.Struct('<I')       # crc32 of record header and payload
+
+
+def _to_json(value):
+    """ json fallback of non-standard action values (numpy types, other objects via `str`) """
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+
+    return str(value)
+
+
+def encode_record(kind: int, stream: int = 0, payload: bytes = b'') -> bytes:
+    """ Encode a record of a recording, i.e. its header, `payload` and checksum """
+    header = _RECORD_HEADER.pack(kind, stream, len(payload))
+    return header + payload + _RECORD_CRC.pack(zlib.crc32(payload, zlib.crc32(header)))
+
+
+def encode_data(timestamps: (ndarray, None), data: ndarray) -> bytes:
+    """ Encode a data chunk (and its timestamps) as payload of a `RECORD_DATA` record """
+    f = BytesIO()
+    write_array(f, asarray(timestamps if timestamps is not None else empty(0), dtype=float), allow_pickle=False)
+    write_array(f, asarray(data), allow_pickle=False)
+    return f.getvalue()
+
+
+def decode_data(payload: bytes) -> tuple:
+    """ Decode the payload of a `RECORD_DATA` record, i.e. a tuple of (timestamps or None, data) """
+    f = BytesIO(payload)
+    timestamps = read_array(f, allow_pickle=False)
+    data = read_array(f, allow_pickle=False)
+    return (timestamps if len(timestamps) > 0 or len(data) == 0 else None), data
+
+
+def iter_records(filename: str):
+    """ Iterate over the records of a recording file (see `Recorder`)
+
+    Reading stops at the first incomplete or corrupted record, e.g. the partially written last record of a
+    recording whose process has been killed, all preceding records are valid.
+
+    :param filename: Path to the recording file.
+    :return: Generator of tuples of (kind, stream index, payload bytes).
+    """
+    with open(filename, 'rb') as f:
+        magic, version = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+        assert magic == RECORDING_MAGIC, f"`{filename}` is not a recording file."
+        assert version == RECORDING_VERSION, f"Unsupported recording version `{version}`."
+
+        while True:
+            header = f.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+
+            kind, stream, n_bytes = _RECORD_HEADER.unpack(header)
+            payload = f.read(n_bytes)
+            crc = f.read(_RECORD_CRC.size)
+            if len(payload) < n_bytes or len(crc) < _RECORD_CRC.size or \
+                    _RECORD_CRC.unpack(crc)[0] != zlib.crc32(payload, zlib.crc32(header)):
+                return
+
+            yield kind, stream, payload
+
+
+def read_recording(filename: str) -> dict:
+    """ Read a (possibly incomplete) recording file (see `Recorder`)
+
+    :param filename: Path to the recording file.
+    :return: Dict with the keys `streams` (list of stream descriptions), `data` and `timestamps` (lists of the
+             concatenated data and timestamps of each stream, None if no data/timestamps have been recorded) and
+             `actions` (list of `(timestamp, *action_values)` tuples).
+    """
+    streams, data, timestamps, actions = [], [], [], []
+
+    for kind, stream, payload in iter_records(filename):
+        if kind == RECORD_STREAMS:
+            streams = json.loads(payload.decode())
+            data, timestamps = [[] for _ in streams], [[] for _ in streams]
+
+        elif kind == RECORD_DATA:
+            t, d = decode_data(payload)
+            data[stream].append(d)
+            timestamps[stream].append(t)
+
+        elif kind == RECORD_ACTION:
+            actions.append(tuple(json.loads(payload.decode())))
+
+    return dict(
+        streams=streams,
+        data=[concatenate(d) if d else None for d in data],
+        timestamps=[concatenate(t) if t and all(ti is not None for ti in t) else None for t in timestamps],
+        actions=actions,
+    )
+
+
+class Recorder(object):
+    """ Write-ahead recording of received data chunks and agent actions
+
+    Data chunks and actions are queued (`record_data`, `record_action`) and appended to an append-only binary
+    recording file by a background writer thread, the file is flushed to disk every `flush_interval` seconds.
+    The queue is bounded (`max_queued` records), i.e. recording blocks if the writer falls behind, such that
+    the memory use of a recording is constant, independent of the session length.
+
+    Each record carries a checksum: if the recording process is killed, the recording can be read up to the last
+    completely written record (see `read_recording`), and converted to the HDF5 layout of `biofb.session.Sample`
+    and `biofb.controller.Agent` data (see `to_hdf5`).
+    """
+
+    def __init__(self, filename: str, streams: (list, tuple) = (), max_queued: int = 1024,
+                 flush_interval: float = 1.):
+        """ Constructs a `Recorder` instance
+
+        :param filename: Path to the recording file (an existing file is overwritten on `start`).
+        :param streams: List of stream descriptions, i.e. dicts with `name`, `channels` and `sampling_rate` keys,
+                        e.g. of the `Device`s of a hardware `Setup` (see `get_streams`).
+        :param max_queued: Maximum number of queued records (defaults to 1024).
+        :param flush_interval: Interval in seconds in which the recording file is flushed to disk (defaults to 1).
+        """
+        assert max_queued > 0, f"Number of queued records must be positive (provided `{max_queued}`)."
+        assert flush_interval > 0, f"Flush interval must be positive (provided `{flush_interval}`)."
+
+        self._filename = filename
+        self._streams = [dict(s) for s in streams]
+        self._max_queued = max_queued
+        self._flush_interval = flush_interval
+
+        self._queue = None
+        self._writer = None
+        self._error = None
+        self._n_records = 0
+
+    @staticmethod
+    def get_streams(setup) -> list:
+        """ Stream descriptions of the `Device`s of a hardware `biofb.hardware.Setup` """
+        streams = []
+        for device in setup.devices:
+            sampling_rates = [r for r in device.sampling_rates if r is not None]
+            streams.append(dict(name=device.name, channels=list(device.channel_names),
+                                sampling_rate=max(sampling_rates) if sampling_rates else None))
+
+        return streams
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def streams(self) -> list:
+        return self._streams
+
+    @property
+    def running(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def n_records(self) -> int:
+        """ Number of records which have been written to the recording file so far """
+        return self._n_records
+
+    def start(self):
+        """ Create the recording file and start the background writer thread """
+        assert not self.running, "Recorder is already running."
+
+        self._queue = Queue(maxsize=self._max_queued)
+        self._error = None
+        self._n_records = 0
+
+        f = open(self._filename, 'wb')
+        f.write(_FILE_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION))
+        f.write(encode_record(RECORD_STREAMS, payload=json.dumps(self._streams).encode()))
+        f.flush()
+        os.fsync(f.fileno())
+
+        self._writer = threading.Thread(name='recorder-writer', target=self._write, args=(f, ), daemon=True)
+        self._writer.start()
+
+    def stop(self):
+        """ Write all queued records, flush and close the recording file """
+        if not self.running:
+            return
+
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+        self._raise_error()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _put(self, item: tuple):
+        assert self.running, "Recorder is not running, call `start` first."
+        self._raise_error()
+        self._queue.put(item)  # blocks if the writer falls behind (bounded memory)
+
+    def record_data(self, stream: int, timestamps: (ndarray, None), data: ndarray):
+        """ Queue a received data chunk of a stream
+
+        :param stream: Index of the stream (see `streams`).
+        :param timestamps: (Optional) timestamps of the samples of the chunk.
+        :param data: Data chunk of shape `(n_samples, n_channels)`.
+        """
+        if data is None:
+            return
+
+        data = array(data)  # copy, the chunk may be modified after recording
+        if len(data) == 0:
+            return
+
+        if timestamps is not None:
+            timestamps = array(timestamps, dtype=float).reshape(-1)
+            if len(timestamps) != len(data):
+                timestamps = None  # timestamps are only kept if provided for every sample (see `Setup.timestamps`)
+
+        self._put((RECORD_DATA, stream, timestamps, data))
+
+    def record_action(self, timestamp: float, *action):
+        """ Queue an agent action
+
+        :param timestamp: Timestamp of the action.
+        :param action: Action values (json-serializable, numpy values are converted, other objects via `str`).
+        """
+        self._put((RECORD_ACTION, 0, timestamp, action))
+
+    def _write(self, f):
+        """ Writer thread: encode and append the queued records, flush periodically """
+        flushed = monotonic()
+
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self._flush_interval)
+                except Empty:
+                    item = ()
+
+                if item is None:
+                    break
+
+                if item:
+                    kind, stream, *values = item
+                    if kind == RECORD_DATA:
+                        payload = encode_data(*values)
+                    else:
+                        timestamp, action = values
+                        payload = json.dumps([timestamp, *action], default=_to_json).encode()
+
+                    f.write(encode_record(kind, stream, payload))
+                    self._n_records += 1
+
+                if monotonic() - flushed >= self._flush_interval:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    flushed = monotonic()
+
+        except Exception as ex:
+            self._error = ex
+
+            # keep consuming such that producers never block on a failed writer
+            while self._queue.get() is not None:
+                pass
+
+        finally:
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+
+    @staticmethod
+    def to_hdf5(filename: str, h5filename: str, mode: str = 'a', key: str = 'sample.data',
+                action_key: (str, None) = 'action_data', **dataset_kwargs):
+        """ Convert a (possibly incomplete) recording file to the HDF5 layout of `biofb.session.Sample.dump_data`
+            and `biofb.controller.Agent.dump_actions`
+
+        The data chunks are appended to resizable datasets in batches of about `RECORDING_BATCH_BYTES` bytes,
+        i.e. the memory use of the conversion does not depend on the length of the recording.
+
+        :param filename: Path to the recording file.
+        :param h5filename: Path to the HDF5 file.
+        :param mode: File mode of the HDF5 file (defaults to 'a').
+        :param key: HDF5 group of the sample data (defaults to 'sample.data').
+        :param action_key: HDF5 dataset of the actions (defaults to 'action_data', None: actions are not converted).
+        :param dataset_kwargs: Keyword arguments of the data datasets, e.g. `compression`
+                               (see `biofb.io.create_hdf5_dataset`, the datasets are always chunked).
+        :return: Number of converted records.
+        """
+        streams, pending, datasets, actions, n_records = [], {}, {}, [], 0
+
+        def write(stream):
+            """ append the pending chunks of a stream to its datasets """
+            data = concatenate([d for _, d in pending[stream]])
+            timestamps = [t for t, _ in pending[stream]]
+            timestamps = concatenate(timestamps) if all(t is not None for t in timestamps) else None
+            pending[stream] = []
+
+            name = streams[stream]['name']
+            if stream not in datasets:
+                dataset = create_hdf5_dataset(g, name, data=data, **dataset_kwargs)
+                dataset.attrs['channels'] = streams[stream]['channels']
+                if streams[stream]['sampling_rate'] is not None:
+                    dataset.attrs['sampling_rate'] = streams[stream]['sampling_rate']
+
+                timestamps_dataset = None
+                if timestamps is not None:
+                    timestamps_dataset = create_hdf5_dataset(g.require_group('timestamps'), name, data=timestamps,
+                                                             **dataset_kwargs)
+
+                datasets[stream] = (dataset, timestamps_dataset)
+                return
+
+            dataset, timestamps_dataset = datasets[stream]
+            append_hdf5(dataset, data)
+
+            if timestamps_dataset is not None:
+                if timestamps is not None:
+                    append_hdf5(timestamps_dataset, timestamps)
+                else:  # timestamps are only kept if provided for every sample (see `Setup.timestamps`)
+                    del g['timestamps'][name]
+                    datasets[stream] = (dataset, None)
+
+        with h5py.File(h5filename, mode) as h5:
+            g = h5.require_group(key)
+
+            for kind, stream, payload in iter_records(filename):
+                n_records += 1
+
+                if kind == RECORD_STREAMS:
+                    streams = json.loads(payload.decode())
+                    pending = {i: [] for i in range(len(streams))}
+
+                elif kind == RECORD_DATA:
+                    pending[stream].append(decode_data(payload))
+                    if sum(d.nbytes for _, d in pending[stream]) >= RECORDING_BATCH_BYTES:
+                        write(stream)
+
+                elif kind == RECORD_ACTION:
+                    actions.append(tuple(json.loads(payload.decode())))
+
+            for stream, chunks in pending.items():
+                if chunks:
+                    write(stream)
+
+            if action_key is not None:
+                if action_key in h5:
+                    del h5[action_key]
+
+                h5.create_dataset(action_key, data=actions_to_records(actions))
+
+        return n_records
@@ -0,0 +1,239 @@
+from multiprocessing import shared_memory, Semaphore
+from queue import Empty, Full
+from numpy import ndarray, asarray, broadcast_to, dtype as np_dtype
+from time import monotonic
+
+
+class SharedMemoryQueue(object):
+    """ Single-producer single-consumer (SPSC) ring-buffer of `(timestamps, data)` chunks in shared memory
+
+    The queue is a drop-in replacement for a `multiprocessing.Queue` transporting `(timestamps, data)`
+    chunks between a producer process (e.g. a background `Receiver` process) and a consumer process
+    (e.g. the main process): chunks are written directly into a shared memory block, no pickling or
+    copying via pipes is involved. The consumer receives **views** on the shared memory.
+
+    Memory layout of the shared memory block:
+
+    - header of cursors and sequence counters (int64), i.e. the absolute write position `head` of the
+      producer, the absolute release position `tail` of the consumer and the number of written and read chunks
+    - chunk descriptors (int64), i.e. the absolute start position and the length of each chunk
+    - timestamps (float64) of `capacity` samples
+    - data (`dtype`) of `capacity` samples with `n_channels` channels
+
+    Chunks are always stored contiguously: if a chunk doesn't fit to the end of the ring-buffer,
+    the remaining samples at the end of the buffer are skipped and the chunk is written to the front.
+    To guarantee progress of the producer while the consumer holds a chunk, a single chunk must not
+    exceed a third of the `capacity`. If the ring-buffer is full, the producer blocks on a semaphore which is
+    released by the consumer for every read chunk (no polling).
+
+    **Note**: A view returned by `get` remains valid until the next call of `get`, afterwards the
+    memory may be overwritten by the producer. Copy the data if it needs to be retained.
+    """
+
+    HEADER = ('head', 'tail', 'written', 'read')
+    """ Header fields (cursors and sequence counters) of the shared memory block """
+
+    def __init__(self, n_channels: int, capacity: int, max_chunks: (int, None) = None, dtype='float64',
+                 name: (str, None) = None, create: bool = True, items: (Semaphore, None) = None,
+                 space: (Semaphore, None) = None):
+        """ Constructs a `SharedMemoryQueue` instance
+
+        :param n_channels: Number of data channels of each sample (int).
+        :param capacity: Number of samples which can be stored in the ring-buffer (int).
+        :param max_chunks: (Optional) Maximum number of chunks in the ring-buffer (defaults to `capacity`).
+        :param dtype: Data type of the sample data (defaults to 'float64').
+        :param name: (Optional) Name of the shared memory block (defaults to None, i.e. a unique name is generated
+                     if the block is created).
+        :param create: Boolean controlling whether the shared memory block is created (if True) or whether an existing
+                       block of name `name` is attached (if False), defaults to True.
+        :param items: (Optional) `multiprocessing.Semaphore` counting the available chunks
+                      (created if not provided).
+        :param space: (Optional) `multiprocessing.Semaphore` signaling released memory to a waiting producer
+                      (created if not provided).
+        """
+        assert capacity > 0, f"Capacity must be positive (provided `{capacity}`)."
+
+        self._n_channels = int(n_channels)
+        self._capacity = int(capacity)
+        self._max_chunks = int(max_chunks) if max_chunks is not None else self._capacity
+        self._dtype = np_dtype(dtype)
+
+        self._items = items if items is not None else Semaphore(0)
+        self._space = space if space is not None else Semaphore(0)
+        self._owner = create
+
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=self.get_size())
+        self._map_arrays()
+
+        if create:
+            self._header[:] = 0
+
+    def get_size(self) -> int:
+        """ Number of bytes of the shared memory block """
+        return (len(self.HEADER) * 8 +                                  # header
+                self._max_chunks * 2 * 8 +                              # descriptors
+                self._capacity * 8 +                                    # timestamps
+                self._capacity * self._n_channels * self._dtype.itemsize)  # data
+
+    def _map_arrays(self):
+        """ Map numpy arrays onto the shared memory block """
+        buffer, offset = self._shm.buf, 0
+
+        self._header = ndarray((len(self.HEADER),), dtype='int64', buffer=buffer, offset=offset)
+        offset += self._header.nbytes
+
+        self._descriptors = ndarray((self._max_chunks, 2), dtype='int64', buffer=buffer, offset=offset)
+        offset += self._descriptors.nbytes
+
+        self._timestamps = ndarray((self._capacity,), dtype='float64', buffer=buffer, offset=offset)
+        offset += self._timestamps.nbytes
+
+        self._data = ndarray((self._capacity, self._n_channels), dtype=self._dtype, buffer=buffer, offset=offset)
+
+    def __getstate__(self):
+        # attach to the existing shared memory block when unpickled (e.g. in a child process)
+        return dict(n_channels=self._n_channels, capacity=self._capacity, max_chunks=self._max_chunks,
+                    dtype=self._dtype.str, name=self.name, items=self._items, space=self._space)
+
+    def __setstate__(self, state):
+        self.__init__(create=False, **state)
+
+    @property
+    def name(self) -> str:
+        """ Name of the shared memory block """
+        return self._shm.name
+
+    @property
+    def capacity(self) -> int:
+        """ Number of samples which can be stored in the ring-buffer """
+        return self._capacity
+
+    @property
+    def n_channels(self) -> int:
+        """ Number of data channels of each sample """
+        return self._n_channels
+
+    def qsize(self) -> int:
+        """ Number of chunks which have been written but not yet read """
+        head, tail, written, read = self._header
+        return int(written - read)
+
+    def empty(self) -> bool:
+        """ True if no unread chunks are available """
+        return self.qsize() == 0
+
+    def pending_samples(self) -> int:
+        """ Number of samples in written but not yet read chunks """
+        head, tail, written, read = self._header
+        indices = [i % self._max_chunks for i in range(read, written)]
+        return int(self._descriptors[indices, 1].sum())
+
+    def put(self, obj: tuple, block: bool = True, timeout: (float, None) = None):
+        """ Write a `(timestamps, data)` chunk to the ring-buffer (producer side)
+
+        :param obj: tuple of (timestamps, data) arrays of shapes `(n_samples, )` and `(n_samples, n_channels)`.
+        :param block: Boolean controlling whether to wait for free space in the ring-buffer (defaults to True).
+        :param timeout: (Optional) maximum time in seconds to wait for free space (defaults to None, i.e. forever).
+        :raises queue.Full: if no space is available in the ring-buffer.
+        :raises ValueError: if the chunk exceeds a third of the capacity of the ring-buffer.
+        """
+        timestamps, data = obj
+        data = asarray(data)
+        if data.ndim == 1:
+            data = data.reshape(1, -1)
+
+        n = len(data)
+        if n > self._capacity // 3:
+            raise ValueError(f"Chunk of {n} samples exceeds a third of the capacity of {self._capacity} samples.")
+
+        timestamps = broadcast_to(asarray(timestamps, dtype='float64').ravel() if hasattr(timestamps, '__len__')
+                                  else timestamps, (n, ))
+
+        header = self._header
+        deadline = None if (timeout is None or not block) else monotonic() + timeout
+        waiting = False
+        while True:
+            head, tail, written, read = header
+            position = head % self._capacity
+            padding = self._capacity - position if position + n > self._capacity else 0
+
+            if head + padding + n - tail <= self._capacity and written - read < self._max_chunks:
+                break
+
+            if not block:
+                raise Full
+
+            if not waiting:
+                # discard releases of chunks which have been read before, and check again before waiting
+                # (a chunk which is read after the check releases the semaphore, i.e. no release is missed)
+                while self._space.acquire(False):
+                    pass
+
+                waiting = True
+                continue
+
+            remaining = None if deadline is None else deadline - monotonic()
+            if (remaining is not None and remaining <= 0) or not self._space.acquire(True, remaining):
+                raise Full
+
+        start = head + padding
+        position = start % self._capacity
+        self._timestamps[position:position + n] = timestamps
+        self._data[position:position + n] = data
+        self._descriptors[written % self._max_chunks] = (start, n)
+
+        # publish the chunk only after the data has been written
+        header[0] = start + n
+        header[2] = written + 1
+        self._items.release()
+
+    def put_nowait(self, obj: tuple):
+        return self.put(obj, block=False)
+
+    def get(self, block: bool = True, timeout: (float, None) = None) -> (ndarray, ndarray):
+        """ Read a `(timestamps, data)` chunk from the ring-buffer (consumer side)
+
+        The memory of the previously read chunk is released.
+
+        :param block: Boolean controlling whether to wait for an available chunk (defaults to True).
+        :param timeout: (Optional) maximum time in seconds to wait for a chunk (defaults to None, i.e. forever).
+        :return: tuple of (timestamps, data) views on the shared memory.
+        :raises queue.Empty: if no chunk is available.
+        """
+        if not self._items.acquire(block, timeout):
+            raise Empty
+
+        header = self._header
+        read = header[3]
+        start, n = self._descriptors[read % self._max_chunks]
+        position = start % self._capacity
+
+        # release previously read chunks, the current chunk is released with the next call
+        header[1] = start
+        header[3] = read + 1
+        self._space.release()
+
+        return self._timestamps[position:position + n], self._data[position:position + n]
+
+    def get_nowait(self) -> (ndarray, ndarray):
+        return self.get(block=False)
+
+    def close(self):
+        """ Close the shared memory block (and remove it, if the calling instance created the block) """
+        if self._shm is None:
+            return
+
+        self._header = self._descriptors = self._timestamps = self._data = None
+
+        try:
+            self._shm.close()
+        except BufferError:
+            pass  # views on the memory are still in use, the memory is freed with the last view
+
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+        self._shm = None
@@ -0,0 +1,232 @@
+from biofb.io import DataBuffer
+from numpy import ndarray, asarray, atleast_1d, arange, empty, floor, clip, ceil, exp, sum as np_sum
+
+
+class ClockModel(object):
+    """ Online estimate of the clock of a sampled stream, i.e. of the linear relation `t(n) = offset + period * n`
+        between the sample index `n` and the (jittered) timestamps `t` of the stream.
+
+    The model is an exponentially weighted least-squares fit of the timestamps against the sample indices:
+    the intercept captures the clock offset of the stream, the deviation of the slope from the nominal sampling
+    period captures the clock drift. Weighted means and co-moments are merged chunk-wise (numerically stable for
+    multi-hour streams), samples older than `memory` samples are forgotten exponentially.
+    """
+
+    def __init__(self, sampling_rate: float, memory: float):
+        """ Constructs a `ClockModel` instance
+
+        :param sampling_rate: Nominal sampling rate of the stream in Hz.
+        :param memory: Effective number of samples which contribute to the fit (exponential forgetting).
+        """
+        assert sampling_rate > 0, f"Sampling rate must be positive (provided `{sampling_rate}`)."
+        assert memory > 1, f"Memory must exceed one sample (provided `{memory}`)."
+
+        self._nominal_period = 1. / sampling_rate
+        self._forgetting = exp(-1. / memory)
+
+        self._weight = 0.    # total weight of all fitted samples
+        self._mean_n = 0.    # weighted mean of the sample indices
+        self._mean_t = 0.    # weighted mean of the timestamps
+        self._var_n = 0.     # weighted co-moment of the sample indices
+        self._cov_nt = 0.    # weighted co-moment of the sample indices and the timestamps
+
+    @property
+    def period(self) -> float:
+        """ Estimated sampling period of the stream in seconds (the nominal period if the drift can't be estimated) """
+        if self._var_n <= 0.:
+            return self._nominal_period
+
+        return self._cov_nt / self._var_n
+
+    @property
+    def drift(self) -> float:
+        """ Estimated relative clock drift of the stream (i.e., `period / nominal_period - 1`) """
+        return self.period / self._nominal_period - 1.
+
+    @property
+    def offset(self) -> float:
+        """ Estimated timestamp of the sample with index 0 """
+        return self._mean_t - self.period * self._mean_n
+
+    def update(self, indices: ndarray, timestamps: ndarray):
+        """ Fit the model to a new chunk of (sample indices, timestamps) pairs """
+        n = len(indices)
+        if n == 0:
+            return
+
+        weights = self._forgetting ** arange(n - 1, -1, -1)
+        weight = np_sum(weights)
+        mean_n = np_sum(weights * indices) / weight
+        mean_t = np_sum(weights * timestamps) / weight
+        dn, dt = indices - mean_n, timestamps - mean_t
+        var_n = np_sum(weights * dn * dn)
+        cov_nt = np_sum(weights * dn * dt)
+
+        # merge the decayed moments of the previous chunks with the moments of the new chunk
+        decayed = self._weight * self._forgetting ** n
+        total = decayed + weight
+        delta_n, delta_t = mean_n - self._mean_n, mean_t - self._mean_t
+        factor = decayed * weight / total
+
+        self._var_n = self._var_n * self._forgetting ** n + var_n + factor * delta_n * delta_n
+        self._cov_nt = self._cov_nt * self._forgetting ** n + cov_nt + factor * delta_n * delta_t
+        self._mean_n += delta_n * weight / total
+        self._mean_t += delta_t * weight / total
+        self._weight = total
+
+    def time(self, indices: (ndarray, float)) -> (ndarray, float):
+        """ De-jittered timestamps of the specified sample indices """
+        return self._mean_t + self.period * (indices - self._mean_n)
+
+    def index(self, timestamps: (ndarray, float)) -> (ndarray, float):
+        """ (Fractional) sample indices of the specified timestamps """
+        return self._mean_n + (timestamps - self._mean_t) / self.period
+
+
+class Synchronizer(object):
+    """ Timestamp-aligned synchronization of multiple `(timestamps, data)` streams
+
+    Each stream (e.g. a 500 Hz Bioplux and a 250 Hz Unicorn LSL stream) is associated with an online
+    `ClockModel` which estimates the clock offset and drift of the stream from its jittered timestamps.
+    The samples of all streams are resampled (vectorized linear interpolation over all channels) onto a common
+    time base of `sampling_rate` Hz, starting at the first instant covered by all streams. Each `update` emits the
+    aligned window of all common time instants which are covered by all streams so far.
+
+    The synchronizer runs incrementally with bounded memory: only the last `buffer_duration` seconds of each
+    stream are retained (in ring-buffer `biofb.io.DataBuffer`s), a stream which lags behind the others by more
+    than `buffer_duration` seconds thus loses samples (the interpolation is clipped to the retained samples).
+    """
+
+    def __init__(self, sampling_rates: (list, tuple), sampling_rate: (float, None) = None,
+                 clock_memory: float = 30., buffer_duration: float = 10.):
+        """ Constructs a `Synchronizer` instance
+
+        :param sampling_rates: List of nominal sampling rates (in Hz) of the synchronized streams.
+        :param sampling_rate: (Optional) Sampling rate of the common time base in Hz
+                              (defaults to None, i.e. the maximum of the `sampling_rates`).
+        :param clock_memory: Duration in seconds of the stream history used to estimate the clock offset and
+                             drift of each stream (exponential forgetting, defaults to 30.).
+        :param buffer_duration: Duration in seconds of the retained history of each stream (defaults to 10.).
+        """
+        assert len(sampling_rates) > 0, "At least one stream needs to be synchronized."
+        assert buffer_duration > 0, f"Buffer duration must be positive (provided `{buffer_duration}`)."
+
+        self._sampling_rates = [float(r) for r in sampling_rates]
+        self._sampling_rate = float(sampling_rate) if sampling_rate is not None else max(self._sampling_rates)
+        assert self._sampling_rate > 0, f"Sampling rate must be positive (provided `{sampling_rate}`)."
+
+        self._clock_memory = clock_memory
+        self._buffer_duration = buffer_duration
+
+        self._clocks = [ClockModel(sampling_rate=r, memory=clock_memory * r) for r in self._sampling_rates]
+        self._buffers = [DataBuffer(capacity=max(2, int(ceil(buffer_duration * r)))) for r in self._sampling_rates]
+        self._n_received = [0] * self.n_streams  # total number of received samples of each stream
+
+        self._start = None  # first instant of the common time base
+        self._n_emitted = 0  # number of emitted instants of the common time base
+
+    @property
+    def n_streams(self) -> int:
+        return len(self._sampling_rates)
+
+    @property
+    def sampling_rate(self) -> float:
+        """ Sampling rate of the common time base in Hz """
+        return self._sampling_rate
+
+    @property
+    def clocks(self) -> list:
+        """ List of the `ClockModel`s of the synchronized streams """
+        return self._clocks
+
+    @property
+    def offsets(self) -> list:
+        """ Estimated clock offsets of the streams relative to the first stream in seconds """
+        return [clock.offset - self._clocks[0].offset for clock in self._clocks]
+
+    @property
+    def drifts(self) -> list:
+        """ Estimated relative clock drifts of the streams """
+        return [clock.drift for clock in self._clocks]
+
+    def reset(self):
+        """ Discard all received samples and clock estimates """
+        self.__init__(sampling_rates=self._sampling_rates, sampling_rate=self._sampling_rate,
+                      clock_memory=self._clock_memory, buffer_duration=self._buffer_duration)
+
+    def append(self, stream: int, timestamps: (ndarray, list), data: (ndarray, list)):
+        """ Append a `(timestamps, data)` chunk of a stream (updates the clock model of the stream) """
+        data = asarray(data, dtype=float)
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+
+        timestamps = atleast_1d(asarray(timestamps, dtype=float))
+        n = len(data)
+        if n == 0:
+            return
+
+        assert len(timestamps) == n, f"Got {len(timestamps)} timestamps for {n} samples."
+
+        indices = arange(self._n_received[stream], self._n_received[stream] + n, dtype=float)
+        self._clocks[stream].update(indices, timestamps)
+        self._buffers[stream].append(data)
+        self._n_received[stream] += n
+
+    def update(self, chunks: (list, tuple)) -> [ndarray, list]:
+        """ Append one `(timestamps, data)` chunk per stream and emit the aligned window
+
+        :param chunks: list of `(timestamps, data)` chunks, one per stream (chunks may be empty).
+        :return: tuple of (timestamps, list of data arrays) of the newly aligned window, i.e. the common
+                 timestamps (shape `(n_samples, )`) and the resampled data of each stream (shape
+                 `(n_samples, n_channels_i)`). The arrays are empty if no new instant is covered by all streams.
+        """
+        assert len(chunks) == self.n_streams, f"Expected {self.n_streams} chunks, got {len(chunks)}."
+
+        for stream, (timestamps, data) in enumerate(chunks):
+            self.append(stream, timestamps, data)
+
+        return self.emit()
+
+    def emit(self) -> [ndarray, list]:
+        """ Emit the aligned window of all instants of the common time base covered by all streams so far
+
+        :return: tuple of (timestamps, list of data arrays), see `update`.
+        """
+        if any(len(buffer) == 0 for buffer in self._buffers):
+            return self._empty()
+
+        first = [clock.time(n - len(buffer)) for clock, buffer, n in
+                 zip(self._clocks, self._buffers, self._n_received)]
+        last = [clock.time(n - 1) for clock, n in zip(self._clocks, self._n_received)]
+
+        period = 1. / self._sampling_rate
+        if self._start is None:
+            self._start = max(first)
+
+        n_covered = int(floor((min(last) - self._start) / period)) + 1
+        if n_covered <= self._n_emitted:
+            return self._empty()
+
+        timestamps = self._start + period * arange(self._n_emitted, n_covered)
+        self._n_emitted = n_covered
+
+        return timestamps, [self._interpolate(stream, timestamps) for stream in range(self.n_streams)]
+
+    def _interpolate(self, stream: int, timestamps: ndarray) -> ndarray:
+        """ Vectorized linear interpolation of all channels of the retained samples of a stream """
+        buffer = self._buffers[stream]
+        data = buffer.data
+
+        # fractional positions in the retained samples
+        position = self._clocks[stream].index(timestamps) - (self._n_received[stream] - len(buffer))
+        position = clip(position, 0, len(buffer) - 1)
+
+        lower = clip(floor(position).astype(int), 0, max(len(buffer) - 2, 0))
+        upper = clip(lower + 1, 0, len(buffer) - 1)
+        fraction = (position - lower)[:, None]
+
+        return data[lower] * (1. - fraction) + data[upper] * fraction
+
+    def _empty(self) -> [ndarray, list]:
+        return empty(0), [empty((0, buffer.data.shape[1] if buffer.data is not None else 0))
+                          for buffer in self._buffers]
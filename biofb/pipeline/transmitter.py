@@ -1,11 +1,12 @@
-from biofb.io import Loadable
+from biofb.io import Loadable, MappedArray, is_memory_mapped
 from numpy import ndarray
 from abc import ABCMeta, abstractmethod
 from multiprocessing import Process, Queue, Event
 from queue import Empty
 from collections import defaultdict
-from numpy import ndim, shape, concatenate
+from numpy import ndim, shape
 from biofb.pipeline import STREAM_TYPES
+from biofb.pipeline import Pacer
 
 
 
@@ -100,6 +101,10 @@ class Transmitter(Loadable, metaclass=ABCMeta):
     - A device is used to setup a stream
     - Data can be pushed to the Transmitter instance which broadcasts it to the stream
 
+    Pushed data are paced by a `biofb.pipeline.Pacer` on a drift-free target timeline (see `get_pacer`), at
+    the nominal (or augmented) sampling rate times the `speed` keyword argument, or unthrottled. The measured
+    rates of the transmitted data are reported in `rate_reports`.
+
     Methods to override:
 
     - is_connected
@@ -148,10 +153,12 @@ class Transmitter(Loadable, metaclass=ABCMeta):
         self._verbose = None
         self.verbose = verbose
 
-        self._push_data = None
+        self._push_data = []  # data which are pushed before the transmitter is started
         self._pusher = None
         self._queue = None
         self._transmitter_event = None
+        self._report_queue = None
+        self._rate_reports = []
 
     def to_dict(self):
         """ Create dict representation of the current Transmitter instance
@@ -171,6 +178,11 @@ class Transmitter(Loadable, metaclass=ABCMeta):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._report_queue is not None:
+            self.rate_reports  # fetch pending reports before closing the queue
+            self._report_queue.close()
+            self._report_queue = None
+
         if self._pusher is not None:
             try:
                 self._pusher.terminate()
@@ -324,6 +336,33 @@ class Transmitter(Loadable, metaclass=ABCMeta):
 
         return 0.
 
+    def get_pacer(self) -> Pacer:
+        """ Pacer of the transmitted samples, based on the `augment_sampling_rate` and `speed` keyword arguments
+
+        - if `augment_sampling_rate` is specified (see `get_augment_sampling_rate_delay`), the samples are paced at
+          the augmented sampling rate times `speed` (defaults to 1, i.e. real-time),
+        - otherwise, the samples are paced at the nominal sampling rate of the device times `speed`
+          (defaults to None, i.e. unthrottled).
+
+        :return: `biofb.pipeline.Pacer` instance
+        """
+        delay = self.get_augment_sampling_rate_delay()
+        speed = self._kwargs.get('speed', 1. if delay else None)
+        sampling_rate = 1. / delay if delay else self.device['nominal_srate']
+        return Pacer(sampling_rate=sampling_rate or 0., speed=speed)
+
+    @property
+    def rate_reports(self) -> [dict]:
+        """ Pacing reports of the data transmitted by the background process (one per pushed data array),
+            see `biofb.pipeline.Pacer.report` """
+        while self._report_queue is not None:
+            try:
+                self._rate_reports.append(self._report_queue.get_nowait())
+            except Empty:
+                break
+
+        return self._rate_reports
+
     @property
     @abstractmethod
     def stream_info(self) -> [dict, list]:
@@ -352,28 +391,33 @@ class Transmitter(Loadable, metaclass=ABCMeta):
         """
         self._queue = Queue()
         self._transmitter_event = Event()
+        self._report_queue = Queue()
         self._pusher = Process(name='transmitter',
                                target=type(self).start_transmitting_data,
-                               args=(self._queue, self._transmitter_event),
+                               args=(self._queue, self._transmitter_event, self._report_queue),
                                kwargs=self.to_dict())
         self._pusher.start()
         self._transmitter_event.wait()
 
-        if self._push_data is not None:
+        if self._push_data:
             self.push_data()
 
         return self
 
     @classmethod
-    def start_transmitting_data(cls, queue: Queue, transmitter_event: Event, **kwargs):
+    def start_transmitting_data(cls, queue: Queue, transmitter_event: Event, report_queue: (Queue, None) = None,
+                                **kwargs):
         """ Transmit data that are pushed on the queue in the main process via the push_data method
 
         Data that have been pushed (via push_data(...)) are collected by the transmitter
-        and transmitted via put_chunk(...).
+        and transmitted via put_chunk(...), paced by the transmitter's `get_pacer()` (the timeline
+        starts with each pushed data array).
 
         :param queue: multiprocessing.Queue to get to-be-transmitted data from the main process
         :param transmitter_event: multiprocessing.Event the child-transmitter sends and the main-process waits for
                                   assuring that the child-transmitter has been established a  connection.
+        :param report_queue: (Optional) multiprocessing.Queue to put the pacing report (see `Pacer.report`)
+                             of each transmitted data array on.
         :param kwargs: dict representation of the calling Transmitter instance
         """
 
@@ -391,12 +435,17 @@ class Transmitter(Loadable, metaclass=ABCMeta):
 
         while True:
             data = transmitter._queue.get()
+            sampling_rate = transmitter.device['nominal_srate']
+
+            # memory-mapped data are mapped and transmitted slice by slice (rows of chunks or samples)
+            if isinstance(data, MappedArray) and data.ndim <= 2 and len(data) <= sampling_rate:
+                data = data.read()
 
             # check whether several chunks are defined [chunk1, ...]
             # assuming chunks to be at most 2D chunk1 ~ [sample1, ...]
-            transmit_iteratively = ndim(data) > 2
-            augmented_sleep = transmitter.get_augment_sampling_rate_delay()
-            sampling_rate = transmitter.device['nominal_srate']
+            transmit_iteratively = (data.ndim if isinstance(data, MappedArray) else ndim(data)) > 2
+            pacer = transmitter.get_pacer().start()
+            n_transmitted = 0
 
             if transmitter.verbose:
                 print(f'Start transmitting data{"-chunks" * transmit_iteratively}',
@@ -412,7 +461,9 @@ class Transmitter(Loadable, metaclass=ABCMeta):
                 chunk = chunk if transmit_as_samples else [chunk]
                 n_chunks = len(chunk)
                 for i, sample in enumerate(chunk):
-                    transmitter.transmit_data(sample, sleep=augmented_sleep)
+                    transmitter.transmit_data(sample, sleep=0.)
+                    n_transmitted += len(sample) if ndim(sample) > 1 else 1
+                    pacer.wait(n_transmitted)
 
                     sent_percentage = (i + 1.) / n_chunks
                     if transmitter.verbose and (not i % sampling_rate or sent_percentage == 1.):
@@ -423,29 +474,51 @@ class Transmitter(Loadable, metaclass=ABCMeta):
                             sample.shape
                         ), end='' if (sent_percentage != 1.) else '\n')
 
+            report = pacer.report()
+            if report_queue is not None:
+                report_queue.put(report)
+
+            if transmitter.verbose:
+                print(f'Transmitted {report["n_samples"]} samples in {report["elapsed"]:.3f} s at '
+                      f'{report["actual_rate"]:.1f} Hz (target {report["target_rate"]:.1f} Hz)')
+
             if transmitter.terminate_when_empty:
                 break
 
         if transmitter.verbose:
             print(f'Transmitter {transmitter.stream} terminated')
 
-    def push_data(self, data: ndarray = None):
+    def push_data(self, data: (ndarray, MappedArray, str) = None):
         """ Push data chunk to transmitting queue (for multiprocessing)
 
-        If no connection is established, the data will be stored in an array variable
-        which is extended, if new data is pushed.
+        If no connection is established, the data will be stored and pushed once the transmitter is started.
+
+        Memory-mapped data, i.e. a `biofb.io.MappedArray`, the filename of a `.npy` file or a C-contiguous memory-mapped
+        array (e.g. loaded via `numpy.load(..., mmap_mode='r')` or `biofb.io.load_cached`), are not copied to
+        the transmitting process: only a reference to the file is pushed, and the transmitting process maps and
+        transmits the data slice by slice (with constant memory usage, independent of the size of the recording).
+        Note that in-memory modifications of copy-on-write memory-maps are not transmitted.
 
-        :param data: to-be-transmitted array-like data chunk
+        :param data: to-be-transmitted array-like data chunk, `biofb.io.MappedArray` or `.npy` filename
+                     (defaults to None, i.e. push the data which have been stored before the transmitter is started)
         """
 
         if data is None:
-            data = self._push_data
-            self._push_data = None
+            pending, self._push_data = self._push_data, []
+            for data in pending:
+                self.push_data(data)
+            return
+
+        if isinstance(data, str):
+            data = MappedArray.from_file(data)
+
+        elif isinstance(data, ndarray) and data.flags.c_contiguous and is_memory_mapped(data):
+            data = MappedArray.from_array(data)
 
         if self._queue is not None:
             self._queue.put(data)
         else:
-            self._push_data = data if self._push_data is None else concatenate([self._push_data, data])
+            self._push_data.append(data)
 
     def stop(self):
         """ Stop background transmitting and cleanup started processes and queues """
@@ -1,5 +1,4 @@
-from biofb.io import Loadable
-from pydoc import locate
+from biofb.io import Loadable, locate_class
 
 
 class Controller(Loadable):
@@ -45,13 +44,14 @@ class Controller(Loadable):
     def load(cls, value):
         try:
             assert isinstance(value, dict)
+            value = dict(value)  # don't modify the (possibly shared) representation
             specific_cls = value.pop('class')
             specific_kwargs = value.pop('kwargs', {})
             if specific_kwargs and isinstance(specific_kwargs, str):
                 specific_kwargs = eval(specific_kwargs)
 
             if specific_cls and isinstance(specific_cls, str):
-                specific_cls = locate(specific_cls)
+                specific_cls = locate_class(specific_cls)
 
             return specific_cls.load(dict(**value, **specific_kwargs))
 
@@ -1,8 +1,8 @@
-from biofb.io import Loadable
+from biofb.io import Loadable, DataCache, TimestampIndex, get_nbytes, read_hdf5, create_hdf5_dataset
 from biofb.session import Subject
 from biofb.session import Setting
-from biofb.hardware import Setup
-from numpy import ndarray, asarray, arange
+from biofb.hardware import Setup, get_time_axis
+from numpy import ndarray, broadcast_to, column_stack, ceil
 from datetime import datetime
 from datetime import date
 from datetime import time
@@ -35,6 +35,8 @@ class Sample(Loadable):
         Loadable.__init__(self)
 
         self._data = None
+        self._load_data_kwargs = None  # keyword arguments of the (lazy) data loading, None if not loadable
+        self._data_cache = None
 
         self._setup = None
         self.setup = setup
@@ -54,6 +56,10 @@ class Sample(Loadable):
         self._filename = None
         self.filename = filename
 
+        self._state_window = None
+        self._drain = False
+        self._synchronize = False
+
     @property
     def filename(self) -> str:
         return self._filename
@@ -75,6 +81,10 @@ class Sample(Loadable):
 
         for v in value if (hasattr(value, '__iter__') and not is_str) else [value]:
 
+            if '<' not in v:  # no wildcards
+                reevalued.append(v)
+                continue
+
             # try to check wildcards of the form `<PROPERTY_OF_SAMPLE>`
             # such as `timestamp` or `acquisition_datetime` (capitalized)
             # and modify value_dict with corresponding property values
@@ -189,8 +199,19 @@ class Sample(Loadable):
 
     @property
     def data(self) -> list:
+        """ List of device-data arrays of the `Sample`
+
+        If the data is loaded lazily (see `load_data`), the data files are loaded upon first access
+        (and reloaded if the data has been evicted from the `data_cache` in the meantime).
+        """
         if self._data is None:
-            self._data = [None] * self.setup.n_devices
+            if self._load_data_kwargs is not None:
+                self.set_loaded_data(self.read_data())
+            else:
+                self._data = [None] * self.setup.n_devices
+
+        elif self._data_cache is not None and self._load_data_kwargs is not None:
+            self._data_cache.touch(self, get_nbytes(self._data))
 
         return self._data
 
@@ -200,43 +221,240 @@ class Sample(Loadable):
             key_order = [d.name for d in self.setup.devices]
             value = Loadable.dict_to_list(value_dict=value, key_order=key_order)
 
+        # explicitly set data can't be reloaded from file and is thus never evicted
+        self._load_data_kwargs = None
+        if self._data_cache is not None:
+            self._data_cache.discard(self)
+
         self._data = value
 
-    def load_data(self):
-        try:
-            filenames = self.filename if not isinstance(self.filename, str) else [self.filename]
-            devices = self.setup.devices
+    @property
+    def data_loaded(self) -> bool:
+        """ Boolean indicating whether the device data of the `Sample` is loaded (or set) """
+        return self._data is not None
+
+    @property
+    def data_cache(self) -> (DataCache, None):
+        """ (Optional) `biofb.io.DataCache` which bounds the memory of the loaded data of (multiple) samples """
+        return self._data_cache
+
+    def load_data(self, lazy: bool = False, data_cache: (DataCache, None) = None, mmap_mode: (str, None) = 'c',
+                  **kwargs):
+        """ Load the device data of the `Sample` from the data file(s) `filename`
+
+        The data is either loaded from an HDF5 file (see `dump_data`, contiguous datasets are memory-mapped)
+        or from one data file per device (via `Device.load_data`).
+
+        :param lazy: Boolean controlling whether loading is deferred until the `data` is accessed
+                     for the first time (defaults to False, i.e. the data is loaded immediately).
+        :param data_cache: (Optional) `biofb.io.DataCache` which bounds the memory of loaded data: If the data of the
+                           `Sample` is evicted from the cache it is unloaded and reloaded upon the next access.
+        :param mmap_mode: Memory-map mode of contiguous HDF5 datasets (defaults to 'c', i.e. copy-on-write,
+                          None reads the datasets into memory).
+        :param kwargs: Keyword arguments forwarded to `Device.load_data` (such as `cache=True`).
+        """
+        if self._data_cache is not None:
+            self._data_cache.discard(self)
+
+        self._data_cache = data_cache
+        self._load_data_kwargs = dict(mmap_mode=mmap_mode, **kwargs)
+        self._data = None
+
+        if not lazy:
+            _ = self.data
+
+    def unload_data(self):
+        """ Release the loaded device data of the `Sample` (which is reloaded from file upon the next access) """
+        if self._load_data_kwargs is None:
+            return  # explicitly set data can't be reloaded
+
+        if self._data_cache is not None:
+            self._data_cache.discard(self)
+
+        self._data = None
+
+    @property
+    def is_hdf5(self) -> bool:
+        """ Boolean indicating whether the data of the `Sample` is stored in a single HDF5 file """
+        return isinstance(self.filename, str) and h5py.is_hdf5(self.filename)
+
+    def read_data(self) -> list:
+        """ Read the device data of the `Sample` from file, as configured via `load_data` (the loaded data is not
+            attached to the `Sample`, see `set_loaded_data`, and does not count towards the `data_cache`).
+
+        :return: List of device-data arrays (None for devices without data, see `dump_data`).
+        """
+        assert self._load_data_kwargs is not None, "Data loading is not configured (see `load_data`)."
+
+        kwargs = dict(self._load_data_kwargs)
+        mmap_mode = kwargs.pop('mmap_mode', 'c')
 
-            device_data = []
-            for device, filename in zip(devices, filenames):
-                data = device.load_data(filename)
-                device_data.append(data)
+        filenames = self.filename if not isinstance(self.filename, str) else [self.filename]
+        devices = self.setup.devices
+
+        if self.is_hdf5:
+            try:
+                return read_hdf5(self.filename, key='sample.data', names=[d.name for d in devices],
+                                 mmap_mode=mmap_mode)
+
+            except (OSError, KeyError) as ex:
+                raise FileNotFoundError(f'Could not load `{self.filename}`: `{ex}`.')
 
-            self._data = device_data
+        # devices may store their loaded data in the sample data-list (via the setup) while loading,
+        # a placeholder list is used which is not accounted in the data cache
+        data_cache, self._data_cache = self._data_cache, None
+        self._data = [None] * len(devices)
+
+        try:
+            return [device.load_data(filename, **kwargs) for device, filename in zip(devices, filenames)]
 
         except (OSError, FileNotFoundError) as ex:
             raise FileNotFoundError(f'Could not load `{self.filename}` via device: `{ex}`.')
 
+        finally:
+            self._data, self._data_cache = None, data_cache
+
+    def set_loaded_data(self, data: list):
+        """ Attach device data which has been read via `read_data` (e.g. in a worker process) to the `Sample`
+
+        In contrast to setting the `data` property, the data remains reloadable from file, i.e. it is accounted
+        in the `data_cache` and may be evicted.
+        """
+        assert self._load_data_kwargs is not None, "Data loading is not configured (see `load_data`)."
+
+        self._data = data
+        if self._data_cache is not None:
+            self._data_cache.touch(self, get_nbytes(self._data))
+
+    def read(self, device, t_start: (float, None) = None, t_stop: (float, None) = None,
+             channels: (list, tuple, str, int, None) = None, timestamps: bool = False,
+             key: str = 'sample.data') -> ndarray:
+        """ Read the data of a device within a time range `[t_start, t_stop)`
+
+        Only the requested slice is read: If the data of the `Sample` is not loaded and stored in an HDF5 file
+        (see `dump_data`), the slice is read from the dataset, touching only the chunks covering the time range
+        (if the dataset is chunked). Otherwise, the slice is taken from the (possibly memory-mapped, see
+        `load_data`) device data.
+
+        :param device: `Device` instance, name or index.
+        :param t_start: (Optional) Start of the time range (inclusive, defaults to None, i.e. the first sample).
+        :param t_stop: (Optional) End of the time range (exclusive, defaults to None, i.e. after the last sample).
+        :param channels: (Optional) Channel (or list of channels, i.e. `Channel` instances, names or indices) to be
+                         read (defaults to None, i.e. all channels).
+        :param timestamps: Boolean controlling whether `t_start` and `t_stop` are absolute timestamps (e.g. LSL time)
+                           which are looked up in the timestamps of the received data (if True, O(log n), see
+                           `get_timestamp_index`), or seconds relative to the first sample (if False, default),
+                           which are converted to sample indices via the sampling rate.
+        :param key: HDF5 group of the sample data (defaults to 'sample.data').
+        :return: Data array of shape `(n_samples, n_channels)`, or None if there is no data of the device.
+        """
+        i = self.setup.get_device_index(device)
+        device = self.setup.devices[i]
+
+        columns = None
+        if channels is not None:
+            columns = device.get_channel_indices([channels] if isinstance(channels, (str, int)) else channels)
+
+        # data which is reloadable from an HDF5 file, whose timestamps are not kept in memory (see `read_data`)
+        from_file = self._load_data_kwargs is not None and self.is_hdf5 and \
+            (self._data is None or (timestamps and self.setup.timestamps[i] is None))
+
+        if from_file:
+            with h5py.File(self.filename, 'r') as h5:
+                dataset = h5.get(f'{key}/{device.name}') if self._data is None else self._data[i]
+                if dataset is None:
+                    return None
+
+                if timestamps:
+                    index = self.get_timestamp_index(device, h5=h5, key=key).slice(t_start, t_stop)
+                else:
+                    rate = dataset.attrs.get('sampling_rate', max(device.sampling_rates))
+                    index = self.get_time_slice(t_start, t_stop, sampling_rate=rate, n_samples=len(dataset))
+
+                data = dataset[index]
+
+        else:
+            data = self.data[i]
+            if data is None:
+                return None
+
+            if timestamps:
+                index = self.get_timestamp_index(device).slice(t_start, t_stop)
+            else:
+                index = self.get_time_slice(t_start, t_stop, sampling_rate=max(device.sampling_rates),
+                                            n_samples=len(data))
+
+            data = data[index]
+
+        return data if columns is None else data[:, columns]
+
+    @staticmethod
+    def get_time_slice(t_start: (float, None), t_stop: (float, None), sampling_rate: float, n_samples: int) -> slice:
+        """ Slice of the sample indices `k` with times `k / sampling_rate` in `[t_start, t_stop)` """
+        def to_index(t, default):
+            if t is None:
+                return default
+
+            return min(max(int(ceil(round(t * sampling_rate, 9))), 0), n_samples)
+
+        return slice(to_index(t_start, 0), to_index(t_stop, n_samples))
+
+    def get_timestamp_index(self, device, h5: (h5py.File, None) = None, key: str = 'sample.data') -> TimestampIndex:
+        """ Index of the timestamps of the received data of a device (see `Setup.timestamps` and `dump_data`),
+            mapping sample indices to absolute timestamps and vice versa in O(log n)
+
+        :param device: `Device` instance, name or index.
+        :param h5: (Optional) open HDF5 file of the sample data, whose timestamps dataset is indexed (defaults to
+                   None, i.e. the in-memory timestamps of the received data are indexed).
+        :param key: HDF5 group of the sample data (defaults to 'sample.data').
+        :return: `biofb.io.TimestampIndex` instance.
+        """
+        i = self.setup.get_device_index(device)
+        name = self.setup.devices[i].name
+
+        if h5 is not None:
+            assert f'{key}/timestamps/{name}' in h5, f"No timestamps of device `{name}` stored."
+            return TimestampIndex(h5[f'{key}/timestamps/{name}'])
+
+        timestamps = self.setup.timestamps[i]
+        assert timestamps is not None, f"No timestamps of device `{name}` available."
+        return TimestampIndex(timestamps)
+
+    def __getstate__(self) -> dict:
+        # the data cache (shared by multiple samples) is not pickled, reloadable data is reloaded upon access
+        state = self.__dict__.copy()
+        state['_data_cache'] = None
+        if state['_load_data_kwargs'] is not None:
+            state['_data'] = None
+
+        return state
+
     def __str__(self):
         return f"<Sample: Subject {self.subject.identity} at {self.acquisition_datetime}>"
 
     @property
     def time(self) -> list:
-        time_data = []
+        """ List of the time axes (in seconds) of the device-data arrays of the `Sample`
 
-        devices = self.setup.devices
-        data = self.data
+        The time axes are read-only views of shape `(n_samples, n_channels)` on cached 1D time axes per sampling rate
+        (see `biofb.hardware.get_time_axis`), i.e. no time arrays of the size of the data are allocated if all
+        channels of a device share the sampling rate. Devices without data have no time axis (None).
+        """
+        time_data = []
 
-        for device, device_data in zip(devices, data):
-            i = 0
-            device_data = asarray(device_data)
-            device_time = []
+        for device, device_data in zip(self.setup.devices, self.data):
+            if device_data is None:
+                time_data.append(None)
+                continue
 
-            for channels in device.channels:
-                device_time.append(arange(0, len(device_data[:, i])) / channels.sampling_rate)
-                i += 1
+            n_samples = len(device_data)
+            sampling_rates = device.sampling_rates
 
-            time_data.append(asarray(device_time).T)
+            if len(set(sampling_rates)) == 1:
+                axis = get_time_axis(n_samples, sampling_rates[0])
+                time_data.append(broadcast_to(axis[:, None], (n_samples, len(sampling_rates))))
+            else:
+                time_data.append(column_stack([get_time_axis(n_samples, rate) for rate in sampling_rates]))
 
         return time_data
 
@@ -254,29 +472,115 @@ class Sample(Loadable):
 
         return labels
 
+    @property
+    def state_window(self) -> (float, None):
+        """ Duration in seconds of the most recent data which is returned as `state` of the `Sample`
+
+        If None (default), the `state` comprises only the latest received data-chunks of each device.
+        """
+        return self._state_window
+
+    @state_window.setter
+    def state_window(self, value: (float, None)):
+        assert value is None or value > 0, f"State window must be positive (provided `{value}`)."
+        self._state_window = value
+
+    @property
+    def drain(self) -> bool:
+        """ Boolean controlling whether all queued data-chunks of each device are received at once when the
+            `state` is evaluated (if True), or only a single data-chunk per device (if False, default),
+            see `Setup.receive_data`. """
+        return self._drain
+
+    @drain.setter
+    def drain(self, value: bool):
+        self._drain = bool(value)
+
+    @property
+    def synchronize(self) -> bool:
+        """ Boolean controlling whether the data of all devices is aligned on a common time base when the
+            `state` is evaluated (if True), or used as received (if False, default), see `Setup.receive_data`. """
+        return self._synchronize
+
+    @synchronize.setter
+    def synchronize(self, value: bool):
+        self._synchronize = bool(value)
+
     @property
     def state(self) -> list:
-        """ TODO """
+        """ Receive data from all devices and return the current state of the `Sample`
+
+        :return: list of device data, either the latest received data-chunks (if `state_window` is None)
+                 or views on the data of the last `state_window` seconds of each device.
+        """
 
         # receive data from all devices
-        chunk_data = self.setup.receive_data()
+        chunk_data = self.setup.receive_data(drain=self.drain, synchronize=self.synchronize)
 
         # here data-preprocessing might be done
         # ...
 
+        if self.state_window is not None:
+            return self.get_recent_data(self.state_window)
+
         # return only values, not time-stamps
         return [value for time, value in chunk_data]
 
-    def dump_data(self, filename=None, mode='w', key='sample.data'):
+    def get_recent_data(self, duration: (float, None) = None) -> list:
+        """ Views on the most recent data of all devices of the `Sample`'s `Setup`
+
+        :param duration: Duration in seconds of the most recent data (defaults to None, i.e. all data).
+        :return: list of views on the device-data of the last `duration` seconds (no copies of the data are made).
+        """
+        return self.setup.get_recent_data(duration)
+
+    def dump_data(self, filename=None, mode='w', key='sample.data', chunked: bool = True,
+                  chunk_size: (int, None) = None, compression: (str, None) = None, compression_opts=None,
+                  shuffle: bool = False):
+        """ Dump the device data of the `Sample`
+
+        If `filename` is a single file, the data is stored in an HDF5 file: the data of each device is stored in a
+        dataset `<key>/<device name>` of shape `(n_samples, n_channels)`, the timestamps of received data (see
+        `Setup.timestamps`) in a parallel dataset `<key>/timestamps/<device name>`. Otherwise, each device dumps its
+        data to the respective file.
+
+        Chunked datasets (default) are resizable (appendable), can be compressed and are read chunk by chunk (e.g.
+        time ranges via `read`), but are read into memory when the sample is loaded. Contiguous datasets
+        (`chunked=False`) are memory-mapped when the sample is loaded (see `biofb.io.read_hdf5`, no data is read
+        until it is accessed).
+
+        :param filename: (Optional) HDF5 file or list of files per device (defaults to None, i.e. `filename`).
+        :param mode: File mode (defaults to 'w').
+        :param key: HDF5 group of the sample data (defaults to 'sample.data').
+        :param chunked: Boolean controlling whether the datasets are chunked (defaults to True, see
+                        `biofb.io.create_hdf5_dataset`) or contiguous (memory-mappable, if False).
+        :param chunk_size: (Optional) Number of samples per chunk (defaults to None, i.e. chunks of about 128 kB).
+        :param compression: (Optional) Compression filter, e.g. 'lzf' or 'gzip' (defaults to None).
+        :param compression_opts: (Optional) Compression options, e.g. the gzip level.
+        :param shuffle: Boolean controlling whether the byte-shuffle filter is applied (defaults to False).
+        """
         if filename is None:
             filename = self.filename
 
-        if isinstance(filename, str) and len(self.setup.devices) > 1:
+        if isinstance(filename, str):
+            dataset_kwargs = dict(chunked=chunked, chunk_size=chunk_size, compression=compression,
+                                  compression_opts=compression_opts, shuffle=shuffle)
+
             with h5py.File(filename, mode) as h5:
-                g = h5.create_group(key)
-                for data, device in zip(self.data, self.setup.devices):
-                    dump_data = data if data.shape[0] > data.shape[1] else data.T
-                    d = g.create_dataset(device.name, data=dump_data)
+                g = h5.require_group(key)
+                for data, timestamps, device in zip(self.data, self.setup.timestamps, self.setup.devices):
+                    if data is None:
+                        continue
+
+                    dataset = create_hdf5_dataset(g, device.name, data=data, **dataset_kwargs)
+                    dataset.attrs['channels'] = device.channel_names
+                    sampling_rates = [r for r in device.sampling_rates if r is not None]
+                    if sampling_rates:
+                        dataset.attrs['sampling_rate'] = max(sampling_rates)
+
+                    if timestamps is not None:
+                        create_hdf5_dataset(g.require_group('timestamps'), device.name, data=timestamps,
+                                            **dataset_kwargs)
 
         else:
             for fname, data, device in zip(filename, self.data, self.setup.devices):
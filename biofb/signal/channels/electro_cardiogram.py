@@ -60,11 +60,12 @@ import scipy as sp
 import scipy.signal
 from biofb.signal.filter import notch
 from biofb.signal.filter import bandpass
+from biofb.signal.filter import StreamingFilter
 from biofb.signal.detect import find_peaks
 from biofb.signal.detect import check_peaks
 
 
-def ecg_bandpass_filter(sampling_rate, notch_w0=(50., 60.), notch_Q=30., bandpass_N=10, bandpass_Wn=(0.05, 15), filtfilt=True):
+def ecg_bandpass_filter(sampling_rate, notch_w0=(50., 60.), notch_Q=30., bandpass_N=10, bandpass_Wn=(0.05, 15), filtfilt=True, streaming=False):
     """ECG bandpass filter following the [Fire EMS](http://ems12lead.com/2014/03/10/understanding-ecg-filtering/#gref) blog.
 
     ---
@@ -88,6 +89,7 @@ def ecg_bandpass_filter(sampling_rate, notch_w0=(50., 60.), notch_Q=30., bandpas
     :param bandpass_Wn: Lower and Upper critical frequency or frequencies specifying the bandpass frequencies (array_like, defaults to `(0.05, 100)` Hz).
                         For digital units, `Wn` is the same units as `sampling_rate`.
     :param filtfilt: Boolean controlling whether `scipy.signal.filtfilt` or regular `scipy.signal.filt` methods are used (corrects phase-shift).
+    :param streaming: Boolean controlling whether a stateful `biofb.signal.filter.StreamingFilter` is returned, which filters consecutive chunks of a signal incrementally (`filtfilt` is ignored, since zero-phase filtering requires the whole signal).
     :return: Callable bandpass filter which takes an array_like signal as input.
     """
 
@@ -98,6 +100,9 @@ def ecg_bandpass_filter(sampling_rate, notch_w0=(50., 60.), notch_Q=30., bandpas
 
     bandpass_sos_filter = bandpass(N=bandpass_N, Wn=bandpass_Wn, sampling_rate=sampling_rate, analog=False)
 
+    if streaming:
+        return StreamingFilter(filters=[*notch_filters, bandpass_sos_filter])
+
     def apply_filter(x):
         for notch_filter in notch_filters:
 
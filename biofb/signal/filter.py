@@ -1,6 +1,54 @@
-""" Function collection for filtering signals. """
+""" Function collection for filtering signals.
+
+The filter designs of `notch`, `bandpass`, `bandstop`, `lowpass` and `highpass` are cached in a bounded LRU cache
+keyed on the filter parameters (see `filter_cache_info` and `clear_filter_cache`).
+"""
 import numpy as np
 from scipy import signal
+from functools import lru_cache
+
+
+FILTER_CACHE_SIZE = 256
+""" Maximum number of filter designs which are kept in the filter-design cache (least recently used are dropped) """
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _design(filter_type: str, N: (int, None), Wn: (tuple, float), Q: (float, None), analog: bool,
+            sampling_rate: (float, None)):
+    """Cached filter design, `Wn` needs to be hashable (see `_hashable`). The returned arrays are shared by all
+       callers, use `_cached_design` to obtain copies."""
+    if filter_type == 'notch':
+        return signal.iirnotch(Wn, Q, sampling_rate)
+
+    return signal.butter(N, Wn, btype=filter_type, fs=sampling_rate, output='sos', analog=analog)
+
+
+def _cached_design(filter_type: str, N: (int, None), Wn, Q: (float, None), analog: bool,
+                   sampling_rate: (float, None)):
+    """Copy of the cached filter design (the cached coefficients are protected against modifications)"""
+    coefficients = _design(filter_type, N, _hashable(Wn), Q, analog, sampling_rate)
+    if filter_type == 'notch':
+        return tuple(c.copy() for c in coefficients)
+
+    return coefficients.copy()
+
+
+def _hashable(Wn):
+    """Hashable representation of (array_like) critical frequencies"""
+    return tuple(float(w) for w in Wn) if np.ndim(Wn) else float(Wn)
+
+
+def filter_cache_info():
+    """Statistics of the filter-design cache of `notch`, `bandpass`, `bandstop`, `lowpass` and `highpass`
+
+    :return: `functools.lru_cache` statistics, i.e. a named tuple of `(hits, misses, maxsize, currsize)`.
+    """
+    return _design.cache_info()
+
+
+def clear_filter_cache():
+    """Clear the filter-design cache (and reset its statistics)"""
+    _design.cache_clear()
 
 
 def notch(w0, Q=30., sampling_rate=2.0):
@@ -11,7 +59,7 @@ def notch(w0, Q=30., sampling_rate=2.0):
     :param sampling_rate: The sampling rate of the digital system.
     :return: Numerator (b) and denominator (a) polynomials of the IIR filter.
     """
-    notch_filter = signal.iirnotch(w0, Q, sampling_rate)
+    notch_filter = _cached_design('notch', None, w0, float(Q), False, sampling_rate)
     return notch_filter
 
 
@@ -41,7 +89,7 @@ def bandpass(N: int, Wn: np.ndarray, analog: bool = False, sampling_rate: (None,
     :return: `scipy.signal.butter` bandpass filter
     """
 
-    filter = signal.butter(N, Wn, btype='bandpass', fs=sampling_rate, output='sos', analog=analog)
+    filter = _cached_design('bandpass', N, Wn, None, analog, sampling_rate)
     return filter
 
 
@@ -56,7 +104,7 @@ def bandstop(N: int, Wn: np.ndarray, analog: bool = False, sampling_rate: (None,
     :return: `scipy.signal.butter` bandstop filter
     """
 
-    filter = signal.butter(N, Wn, btype='bandstop', fs=sampling_rate, output='sos', analog=analog)
+    filter = _cached_design('bandstop', N, Wn, None, analog, sampling_rate)
     return filter
 
 
@@ -71,7 +119,7 @@ def lowpass(N: int, Wn: float, analog: bool = False, sampling_rate: (None, float
     :return: `scipy.signal.butter` lowpass filter
     """
 
-    filter = signal.butter(N, Wn, btype='lowpass', fs=sampling_rate, output='sos', analog=analog)
+    filter = _cached_design('lowpass', N, Wn, None, analog, sampling_rate)
     return filter
 
 
@@ -86,7 +134,7 @@ def highpass(N: int, Wn: float, analog: bool = False, sampling_rate: (None, floa
     :return: `scipy.signal.butter` highpass filter
     """
 
-    filter = signal.butter(N, Wn, btype='highpass', fs=sampling_rate, output='sos', analog=analog)
+    filter = _cached_design('highpass', N, Wn, None, analog, sampling_rate)
     return filter
 
 
@@ -107,7 +155,7 @@ def apply_sos_filter(x: np.ndarray, N: int, Wn: (np.ndarray, int, float), analog
 
     assert sos_filter in ('bandpass', 'highpass', 'lowpass', 'bandstop'), "Filter must be one of must be one of ('bandpass', 'highpass', 'lowpass', 'bandstop')."
 
-    filter_function = globals()[sos_filter]
+    filter_function = FILTER_DESIGNS[sos_filter]
     sos_filter = filter_function(N=N, Wn=Wn, analog=analog, sampling_rate=sampling_rate)
 
     filtered = signal.sosfilt(sos_filter, x, **kwargs) if not filtfilt else signal.sosfiltfilt(sos_filter, x[::-1], **kwargs)[::-1]
@@ -116,3 +164,223 @@ def apply_sos_filter(x: np.ndarray, N: int, Wn: (np.ndarray, int, float), analog
         return filtered, sos_filter
 
     return filtered
+
+
+FILTER_DESIGNS = {'notch': notch,
+                  'bandpass': bandpass,
+                  'bandstop': bandstop,
+                  'lowpass': lowpass,
+                  'highpass': highpass,
+                  }
+""" Mapping of filter types to the corresponding filter design functions """
+
+
+def design(spec: dict, sampling_rate: float):
+    """Design a filter from a filter specification
+
+    :param spec: Dict specifying the filter via a `'type'` key (one of the `FILTER_DESIGNS`, i.e. 'notch', 'bandpass',
+                 'bandstop', 'lowpass', 'highpass') and the keyword arguments of the corresponding filter function of
+                 this module (except `sampling_rate`), e.g. `{'type': 'notch', 'w0': 50.}`.
+    :param sampling_rate: The sampling rate of the filtered signal.
+    :return: Filter coefficients, i.e. `(b, a)` tuple for 'notch' filters, `sos`-filter array otherwise.
+    """
+    spec = dict(spec)
+    filter_type = spec.pop('type')
+    assert filter_type in FILTER_DESIGNS, f"Filter type `{filter_type}` must be one of {tuple(FILTER_DESIGNS)}."
+
+    return FILTER_DESIGNS[filter_type](sampling_rate=sampling_rate, **spec)
+
+
+def to_sos(filters: (list, tuple, np.ndarray)) -> np.ndarray:
+    """Combine filter stages into a single `sos`-cascade
+
+    :param filters: `sos`-filter array, `(b, a)` tuple or list of `sos`-filters and `(b, a)` tuples.
+    :return: `sos`-filter array of shape `(n_sections, 6)`, applying all stages consecutively.
+    """
+    if isinstance(filters, tuple) or (isinstance(filters, np.ndarray) and filters.ndim == 2):
+        filters = [filters]
+
+    return np.concatenate([signal.tf2sos(*f) if isinstance(f, tuple) else np.atleast_2d(f) for f in filters])
+
+
+def as_slice(indices: np.ndarray) -> (slice, np.ndarray, None):
+    """Represent (sorted) indices as `slice` if they are evenly spaced, i.e. array indexing yields a view
+
+    :param indices: Integer index array.
+    :return: `slice` equivalent to the indices, the `indices` if they are not evenly spaced, or None if empty.
+    """
+    if len(indices) == 0:
+        return None
+
+    if len(indices) == 1:
+        return slice(int(indices[0]), int(indices[0]) + 1)
+
+    step = indices[1] - indices[0]
+    if step > 0 and np.all(np.diff(indices) == step):
+        return slice(int(indices[0]), int(indices[-1]) + 1, int(step))
+
+    return indices
+
+
+class StreamingFilter(object):
+    """Stateful `sos`-filter cascade for chunk-wise (real-time) filtering of multi-channel signals
+
+    In contrast to `apply_notch` and `apply_sos_filter`, which filter a whole signal from zero state, a
+    `StreamingFilter` carries the filter state `zi` across consecutive chunks (see `scipy.signal.sosfilt_zi`),
+    such that filtering a signal chunk-by-chunk yields the same result as filtering the whole signal at once
+    (no edge transients at chunk boundaries, constant cost per chunk).
+
+    All filter stages (`sos`-filters or `(b, a)` polynomials, e.g. of `notch`) are combined into a single
+    `sos`-cascade which is applied to all selected channels of a chunk of shape `(n_samples, n_channels)` in
+    one vectorized `scipy.signal.sosfilt` call along `axis=0`.
+    """
+
+    def __init__(self, filters: (list, tuple, np.ndarray), channels: (list, tuple, None) = None,
+                 steady_state: bool = True):
+        """Constructs a `StreamingFilter` instance
+
+        :param filters: `sos`-filter array, `(b, a)` tuple or list of `sos`-filters and `(b, a)` tuples which
+                        are applied consecutively.
+        :param channels: (Optional) Indices of the filtered channels (columns) of a chunk, the remaining channels
+                         are passed unchanged (defaults to None, i.e. all channels are filtered).
+        :param steady_state: Boolean controlling whether the filter state is initialized to the steady state of
+                             the first sample of each channel (if True, default, suppresses the startup
+                             transient), or to zero (if False, equivalent to `scipy.signal.sosfilt`).
+        """
+        self._sos = to_sos(filters)
+        self._channels = None if channels is None else np.asarray(channels, dtype=int)
+        self._steady_state = steady_state
+        self._zi = None
+
+    @classmethod
+    def from_specs(cls, specs: (list, tuple), sampling_rate: float, **kwargs):
+        """Design a `StreamingFilter` from a list of filter specifications
+
+        :param specs: List of dicts, each specifying a filter stage (see `design`), e.g. `{'type': 'notch', 'w0': 50.}`.
+        :param sampling_rate: The sampling rate of the filtered signal.
+        :param kwargs: Keyword arguments forwarded to the `StreamingFilter` constructor.
+        :return: `StreamingFilter` instance.
+        """
+        return cls(filters=[design(spec, sampling_rate) for spec in specs], **kwargs)
+
+    @property
+    def sos(self) -> np.ndarray:
+        """Combined `sos`-cascade of all filter stages"""
+        return self._sos
+
+    @property
+    def channels(self) -> (np.ndarray, None):
+        """Indices of the filtered channels (or None, if all channels are filtered)"""
+        return self._channels
+
+    @property
+    def zi(self) -> (np.ndarray, None):
+        """Current filter state of shape `(n_sections, 2, n_channels)` (None before the first chunk)"""
+        return self._zi
+
+    def reset(self):
+        """Reset the filter state (the next chunk is filtered as start of a new signal)"""
+        self._zi = None
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """Filter the next chunk of the signal
+
+        :param x: Chunk of shape `(n_samples, )` or `(n_samples, n_channels)`.
+        :return: Filtered chunk (float array of the same shape, unselected channels are copied).
+        """
+        x = np.asarray(x)
+        if x.ndim == 1:
+            return self(x[:, None])[:, 0]
+
+        y = np.array(x, dtype=np.result_type(x.dtype, float))
+        if len(x) == 0:
+            return y
+
+        selected = y if self._channels is None else y[:, self._channels]
+        if self._zi is None:
+            zi = signal.sosfilt_zi(self._sos)[:, :, None]  # shape = (n_sections, 2, 1)
+            self._zi = zi * selected[0] if self._steady_state else np.zeros_like(zi * selected[0])
+
+        filtered, self._zi = signal.sosfilt(self._sos, selected, axis=0, zi=self._zi)
+
+        if self._channels is None:
+            return filtered
+
+        y[:, self._channels] = filtered
+        return y
+
+
+class FilterBank(object):
+    """Precomputed filter cascade for a device configuration, i.e. for the sampling rates of its channels
+
+    The filter specifications (see `design`) are designed once per distinct sampling rate and combined into a single
+    `sos`-cascade (see `to_sos`). Applying the bank to a data array of shape `(n_samples, n_channels)` filters all
+    channels of the same sampling rate in one vectorized `scipy.signal.sosfilt` (or `sosfiltfilt`) call.
+    """
+
+    def __init__(self, specs: (list, tuple), sampling_rates: (list, tuple, float)):
+        """Constructs a `FilterBank` instance
+
+        :param specs: List of dicts, each specifying a filter stage (see `design`), e.g. `{'type': 'notch', 'w0': 50.}`.
+        :param sampling_rates: Sampling rate of each channel (list) or common sampling rate of all channels.
+        """
+        self._specs = [dict(spec) for spec in specs]
+        self._sampling_rates = np.atleast_1d(np.asarray(sampling_rates, dtype=float))
+        self._sos = {rate: to_sos([design(spec, rate) for spec in self._specs])
+                     for rate in np.unique(self._sampling_rates)}
+
+    @property
+    def specs(self) -> list:
+        """Filter specifications of the bank"""
+        return self._specs
+
+    @property
+    def sampling_rates(self) -> np.ndarray:
+        """Sampling rates of the channels (or the common sampling rate)"""
+        return self._sampling_rates
+
+    def sos(self, sampling_rate: float) -> np.ndarray:
+        """Precomputed `sos`-cascade for the specified sampling rate"""
+        return self._sos[float(sampling_rate)]
+
+    def __call__(self, x: np.ndarray, filtfilt: bool = False, channels: (list, tuple, None) = None,
+                 out: (np.ndarray, None) = None) -> np.ndarray:
+        """Filter a data array with the precomputed cascades
+
+        :param x: Data array of shape `(n_samples, )` or `(n_samples, n_channels)`.
+        :param filtfilt: Boolean specifying whether to use `scipy.signal.sosfiltfilt` or `scipy.signal.sosfilt`
+                         (defaults to False).
+        :param channels: (Optional) Indices of the filtered channels, the remaining channels are copied
+                         (defaults to None, i.e. all channels are filtered).
+        :param out: (Optional) Float array of the shape of `x` to which the filtered channels are written
+                    (e.g. `x` itself to filter in place), defaults to None, i.e. a new array is created.
+        :return: Filtered data array (`out`, if specified).
+        """
+        x = np.asarray(x)
+        if x.ndim == 1:
+            assert len(self._sos) == 1, "One-dimensional data requires a common sampling rate."
+            return self(x[:, None], filtfilt=filtfilt, out=None if out is None else out[:, None])[:, 0]
+
+        y = out if out is not None else np.array(x, dtype=np.result_type(x.dtype, float))
+        channels = np.arange(x.shape[1]) if channels is None else np.asarray(channels, dtype=int)
+        rates = np.broadcast_to(self._sampling_rates, (x.shape[1], ))[channels]
+
+        for rate, sos in self._sos.items():
+            selected = as_slice(channels[rates == rate])
+            if selected is None:
+                continue
+
+            # contiguous channels are passed as views, i.e. all channels are filtered in a single call
+            source = x[:, selected]
+            y[:, selected] = signal.sosfilt(sos, source, axis=0) if not filtfilt else \
+                signal.sosfiltfilt(sos, source, axis=0)
+
+        return y
+
+    def streaming_filter(self, **kwargs) -> StreamingFilter:
+        """Create a `StreamingFilter` from the precomputed cascade (requires a common sampling rate)
+
+        :param kwargs: Keyword arguments forwarded to the `StreamingFilter` constructor.
+        """
+        assert len(self._sos) == 1, "A `StreamingFilter` requires a common sampling rate."
+        return StreamingFilter(filters=next(iter(self._sos.values())), **kwargs)
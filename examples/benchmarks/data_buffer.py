@@ -0,0 +1,75 @@
+""" Benchmark of the per-chunk append latency of device data
+
+The application (function)
+
+- `append_latency`
+
+can be executed as main program from the <PROJECT_ROOT> folder via
+
+> python examples/benchmarks/data_buffer.py append-latency [--duration 7200] [--concatenate]
+
+A synthetic Bioplux stream (500 Hz x 9 channels, chunks of 1/10 s) is appended to a `biofb.hardware.Device`
+via `Device.append_data`, which stores the data in a preallocated `biofb.io.DataBuffer`.
+The per-chunk append latency is reported for consecutive time-windows of the stream and should stay flat
+over the whole session. With the `--concatenate` flag, the previous `numpy.concatenate`-based approach is
+benchmarked for comparison (use a shorter `--duration`, the costs grow quadratically).
+"""
+
+from biofb.hardware.devices import Bioplux
+import numpy as np
+import time
+
+
+def append_latency(duration=7200., sampling_rate=500, n_channels=9, chunk_size=0.1, n_windows=12,
+                   buffer_duration=None, concatenate=False):
+    """ Measure the per-chunk append latency of a synthetic Bioplux stream
+
+    :param duration: Duration of the synthetic stream in seconds (defaults to 7200, i.e. 2 hours).
+    :param sampling_rate: Sampling rate of the synthetic stream in Hz (defaults to 500).
+    :param n_channels: Number of channels of the synthetic stream (defaults to 9).
+    :param chunk_size: Duration of a data chunk in seconds (defaults to 0.1).
+    :param n_windows: Number of time-windows for which the latency statistics are reported.
+    :param buffer_duration: (Optional) ring-buffer duration of the device in seconds (defaults to None, growable).
+    :param concatenate: Boolean controlling whether to benchmark `numpy.concatenate` instead of `Device.append_data`.
+    """
+
+    device = Bioplux()
+    assert device.n_channels == n_channels, f"Bioplux device with {n_channels} channels required."
+    for c in device.channels:
+        c.sampling_rate = sampling_rate
+
+    device.buffer_duration = buffer_duration
+
+    samples_per_chunk = int(sampling_rate * chunk_size)
+    n_chunks = int(duration / chunk_size)
+    chunk = np.random.rand(samples_per_chunk, n_channels)
+
+    data = None
+    latency = np.empty(n_chunks)
+    for i in range(n_chunks):
+        then = time.perf_counter()
+
+        if concatenate:
+            data = np.concatenate([data, chunk]) if data is not None else np.asarray(chunk)
+        else:
+            device.append_data(chunk)
+
+        latency[i] = time.perf_counter() - then
+
+    data = data if concatenate else device.data
+    print(f'Appended {n_chunks} chunks of shape {chunk.shape} ({duration / 60.:.1f} min of data, '
+          f'{"numpy.concatenate" if concatenate else "Device.append_data"}), final data shape {data.shape}.')
+
+    print(f'{"window [min]":>16} | {"mean [us]":>10} | {"median [us]":>11} | {"p99 [us]":>10} | {"max [us]":>10}')
+    for window in np.array_split(np.arange(n_chunks), n_windows):
+        w = latency[window] * 1e6
+        t0, t1 = window[0] * chunk_size / 60., (window[-1] + 1) * chunk_size / 60.
+        print(f'{t0:7.1f} - {t1:6.1f} | {w.mean():10.2f} | {np.median(w):11.2f} | '
+              f'{np.percentile(w, 99):10.2f} | {w.max():10.2f}')
+
+
+
+if __name__ == '__main__':
+    import argh
+    argh.dispatch_commands([append_latency,
+                            ])
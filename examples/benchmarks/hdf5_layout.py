@@ -0,0 +1,191 @@
+""" Benchmark of the HDF5 layout of dumped sample and action data
+
+The applications (functions)
+
+- `samples`
+- `actions`
+- `read`
+
+can be executed as main program from the <PROJECT_ROOT> folder via
+
+> python examples/benchmarks/hdf5_layout.py samples [--duration 3600] [--window 5]
+
+> python examples/benchmarks/hdf5_layout.py actions [--n-actions 10000]
+
+> python examples/benchmarks/hdf5_layout.py read [--duration 3600] [--window 5]
+
+`samples` dumps a synthetic `duration`-second sample (500 Hz x 9-channel Bioplux and 250 Hz x 17-channel Unicorn device,
+band-limited signals quantized to 16 bit resolution) via `Sample.dump_data` with a contiguous, a chunked and
+compressed (lzf + shuffle and gzip + shuffle) layout and measures the dump time, the file size and the time to read
+a random `window`-second time range of each device.
+
+`actions` dumps `n_actions` synthetic `(key, value)` actions with the previous layout (one group with scalar datasets
+per action) and the structured-dataset layout of `Agent.dump_actions`, and measures dump and load time and file size.
+
+`read` dumps a synthetic `duration`-second sample with timestamps (chunked, lzf + shuffle) and compares the time to
+access a random `window`-second range of two channels of the Bioplux device by loading the full sample data and
+slicing it (previous approach) versus `Sample.read` by relative time and by absolute timestamp (`TimestampIndex`).
+"""
+
+from biofb.session import Sample
+from tempfile import TemporaryDirectory
+from numpy import nan
+import numpy as np
+import h5py
+import time
+import os
+
+
+SETUP = dict(name='Benchmark Setup', devices=[
+    dict(name='Bioplux', channels=[dict(name=f'B{i}', sampling_rate=500.) for i in range(9)]),
+    dict(name='Unicorn', channels=[dict(name=f'U{i}', sampling_rate=250.) for i in range(17)]),
+])
+
+
+def synthetic_signal(n_samples, n_channels, rng):
+    """ Band-limited random walk signal with 16 bit resolution """
+    signal = np.cumsum(rng.standard_normal((n_samples, n_channels)), axis=0)
+    return np.round(signal * 2 ** 4) / 2 ** 4
+
+
+def samples(duration=3600., window=5., repetitions=100):
+    """ Measure dump time, file size and time-range read time of different HDF5 layouts of sample data
+
+    :param duration: Duration of the synthetic sample in seconds (defaults to 3600).
+    :param window: Duration of the read time ranges in seconds (defaults to 5).
+    :param repetitions: Number of time-range reads (defaults to 100).
+    """
+    rng = np.random.default_rng(0)
+    sample = Sample(setup=SETUP, subject=dict(identity='Benchmark'), filename='benchmark.h5')
+    sample.data = [synthetic_signal(int(duration * 500), 9, rng), synthetic_signal(int(duration * 250), 17, rng)]
+    print(f'{duration:.0f} s sample, {sum(d.nbytes for d in sample.data) / 2**20:.0f} MB of data.')
+
+    layouts = (('contiguous', dict(chunked=False)),
+               ('chunked', dict(chunked=True)),
+               ('chunked lzf+shuffle', dict(compression='lzf', shuffle=True)),
+               ('chunked gzip+shuffle', dict(compression='gzip', compression_opts=4, shuffle=True)))
+
+    with TemporaryDirectory() as tmp:
+        for label, kwargs in layouts:
+            filename = os.path.join(tmp, 'sample.h5')
+
+            then = time.perf_counter()
+            sample.dump_data(filename, **kwargs)
+            dumped = time.perf_counter() - then
+
+            then = time.perf_counter()
+            with h5py.File(filename, 'r') as h5:
+                for _ in range(repetitions):
+                    start = rng.uniform(0, duration - window)
+                    for device, rate in (('Bioplux', 500), ('Unicorn', 250)):
+                        h5[f'sample.data/{device}'][int(start * rate):int((start + window) * rate)]
+            read = (time.perf_counter() - then) / repetitions
+
+            print(f'{label:22s} dump: {dumped:7.2f} s, size: {os.path.getsize(filename) / 2**20:7.1f} MB, '
+                  f'{window:.0f}-s range read: {read * 1e3:7.3f} ms')
+
+
+def dump_actions_groups(filename, action_data, key='action_data'):
+    """ Previous layout: one group with scalar datasets per action """
+    with h5py.File(filename, 'w') as h5:
+        g = h5.create_group(key)
+        for i, (timestamp, action) in enumerate(action_data):
+            g[f'{i}/timestamp'] = timestamp
+            for j, action_value in enumerate(action if hasattr(action, '__iter__') else [action]):
+                g[f'{i}/{j}'] = (action_value if action_value is not None else nan)
+
+
+def actions(n_actions=10000):
+    """ Measure dump time, load time and file size of the previous and the structured action layout
+
+    :param n_actions: Number of synthetic actions (defaults to 10000).
+    """
+    from biofb.controller import Agent
+    from biofb.io import Loadable
+
+    rng = np.random.default_rng(0)
+    action_data = [(1.6e9 + 0.1 * i, (str(rng.integers(10)), float(rng.uniform()))) for i in range(n_actions)]
+
+    agent = Agent()
+    agent.action_data = list(action_data)
+
+    with TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'actions.h5')
+
+        then = time.perf_counter()
+        dump_actions_groups(filename, action_data)
+        dumped = time.perf_counter() - then
+
+        then = time.perf_counter()
+        with h5py.File(filename, 'r') as h5:
+            Loadable.recursively_load_dict_contents_from_group(h5, '/')
+        loaded = time.perf_counter() - then
+
+        print(f'groups per action:  dump: {dumped:7.3f} s, load: {loaded:7.3f} s, '
+              f'size: {os.path.getsize(filename) / 2**20:7.2f} MB')
+
+        then = time.perf_counter()
+        agent.dump_actions(filename)
+        dumped = time.perf_counter() - then
+
+        then = time.perf_counter()
+        with h5py.File(filename, 'r') as h5:
+            Agent().action_data = h5['action_data'][()]
+        loaded = time.perf_counter() - then
+
+        print(f'structured dataset: dump: {dumped:7.3f} s, load: {loaded:7.3f} s, '
+              f'size: {os.path.getsize(filename) / 2**20:7.2f} MB')
+
+
+def read(duration=3600., window=5., repetitions=100):
+    """ Measure the time-range access time of full loading and slicing versus `Sample.read`
+
+    :param duration: Duration of the synthetic sample in seconds (defaults to 3600).
+    :param window: Duration of the read time ranges in seconds (defaults to 5).
+    :param repetitions: Number of time-range reads (defaults to 100).
+    """
+    rng = np.random.default_rng(0)
+    t0 = 1.6e9
+
+    with TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'sample.h5')
+        sample = Sample(setup=SETUP, subject=dict(identity='Benchmark'), filename=filename)
+        for i, rate in enumerate((500, 250)):
+            n_samples = int(duration * rate)
+            sample.setup.append_device_data(synthetic_signal(n_samples, (9, 17)[i], rng), device=i,
+                                            timestamps=t0 + np.arange(n_samples) / rate)
+        sample.dump_data(compression='lzf', shuffle=True)
+
+        starts = rng.uniform(0, duration - window, repetitions)
+
+        then = time.perf_counter()
+        for start in starts:
+            loaded = Sample(setup=SETUP, subject=dict(identity='Benchmark'), filename=filename)
+            loaded.load_data()
+            loaded.data[0][int(start * 500):int((start + window) * 500), 2:4]
+        full = (time.perf_counter() - then) / repetitions
+
+        loaded = Sample(setup=SETUP, subject=dict(identity='Benchmark'), filename=filename)
+        loaded.load_data(lazy=True)
+
+        then = time.perf_counter()
+        for start in starts:
+            loaded.read('Bioplux', start, start + window, channels=['B2', 'B3'])
+        relative = (time.perf_counter() - then) / repetitions
+
+        then = time.perf_counter()
+        for start in starts:
+            loaded.read('Bioplux', t0 + start, t0 + start + window, channels=['B2', 'B3'], timestamps=True)
+        absolute = (time.perf_counter() - then) / repetitions
+
+        print(f'load + slice:                {full * 1e3:8.3f} ms per {window:.0f}-s range')
+        print(f'Sample.read (relative time): {relative * 1e3:8.3f} ms per {window:.0f}-s range')
+        print(f'Sample.read (timestamps):    {absolute * 1e3:8.3f} ms per {window:.0f}-s range')
+
+
+if __name__ == '__main__':
+    import argh
+    argh.dispatch_commands([samples,
+                            actions,
+                            read,
+                            ])
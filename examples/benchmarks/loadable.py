@@ -0,0 +1,113 @@
+""" Benchmark of loading and dumping `Loadable` objects from and to their dict representations
+
+The application (function)
+
+- `throughput`
+- `metadata`
+
+can be executed as main program from the <PROJECT_ROOT> folder via
+
+> python examples/benchmarks/loadable.py throughput [--n-samples 2000]
+
+> python examples/benchmarks/loadable.py metadata [--n-files 500]
+
+`throughput` loads `n_samples` samples from their dict representations via `Sample.load` (each with a 2-device setup of
+26 channels, a subject and a setting with location and controller, i.e. 34 `Loadable` objects per sample, all
+representations share the same setup and setting dicts as in a compiled database catalog) and dumps them via
+`Sample.to_dict`, and reports the throughput in objects per second.
+
+`metadata` writes `n_files` small metadata files (a subject-like dict) per format (yaml, json and HDF5, with and without
+file extension) and measures the time of loading all files via `Loadable.load_dict_like` without and with the parsed
+result cache (second pass).
+"""
+
+from biofb.session import Sample
+from biofb.io import Loadable
+from tempfile import TemporaryDirectory
+import h5py
+import json
+import yaml
+import time
+import os
+
+
+SETUP = dict(name='Benchmark Setup', devices=[
+    dict(name='Bioplux', channels=[dict(name=f'B{i}', sampling_rate=500.) for i in range(9)]),
+    dict(name='Unicorn', channels=[dict(name=f'U{i}', sampling_rate=250.) for i in range(17)]),
+])
+
+SETTING = dict(name='Setting', location=dict(name='Location'),
+               controller=dict(name='Controller', **{'class': 'biofb.session.Controller'}))
+
+OBJECTS_PER_SAMPLE = 1 + 1 + 2 + 26 + 1 + 3  # sample, setup, devices, channels, subject, setting/location/controller
+
+
+def throughput(n_samples=2000):
+    """ Measure the load and dump throughput of `Loadable` objects
+
+    :param n_samples: Number of loaded and dumped samples (defaults to 2000).
+    """
+    representations = [dict(setup=SETUP, setting=SETTING, subject=dict(identity=f'Subject {i}'),
+                            timestamp=1.6e9 + i, filename=f'sample-{i}.h5') for i in range(n_samples)]
+
+    then = time.perf_counter()
+    samples = [Sample.load(r) for r in representations]
+    loaded = time.perf_counter() - then
+
+    then = time.perf_counter()
+    [s.to_dict() for s in samples]
+    dumped = time.perf_counter() - then
+
+    n_objects = n_samples * OBJECTS_PER_SAMPLE
+    print(f'load: {n_objects / loaded:10.0f} objects/s ({n_samples / loaded:8.0f} samples/s)')
+    print(f'dump: {n_objects / dumped:10.0f} objects/s ({n_samples / dumped:8.0f} samples/s)')
+
+
+def metadata(n_files=500):
+    """ Measure the time of loading many small metadata files via `Loadable.load_dict_like`
+
+    :param n_files: Number of files per format (defaults to 500).
+    """
+    meta = dict(identity='Subject', age=42, gender='x', comments=['synthetic subject'] * 5,
+                measures=dict(height=1.8, weight=80.))
+
+    def write_h5(filename, value):
+        with h5py.File(filename, 'w') as h5:
+            Loadable.recursively_save_dict_contents_to_group(h5, '/', value)
+
+    def write_text(dump):
+        def write(filename, value):
+            with open(filename, 'w') as f:
+                dump(value, f)
+        return write
+
+    writers = (('yaml', '.yml', write_text(yaml.safe_dump)), ('json', '.json', write_text(json.dump)),
+               ('hdf5', '.h5', write_h5))
+
+    with TemporaryDirectory() as tmp:
+        for label, extension, write in writers:
+            for suffix in (extension, ''):
+                filenames = [os.path.join(tmp, f'{label}-{i}{suffix}') for i in range(n_files)]
+                for filename in filenames:
+                    write(filename, meta)
+
+                then = time.perf_counter()
+                for filename in filenames:
+                    Loadable.load_dict_like(filename, cache=False)
+                parsed = time.perf_counter() - then
+
+                [Loadable.load_dict_like(filename) for filename in filenames]
+                then = time.perf_counter()
+                for filename in filenames:
+                    Loadable.load_dict_like(filename)
+                cached = time.perf_counter() - then
+
+                print(f'{label + " (" + (suffix or "no extension") + ")":25s} '
+                      f'parse: {parsed / n_files * 1e6:8.1f} us/file, cached: {cached / n_files * 1e6:8.1f} us/file')
+
+
+if __name__ == '__main__':
+    import argh
+    argh.dispatch_commands([throughput,
+                            metadata,
+                            ])
@@ -0,0 +1,158 @@
+""" Benchmark of the acquisition throughput of a hardware `Setup` with in-memory loopback receivers
+
+The applications (functions)
+
+- `throughput`
+- `replay`
+- `mapped`
+
+can be executed as main program from the <PROJECT_ROOT> folder via
+
+> python examples/benchmarks/loopback.py throughput [--duration 600] [--speed None] [--chunk-size 0.1]
+
+> python examples/benchmarks/loopback.py replay [--duration 10]
+
+> python examples/benchmarks/loopback.py mapped [--size 2.]
+
+Synthetic Bioplux (500 Hz x 9 channels) and Unicorn (250 Hz x 17 channels) recordings of `duration` seconds are
+replayed by `biofb.pipeline.MemoryReceiver`s (in background processes, i.e. without Lab Streaming Layer) at `speed`
+times real-time (as fast as possible by default) and received chunk by chunk via `Setup.receive_data` until all
+samples are acquired. The acquisition throughput is reported in samples per second and as multiple of real-time.
+
+`replay` transmits a synthetic Bioplux recording of `duration` seconds (sample by sample) via a
+`biofb.pipeline.MemoryTransmitter` at real-time, 10x real-time and unthrottled, and reports the measured (actual)
+versus the target rate of the transmitter's `biofb.pipeline.Pacer` (the samples are received by a `MemoryReceiver`).
+
+`mapped` replays a synthetic Bioplux recording of `size` GB (chunks of 1 s, stored as `.npy` file) unthrottled via a
+`MemoryTransmitter`, (i) pushing the memory-mapped file (only a file reference is passed to the transmitting process,
+which maps the data slice by slice) and (ii) pushing the recording loaded into memory, and reports the replay time and
+the peak resident memory (`ru_maxrss`) of the main and the transmitting process.
+"""
+
+from biofb.pipeline import MemoryReceiver, MemoryTransmitter, MemoryStream
+from biofb.hardware import Setup, Device
+from tempfile import TemporaryDirectory
+import numpy as np
+import resource
+import time
+import os
+
+
+SETUP = dict(name='Loopback Setup', devices=[
+    dict(name='Bioplux', channels=[dict(name=f'B{i}', sampling_rate=500.) for i in range(9)]),
+    dict(name='Unicorn', channels=[dict(name=f'U{i}', sampling_rate=250.) for i in range(17)]),
+])
+
+
+def throughput(duration=600., speed=None, chunk_size=0.1):
+    """ Measure the acquisition throughput of replayed recordings via `Setup.receive_data`
+
+    :param duration: Duration in seconds of the replayed recordings (defaults to 600).
+    :param speed: Replay speed relative to real-time (defaults to None, i.e. as fast as possible).
+    :param chunk_size: Duration in seconds of the replayed chunks (defaults to 0.1).
+    """
+    speed = None if speed in (None, 'None') else float(speed)
+
+    setup = Setup(**SETUP)
+    data = [np.random.randn(int(duration * d.sampling_rate), d.n_channels).astype('float32') for d in setup.devices]
+    receivers_kwargs = [dict(stream=d.name, data=x, sampling_rate=d.sampling_rate, channels=d.channels,
+                             chunk_size=float(chunk_size), speed=speed, verbose=False)
+                        for d, x in zip(setup.devices, data)]
+
+    n_chunks = int(round(duration / chunk_size))  # all devices are replayed in the same number of chunks
+
+    then = time.perf_counter()
+    try:
+        setup.receive_data(receivers=[MemoryReceiver] * len(data), receivers_kwargs=receivers_kwargs)
+        for _ in range(n_chunks - 1):
+            setup.receive_data()
+    finally:
+        setup.stop()
+    elapsed = time.perf_counter() - then
+
+    assert all(len(d.data) == len(x) for d, x in zip(setup.devices, data))
+    n_samples = sum(len(x) for x in data)
+    print(f'acquired {n_samples} samples ({duration:.0f} s per device) in {elapsed:.2f} s: '
+          f'{n_samples / elapsed:12.0f} samples/s ({duration / elapsed:8.1f}x real-time)')
+
+
+def replay(duration=10.):
+    """ Measure the actual versus the target rate of a replayed recording via a `MemoryTransmitter`
+
+    :param duration: Duration in seconds of the replayed recording (defaults to 10).
+    """
+    device = Device(**SETUP['devices'][0])
+    data = np.random.randn(int(duration * device.sampling_rate), device.n_channels).astype('float32')
+
+    for speed in (1., 10., None):
+        with MemoryTransmitter(device=device, stream='replay', speed=speed, verbose=False) as transmitter:
+            transmitter.push_data(data)
+
+            receiver = MemoryReceiver(stream='replay', verbose=False)
+            n_received = 0
+            while n_received < len(data):
+                n_received += len(receiver.receive_data()[0])
+
+            transmitter.join()
+            report, = transmitter.rate_reports
+
+        MemoryStream.get('replay').close()
+        print(f'speed {str(speed):5s}: {report["n_samples"]} samples in {report["elapsed"]:7.3f} s, '
+              f'actual rate {report["actual_rate"]:10.1f} Hz (target {report["target_rate"]:8.1f} Hz, '
+              f'max. lag {report["max_lag"] * 1e3:6.2f} ms)')
+
+
+def mapped(size=2.):
+    """ Measure the peak memory of replaying a memory-mapped versus an in-memory recording via a `MemoryTransmitter`
+
+    :param size: Size in GB of the replayed recording (defaults to 2).
+    """
+    device = Device(**SETUP['devices'][0])
+    chunk_shape = (int(device.sampling_rate), device.n_channels)
+    n_chunks = int(float(size) * 2 ** 30 / (np.prod(chunk_shape) * 4))
+
+    def peak_memory():
+        """ Peak resident memory in MB of the main and of the (terminated) transmitting processes """
+        return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024)
+
+    with TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'recording.npy')
+        np.lib.format.open_memmap(filename, mode='w+', dtype='float32', shape=(n_chunks, *chunk_shape)).flush()
+        for i in range(0, n_chunks, 1000):  # written block by block (each block is mapped separately)
+            recording = np.load(filename, mmap_mode='r+')[i:i + 1000]
+            recording[:] = np.random.randn(*recording.shape)
+            recording.flush()
+            del recording
+
+        print(f'recording of {n_chunks} chunks {chunk_shape} ({os.path.getsize(filename) / 2 ** 30:.2f} GB), '
+              f'peak memory before replay: main {peak_memory()[0]:8.1f} MB')
+
+        # the memory-mapped recording is replayed first, since the peak memory can only increase
+        for name, load_data in (('mapped', lambda: np.load(filename, mmap_mode='r')),
+                                ('in-memory', lambda: np.load(filename))):
+            with MemoryTransmitter(device=device, stream='mapped', speed=None, maxsize=100,
+                                   verbose=False) as transmitter:
+                then = time.perf_counter()
+                transmitter.push_data(load_data())
+
+                receiver = MemoryReceiver(stream='mapped', verbose=False)
+                n_received = 0
+                while n_received < n_chunks * chunk_shape[0]:
+                    n_received += len(receiver.receive_data()[0])
+
+                transmitter.join()
+                elapsed = time.perf_counter() - then
+
+            MemoryStream.get('mapped').close()
+            main, child = peak_memory()
+            print(f'{name:10s}: replayed in {elapsed:7.2f} s, peak memory: main {main:8.1f} MB, '
+                  f'transmitter {child:8.1f} MB')
+
+
+if __name__ == '__main__':
+    import argh
+    argh.dispatch_commands([throughput,
+                            replay,
+                            mapped,
+                            ])
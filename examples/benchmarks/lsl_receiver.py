@@ -0,0 +1,76 @@
+""" Benchmark of the CPU usage of receiving data from a Lab Streaming Layer stream via the `LSLReceiver`
+
+The application (function)
+
+- `cpu`
+
+can be executed as main program from the <PROJECT_ROOT> folder via
+
+> python examples/benchmarks/lsl_receiver.py cpu [--duration 10] [--sampling-rate 500] [--n-channels 9]
+
+A synthetic Bioplux-shaped LSL stream (500 Hz x 9 channels, float32, pushed in chunks of 10 ms) is provided by a
+`pylsl.StreamOutlet` in a background process. The stream is received in the main process via
+`LSLReceiver.receive_data` in chunk-mode and sample-mode (chunks of 0.1 s) and the consumed CPU time
+(`time.process_time` of the main process) per second of received data is reported.
+"""
+
+from biofb.pipeline.lab_streaming_layer_receiver import LSLReceiver
+from multiprocessing import Process, Event
+import numpy as np
+import pylsl
+import time
+
+
+STREAM = 'biofb-benchmark'
+
+
+def push_stream(sampling_rate: float, n_channels: int, stop: Event, push_interval=0.01):
+    """ Push a synthetic LSL stream of random data in real-time until `stop` is set """
+    info = pylsl.StreamInfo(STREAM, 'EEG', n_channels, sampling_rate, pylsl.cf_float32, STREAM)
+    outlet = pylsl.StreamOutlet(info)
+
+    chunk_size = int(sampling_rate * push_interval)
+    chunk = np.random.rand(chunk_size, n_channels).astype('float32')
+    then = time.monotonic()
+    while not stop.is_set():
+        then += push_interval
+        time.sleep(max(then - time.monotonic(), 0.))
+        outlet.push_chunk(chunk)
+
+
+def cpu(duration=10., sampling_rate=500., n_channels=9):
+    """ Measure the CPU time per second of received data of the `LSLReceiver`
+
+    :param duration: Duration in seconds of received data per mode (defaults to 10).
+    :param sampling_rate: Sampling rate of the synthetic stream (defaults to 500).
+    :param n_channels: Number of channels of the synthetic stream (defaults to 9).
+    """
+    stop = Event()
+    outlet = Process(target=push_stream, args=(sampling_rate, n_channels, stop), daemon=True)
+    outlet.start()
+
+    try:
+        for pull_chunks in (True, False):
+            receiver = LSLReceiver(stream=STREAM, chunk_size=0.1, pull_chunks=pull_chunks, verbose=False)
+            receiver.receive_data()  # connect and wait for the stream
+
+            n_samples, then, cpu_then = 0, time.monotonic(), time.process_time()
+            while n_samples < duration * sampling_rate:
+                timestamps, data = receiver.receive_data()
+                n_samples += len(timestamps)
+            elapsed, cpu_time = time.monotonic() - then, time.process_time() - cpu_then
+            receiver.stream_inlet.close_stream()
+
+            received = n_samples / sampling_rate
+            print(f'{"chunks" if pull_chunks else "samples":8s}: {cpu_time / received * 1e3:8.2f} ms CPU / s data '
+                  f'({received:.1f} s data received in {elapsed:.1f} s)')
+
+    finally:
+        stop.set()
+        outlet.join()
+
+
+if __name__ == '__main__':
+    import argh
+    argh.dispatch_commands([cpu,
+                            ])
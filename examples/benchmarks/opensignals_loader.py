@@ -0,0 +1,102 @@
+""" Benchmark of loading `OpenSignals r(evolution)` (Bioplux) recordings
+
+The applications (functions)
+
+- `generate`
+- `load`
+
+can be executed as main program from the <PROJECT_ROOT> folder via
+
+> python examples/benchmarks/opensignals_loader.py generate [--size 1024] [--filename opensignals_benchmark.txt]
+
+> python examples/benchmarks/opensignals_loader.py load [--filename opensignals_benchmark.txt] [--loadtxt]
+
+`generate` writes a synthetic OpenSignals text file of `size` MB (500 Hz x 11 columns, i.e. nSeq, DI and
+9 sensor channels, a 1 GB file corresponds to roughly 13 hours of data). `load` measures the loading time of
+`Bioplux.load_data` (C-engine `pandas.read_csv` of the selected columns), the creation of the binary sidecar cache
+and the reopening of the cached recording (memory-map). With the `--loadtxt` flag, the previous `numpy.loadtxt`
+approach is benchmarked for comparison.
+"""
+
+from biofb.hardware.devices import Bioplux
+from biofb.io import get_cache_filename
+import numpy as np
+import json
+import time
+import os
+
+
+SENSORS = ("EOG", "ECG", "RESPIRATION", "EEG", "EDA", "EMG", "BVP", "CUSTOM/0.5/1.0/V", "TEMP")
+
+
+def generate(size=1024., filename='opensignals_benchmark.txt', chunk_size=100000):
+    """ Write a synthetic OpenSignals text file
+
+    :param size: Approximate file size in MB (defaults to 1024).
+    :param filename: Filename of the generated file (defaults to 'opensignals_benchmark.txt').
+    :param chunk_size: Number of rows which are written at once.
+    """
+    labels = [f"CH{i + 1}" for i in range(len(SENSORS))]
+    config = {"00:07:80:0F:31:5C": {
+        "device connection": "BTH00:07:80:0F:31:5C", "sampling rate": 500, "resolution": [16] * len(SENSORS),
+        "firmware version": 773, "comments": "", "keywords": "", "mode": 0, "sync interval": 2, "date": "2021-1-19",
+        "time": "15:3:8.574", "channels": list(range(1, len(SENSORS) + 1)), "sensor": list(SENSORS), "label": labels,
+        "column": ["nSeq", "DI"] + labels, "special": [{}] * len(SENSORS), "sleeve color": [""] * len(SENSORS),
+        "digital IO": [0, 1], "convertedValues": 1}}
+
+    n_written = 0
+    with open(filename, 'w') as f:
+        f.write("# OpenSignals Text File Format\n")
+        f.write(f"# {json.dumps(config)}\n")
+        f.write("# EndOfHeader\n")
+
+        while f.tell() < size * 2**20:
+            data = np.random.randn(chunk_size, len(SENSORS) + 2).round(5)
+            data[:, 0] = (np.arange(n_written, n_written + chunk_size) % 16)
+            data[:, 1] = np.random.randint(0, 2, chunk_size)
+            np.savetxt(f, data, fmt='%g', delimiter='\t')
+            n_written += chunk_size
+
+    print(f'Generated `{filename}` ({os.path.getsize(filename) / 2**20:.0f} MB, {n_written} samples, '
+          f'{n_written / 500. / 3600.:.1f} h at 500 Hz).')
+
+
+def load(filename='opensignals_benchmark.txt', loadtxt=False):
+    """ Measure the loading time of a (synthetic) OpenSignals text file
+
+    :param filename: Filename of the OpenSignals file (see `generate`).
+    :param loadtxt: Boolean controlling whether the previous `numpy.loadtxt` approach is benchmarked as well.
+    """
+
+    bioplux = Bioplux()
+    header = bioplux.read_header(filename)
+    device_config = list(header.values())[0]
+    data_columns = list(range(1, len(device_config['column'])))
+
+    if loadtxt:
+        then = time.perf_counter()
+        data = np.loadtxt(filename)[:, data_columns]
+        print(f'numpy.loadtxt:              {time.perf_counter() - then:8.2f} s, shape {data.shape}')
+
+    then = time.perf_counter()
+    data = Bioplux().load_data(filename)
+    print(f'Bioplux.load_data:          {time.perf_counter() - then:8.2f} s, shape {data.shape}')
+
+    cache_filename = get_cache_filename(filename, data_columns, [])
+    if os.path.exists(cache_filename):
+        os.remove(cache_filename)
+
+    then = time.perf_counter()
+    Bioplux().load_data(filename, cache=True)
+    print(f'Bioplux.load_data (cache):  {time.perf_counter() - then:8.2f} s, writes `{cache_filename}`')
+
+    then = time.perf_counter()
+    data = Bioplux().load_data(filename, cache=True)
+    print(f'Bioplux.load_data (reopen): {time.perf_counter() - then:8.4f} s, memory-mapped {type(data).__name__}')
+
+
+if __name__ == '__main__':
+    import argh
+    argh.dispatch_commands([generate,
+                            load,
+                            ])
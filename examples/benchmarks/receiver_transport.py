@@ -0,0 +1,120 @@
+""" Benchmark of the data transport of background `Receiver` processes
+
+The applications (functions)
+
+- `throughput`
+- `latency`
+
+can be executed as main program from the <PROJECT_ROOT> folder via
+
+> python examples/benchmarks/receiver_transport.py throughput [--n-chunks 20000]
+
+> python examples/benchmarks/receiver_transport.py latency [--duration 10]
+
+A synthetic Unicorn-shaped stream (250 Hz x 17 channels) is generated by a `SyntheticReceiver` in a background
+process (see `Receiver.start`) and pulled in the main process via `Receiver.pull_data`. Both transports,
+i.e. the `multiprocessing.Queue` ('queue', pickles every chunk) and the shared memory ring-buffer
+('shared_memory', see `biofb.pipeline.SharedMemoryQueue`), are benchmarked for comparison.
+"""
+
+from biofb.pipeline import Receiver, TRANSPORTS
+import numpy as np
+import time
+
+
+class SyntheticReceiver(Receiver):
+    """ Receiver of a synthetic stream of random data, chunks are timestamped at generation time """
+
+    def __init__(self, stream='synthetic', n_channels=17, sampling_rate=250., chunk_size=25, n_chunks=None,
+                 paced=False, **kwargs):
+        Receiver.__init__(self, stream=stream, n_channels=n_channels, sampling_rate=sampling_rate,
+                          chunk_size=chunk_size, n_chunks=n_chunks, paced=paced, **kwargs)
+        self._connected = False
+        self._chunk = np.random.rand(chunk_size, n_channels)
+        self._n_received = 0
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def connect(self) -> tuple:
+        self._connected = True
+        return self, self.stream_info
+
+    @property
+    def stream_info(self) -> dict:
+        return dict(meta_data=dict(name=self.stream,
+                                   channel_count=self._kwargs['n_channels'],
+                                   nominal_srate=self._kwargs['sampling_rate']),
+                    channels=[])
+
+    def receive_data(self) -> [np.ndarray, np.ndarray]:
+        n_chunks = self._kwargs['n_chunks']
+        while n_chunks is not None and self._n_received >= n_chunks:
+            time.sleep(1.)  # all chunks are sent, idle until terminated
+
+        if self._kwargs['paced']:
+            time.sleep(len(self._chunk) / self._kwargs['sampling_rate'])
+
+        self._n_received += 1
+        return np.full(len(self._chunk), time.time()), self._chunk
+
+
+def throughput(n_chunks=20000, chunk_size=25, n_channels=17, sampling_rate=250.):
+    """ Measure the throughput of an unpaced synthetic stream for each transport
+
+    :param n_chunks: Number of transported chunks (defaults to 20000).
+    :param chunk_size: Number of samples per chunk (defaults to 25, i.e. 1/10 s at 250 Hz).
+    :param n_channels: Number of channels of the synthetic stream (defaults to 17).
+    :param sampling_rate: Nominal sampling rate of the synthetic stream in Hz (defaults to 250).
+    """
+
+    print(f'{"transport":>14} | {"chunks/s":>10} | {"samples/s":>12} | {"MB/s":>8}')
+    for transport in TRANSPORTS:
+        receiver = SyntheticReceiver(n_channels=n_channels, sampling_rate=sampling_rate, chunk_size=chunk_size,
+                                     n_chunks=n_chunks, transport=transport, verbose=False)
+
+        with receiver:  # starts the background process
+            receiver.pull_data()  # wait for the background process
+            then = time.perf_counter()
+            for _ in range(n_chunks - 1):
+                receiver.pull_data()
+            elapsed = time.perf_counter() - then
+
+        rate = (n_chunks - 1) / elapsed
+        print(f'{transport:>14} | {rate:10.0f} | {rate * chunk_size:12.0f} | '
+              f'{rate * chunk_size * n_channels * 8 / 1e6:8.1f}')
+
+
+def latency(duration=10., chunk_size=25, n_channels=17, sampling_rate=250.):
+    """ Measure the latency (generation to pull) of a real-time paced synthetic stream for each transport
+
+    :param duration: Duration of the synthetic stream in seconds (defaults to 10).
+    :param chunk_size: Number of samples per chunk (defaults to 25, i.e. 1/10 s at 250 Hz).
+    :param n_channels: Number of channels of the synthetic stream (defaults to 17).
+    :param sampling_rate: Nominal sampling rate of the synthetic stream in Hz (defaults to 250).
+    """
+
+    n_chunks = int(duration * sampling_rate / chunk_size)
+
+    print(f'{"transport":>14} | {"mean [us]":>10} | {"median [us]":>11} | {"p99 [us]":>10} | {"max [us]":>10}')
+    for transport in TRANSPORTS:
+        receiver = SyntheticReceiver(n_channels=n_channels, sampling_rate=sampling_rate, chunk_size=chunk_size,
+                                     n_chunks=n_chunks, paced=True, transport=transport, verbose=False)
+
+        delay = np.empty(n_chunks)
+        with receiver:  # starts the background process
+            for i in range(n_chunks):
+                timestamps, data = receiver.pull_data()
+                delay[i] = time.time() - timestamps[-1]
+
+        delay = delay[1:] * 1e6  # discard start-up of the background process
+        print(f'{transport:>14} | {delay.mean():10.1f} | {np.median(delay):11.1f} | '
+              f'{np.percentile(delay, 99):10.1f} | {delay.max():10.1f}')
+
+
+if __name__ == '__main__':
+    import argh
+    argh.dispatch_commands([throughput,
+                            latency,
+                            ])
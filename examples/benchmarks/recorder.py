@@ -0,0 +1,98 @@
+""" Benchmark of the write-ahead recording of received data chunks (`biofb.pipeline.Recorder`)
+
+The application (function)
+
+- `memory`
+
+can be executed as main program from the <PROJECT_ROOT> folder via
+
+> python examples/benchmarks/recorder.py memory [--duration 3600] [--buffer-duration 10]
+
+`memory` appends the chunks of a synthetic `duration`-second session (500 Hz x 9-channel Bioplux and 250 Hz x
+17-channel Unicorn device, 20 chunks per second and device, one action per Bioplux chunk) to a hardware `Setup`
+(i) keeping all data in memory (previous approach, data is dumped at the end of the session), and (ii) recording all
+chunks and actions with a `Recorder` while keeping only the latest `buffer_duration` seconds in memory, and measures
+the peak memory (`tracemalloc`), the per-chunk latency of the acquisition loop and the time to convert the recording
+to the HDF5 sample layout (`Recorder.to_hdf5`).
+"""
+
+from biofb.hardware import Setup
+from biofb.pipeline import Recorder
+from tempfile import TemporaryDirectory
+import numpy as np
+import tracemalloc
+import time
+import os
+
+
+SETUP = dict(name='Benchmark Setup', devices=[
+    dict(name='Bioplux', channels=[dict(name=f'B{i}', sampling_rate=500.) for i in range(9)]),
+    dict(name='Unicorn', channels=[dict(name=f'U{i}', sampling_rate=250.) for i in range(17)]),
+])
+
+
+def run(setup, duration, chunks_per_second=20, recorder=None):
+    """ Append the chunks of a synthetic session to the `setup` (and the `recorder`), return per-chunk latencies """
+    rng = np.random.default_rng(0)
+    latencies = []
+
+    for k in range(int(duration * chunks_per_second)):
+        t = k / chunks_per_second
+        chunks = [(t + np.arange(25) / 500., rng.standard_normal((25, 9))),
+                  (t + np.arange(12) / 250., rng.standard_normal((12, 17)))]
+
+        then = time.perf_counter()
+        for i, (timestamps, chunk) in enumerate(chunks):
+            if recorder is not None:
+                recorder.record_data(i, timestamps=timestamps, data=chunk)
+            setup.append_device_data(chunk, device=i, timestamps=timestamps)
+
+        if recorder is not None:
+            recorder.record_action(t, 'key', float(k % 10))
+
+        latencies.append(time.perf_counter() - then)
+
+    return np.array(latencies)
+
+
+def memory(duration=3600., buffer_duration=10.):
+    """ Measure peak memory and per-chunk latency with and without write-ahead recording
+
+    :param duration: Duration of the synthetic session in seconds (defaults to 3600).
+    :param buffer_duration: Duration in seconds of the data kept in memory while recording (defaults to 10).
+    """
+    tracemalloc.start()
+    setup = Setup(**SETUP)
+    latencies = run(setup, duration)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'in memory:  peak memory {peak / 2**20:8.1f} MB, '
+          f'per-chunk latency median {np.median(latencies) * 1e6:6.1f} us, max {latencies.max() * 1e3:6.2f} ms')
+
+    with TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'recording.bin')
+
+        tracemalloc.start()
+        setup = Setup(**SETUP)
+        for device in setup.devices:
+            device.buffer_duration = buffer_duration
+
+        with Recorder(filename, streams=Recorder.get_streams(setup)) as recorder:
+            latencies = run(setup, duration, recorder=recorder)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f'recording:  peak memory {peak / 2**20:8.1f} MB, '
+              f'per-chunk latency median {np.median(latencies) * 1e6:6.1f} us, max {latencies.max() * 1e3:6.2f} ms, '
+              f'{recorder.n_records} records ({os.path.getsize(filename) / 2**20:.1f} MB)')
+
+        then = time.perf_counter()
+        Recorder.to_hdf5(filename, os.path.join(tmp, 'sample.h5'))
+        print(f'conversion: {time.perf_counter() - then:8.2f} s (Recorder.to_hdf5)')
+
+
+if __name__ == '__main__':
+    import argh
+    argh.dispatch_commands([memory,
+                            ])
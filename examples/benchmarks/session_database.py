@@ -0,0 +1,230 @@
+""" Benchmark of (lazy) `SessionDatabase` loading
+
+The applications (functions)
+
+- `load`
+- `scaling`
+- `query`
+- `catalog`
+
+can be executed as main program from the <PROJECT_ROOT> folder via
+
+> python examples/benchmarks/session_database.py load [--n-samples 50] [--duration 600] [--max-bytes 100]
+
+> python examples/benchmarks/session_database.py scaling [--n-samples 200] [--duration 60] [--hdf5]
+
+> python examples/benchmarks/session_database.py query [--n-samples 10000] [--repetitions 100]
+
+> python examples/benchmarks/session_database.py catalog [--n-samples 10000]
+
+`load` writes `n_samples` synthetic samples (HDF5 files with a 500 Hz x 9-channel Bioplux and a 250 Hz x 17-channel
+Unicorn device, `duration` seconds each) and measures the time to open the database with eager loading (all
+device data is read into memory), lazy loading with in-memory reads (LRU byte budget of `max_bytes` MB) and lazy
+loading with memory-mapped HDF5 datasets, as well as the time and resident data volume of iterating over all samples.
+
+`scaling` writes `n_samples` synthetic samples (one text file per sample and device, or one HDF5 file per sample with
+the `--hdf5` flag) and measures the time of immediately loading all samples with 1, 2, 4 and 8 parallel workers
+(a process pool for text files, a thread pool for HDF5 files, see `SessionDatabase.load_data`).
+
+`query` builds a synthetic metadata catalog of `n_samples` samples (100 subjects, 5 settings at 3 locations, 4 device
+combinations, 3 years of timestamps, no data files) and compares the time of selecting "all samples of subject X in
+setting Y with device Z between two dates" via a linear scan over all samples and via the metadata query index
+(`SessionDatabase.query`).
+
+`catalog` writes a synthetic yaml database of `n_samples` samples referring to meta-data ids of a separate meta-data
+file and measures the time of reading the database via `yaml.Loader` (previous approach), of compiling it (libyaml
+parsing and id resolution, see `SessionDatabase.compile`) and of reading it via its compiled catalog
+(`SessionDatabase.read`), as well as the full `SessionDatabase.load` time with the catalog.
+"""
+
+from biofb.io import SessionDatabase, get_nbytes
+from biofb.session import Sample
+from tempfile import TemporaryDirectory
+from datetime import datetime
+import numpy as np
+import yaml
+import time
+import os
+
+
+SETUP = dict(name='Benchmark Setup', devices=[
+    dict(name='Bioplux', channels=[dict(name=f'B{i}', sampling_rate=500.) for i in range(9)]),
+    dict(name='Unicorn', channels=[dict(name=f'U{i}', sampling_rate=250.) for i in range(17)]),
+])
+
+
+def load(n_samples=50, duration=600., max_bytes=100.):
+    """ Measure the loading time of a synthetic session database (eager vs. lazy loading)
+
+    :param n_samples: Number of samples in the database (defaults to 50).
+    :param duration: Duration of each sample in seconds (defaults to 600).
+    :param max_bytes: Byte budget of the lazily loaded data in MB (defaults to 100).
+    """
+    with TemporaryDirectory() as tmp:
+        samples = []
+        for i in range(n_samples):
+            filename = os.path.join(tmp, f'sample-{i}.h5')
+            sample = Sample(setup=SETUP, subject=dict(identity=f'Subject {i}'), filename=filename)
+            sample.data = [np.random.randn(int(duration * 500), 9), np.random.randn(int(duration * 250), 17)]
+            sample.dump_data(chunked=False)  # memory-mappable
+            samples.append(dict(setup=SETUP, subject=dict(identity=f'Subject {i}'), filename=filename))
+
+        print(f'{n_samples} samples of {duration:.0f} s, '
+              f'{sum(os.path.getsize(s["filename"]) for s in samples) / 2**20:.0f} MB in total.')
+
+        for label, lazy, mmap_mode, budget in (('eager', False, None, None),
+                                               ('lazy (read)', True, None, max_bytes * 2**20),
+                                               ('lazy (memory-map)', True, 'c', max_bytes * 2**20)):
+            then = time.perf_counter()
+            db = SessionDatabase(samples=samples, max_bytes=budget)
+            db.load_data(lazy=lazy, mmap_mode=mmap_mode)
+            opened = time.perf_counter() - then
+
+            then = time.perf_counter()
+            total = sum(float(d[-1].sum()) for d in (s.data for s in db.samples))
+            iterated = time.perf_counter() - then
+
+            resident = sum(get_nbytes(s._data) for s in db.samples if s.data_loaded)
+            print(f'{label:18s} open: {opened:8.3f} s, iterate: {iterated:8.3f} s, '
+                  f'resident data: {resident / 2**20:8.1f} MB (checksum {total:.3f})')
+
+
+def scaling(n_samples=200, duration=60., hdf5=False):
+    """ Measure the loading time of a synthetic session database with 1, 2, 4 and 8 parallel workers
+
+    :param n_samples: Number of samples in the database (defaults to 200).
+    :param duration: Duration of each sample in seconds (defaults to 60).
+    :param hdf5: Boolean controlling whether the samples are stored in HDF5 files (defaults to False, i.e. text files).
+    """
+    with TemporaryDirectory() as tmp:
+        samples = []
+        for i in range(n_samples):
+            data = [np.random.randn(int(duration * 500), 9), np.random.randn(int(duration * 250), 17)]
+
+            if hdf5:
+                filename = os.path.join(tmp, f'sample-{i}.h5')
+                sample = Sample(setup=SETUP, subject=dict(identity=f'Subject {i}'), filename=filename)
+                sample.data = data
+                sample.dump_data()
+            else:
+                filename = [os.path.join(tmp, f'sample-{i}-{d["name"]}.txt') for d in SETUP['devices']]
+                for fname, d in zip(filename, data):
+                    np.savetxt(fname, d, fmt='%.6f')
+
+            samples.append(dict(setup=SETUP, subject=dict(identity=f'Subject {i}'), filename=filename))
+
+        print(f'{n_samples} samples of {duration:.0f} s ({"HDF5" if hdf5 else "text"} files).')
+
+        reference = None
+        for workers in (1, 2, 4, 8):
+            db = SessionDatabase(samples=samples)
+
+            then = time.perf_counter()
+            errors = db.load_data(lazy=False, workers=workers, mmap_mode=None)
+            elapsed = time.perf_counter() - then
+
+            reference = elapsed if reference is None else reference
+            print(f'{workers} worker(s): {elapsed:8.3f} s (speed-up {reference / elapsed:4.1f}x, {len(errors)} errors)')
+
+
+def query(n_samples=10000, repetitions=100):
+    """ Measure the time of metadata queries on a synthetic catalog (linear scan vs. metadata query index)
+
+    :param n_samples: Number of samples in the catalog (defaults to 10000).
+    :param repetitions: Number of repeated queries (defaults to 100).
+    """
+    rng = np.random.default_rng(0)
+    locations = [dict(name=f'Location {i}') for i in range(3)]
+    settings = [dict(name=f'Setting {i}', location=locations[i % 3], controller=dict(name=f'Controller {i % 2}'))
+                for i in range(5)]
+    setups = [dict(name='Setup', devices=devices) for devices in
+              ([SETUP['devices'][0]], [SETUP['devices'][1]], SETUP['devices'], SETUP['devices'][::-1])]
+    start = datetime(2020, 1, 1).timestamp()
+
+    then = time.perf_counter()
+    db = SessionDatabase(samples=[dict(setup=setups[rng.integers(4)], setting=settings[rng.integers(5)],
+                                       subject=dict(identity=f'Subject {rng.integers(100)}'),
+                                       timestamp=start + rng.uniform(0, 3 * 365 * 86400), filename=f'sample-{i}.h5')
+                                  for i in range(n_samples)])
+    print(f'catalog of {len(db)} samples built in {time.perf_counter() - then:.2f} s')
+
+    criteria = dict(subject='Subject 42', setting='Setting 3', device='Unicorn',
+                    start=datetime(2021, 1, 1), stop=datetime(2022, 1, 1))
+    lower, upper = criteria['start'].timestamp(), criteria['stop'].timestamp()
+
+    then = time.perf_counter()
+    for _ in range(repetitions):
+        scanned = [s for s in db.samples if s.subject.identity == criteria['subject'] and
+                   s.setting.name == criteria['setting'] and
+                   any(d.name == criteria['device'] for d in s.setup.devices) and lower <= s.timestamp < upper]
+    scan = (time.perf_counter() - then) / repetitions
+
+    then = time.perf_counter()
+    db.index
+    build = time.perf_counter() - then
+
+    then = time.perf_counter()
+    for _ in range(repetitions):
+        selected = db.query(**criteria)
+    indexed = (time.perf_counter() - then) / repetitions
+
+    assert selected.samples == scanned
+    print(f'linear scan:   {scan * 1e3:8.3f} ms per query ({len(scanned)} samples)')
+    print(f'indexed query: {indexed * 1e3:8.3f} ms per query ({len(selected)} samples, '
+          f'index built once in {build * 1e3:.1f} ms), speed-up {scan / indexed:.0f}x')
+
+
+def catalog(n_samples=10000):
+    """ Measure the time of reading a synthetic yaml database with and without its compiled catalog
+
+    :param n_samples: Number of samples in the database (defaults to 10000).
+    """
+    with TemporaryDirectory() as tmp:
+        meta_filename = os.path.join(tmp, 'meta.yml')
+        with open(meta_filename, 'w') as f:
+            ids = {f'SUBJECT_{i}': dict(identity=f'Subject {i}') for i in range(100)}
+            ids.update({f'SETTING_{i}': dict(name=f'Setting {i}', location=dict(name=f'Location {i % 3}'))
+                        for i in range(5)})
+            ids['SETUP'] = SETUP
+            yaml.dump(dict(ids=ids), f)
+
+        db_filename = os.path.join(tmp, 'db.yml')
+        with open(db_filename, 'w') as f:
+            yaml.dump(dict(meta_data=meta_filename,
+                           samples=[dict(setup='SETUP', subject=f'SUBJECT_{i % 100}', setting=f'SETTING_{i % 5}',
+                                         timestamp=1.6e9 + 3600. * i, filename=f'sample-{i}.h5',
+                                         comments=['synthetic sample'])
+                                    for i in range(n_samples)]), f)
+
+        print(f'database of {n_samples} samples ({os.path.getsize(db_filename) / 2**20:.1f} MB yaml).')
+
+        then = time.perf_counter()
+        with open(db_filename, 'r') as f:
+            yaml.load(f, Loader=yaml.Loader)
+        print(f'yaml.Loader:               {time.perf_counter() - then:8.3f} s (without id resolution)')
+
+        then = time.perf_counter()
+        SessionDatabase.compile(db_filename)
+        print(f'SessionDatabase.compile:   {time.perf_counter() - then:8.3f} s')
+
+        then = time.perf_counter()
+        SessionDatabase.read(db_filename)
+        print(f'SessionDatabase.read:      {time.perf_counter() - then:8.3f} s (first read, writes the catalog)')
+
+        then = time.perf_counter()
+        SessionDatabase.read(db_filename)
+        print(f'SessionDatabase.read:      {time.perf_counter() - then:8.3f} s (compiled catalog)')
+
+        then = time.perf_counter()
+        SessionDatabase.load(db_filename, lazy=True)
+        print(f'SessionDatabase.load:      {time.perf_counter() - then:8.3f} s (compiled catalog, incl. construction '
+              f'of the samples)')
+
+
+if __name__ == '__main__':
+    import argh
+    argh.dispatch_commands([load,
+                            scaling,
+                            query,
+                            catalog,
+                            ])
@@ -0,0 +1,72 @@
+""" Benchmark of the per-chunk cost of filtering received device data
+
+The application (function)
+
+- `filter_latency`
+
+can be executed as main program from the <PROJECT_ROOT> folder via
+
+> python examples/benchmarks/streaming_filter.py filter-latency [--duration 3600] [--refilter]
+
+A synthetic Unicorn stream (250 Hz x 17 channels, chunks of 1/10 s) is filtered chunk-by-chunk by a
+`biofb.signal.filter.StreamingFilter` (50 Hz notch and 1 - 40 Hz bandpass, filter state carried across chunks).
+The per-chunk filter latency is reported for consecutive time-windows of the stream and should stay flat over the
+whole session. With the `--refilter` flag, the previous approach of refiltering the whole history with
+`apply_notch` and `apply_sos_filter` on every chunk is benchmarked for comparison (use a shorter `--duration`,
+the costs grow linearly per chunk).
+"""
+
+from biofb.signal.filter import StreamingFilter, apply_notch, apply_sos_filter
+from biofb.io import DataBuffer
+import numpy as np
+import time
+
+
+def filter_latency(duration=3600., sampling_rate=250., n_channels=17, chunk_size=0.1, n_windows=12, refilter=False):
+    """ Measure the per-chunk filter latency of a synthetic Unicorn stream
+
+    :param duration: Duration of the synthetic stream in seconds (defaults to 3600, i.e. 1 hour).
+    :param sampling_rate: Sampling rate of the synthetic stream in Hz (defaults to 250).
+    :param n_channels: Number of channels of the synthetic stream (defaults to 17).
+    :param chunk_size: Duration of a data chunk in seconds (defaults to 0.1).
+    :param n_windows: Number of time-windows for which the latency statistics are reported.
+    :param refilter: Boolean controlling whether to benchmark refiltering of the whole history instead of the
+                     `StreamingFilter`.
+    """
+
+    specs = [{'type': 'notch', 'w0': 50.}, {'type': 'bandpass', 'N': 4, 'Wn': (1., 40.)}]
+    streaming_filter = StreamingFilter.from_specs(specs, sampling_rate=sampling_rate)
+
+    samples_per_chunk = int(sampling_rate * chunk_size)
+    n_chunks = int(duration / chunk_size)
+    chunk = np.random.rand(samples_per_chunk, n_channels)
+
+    history = DataBuffer()
+    latency = np.empty(n_chunks)
+    for i in range(n_chunks):
+        then = time.perf_counter()
+
+        if refilter:
+            data = history.append(chunk)
+            data = apply_notch(data, w0=50., sampling_rate=sampling_rate, axis=0)
+            apply_sos_filter(data, N=4, Wn=(1., 40.), sampling_rate=sampling_rate, sos_filter='bandpass', axis=0)
+        else:
+            streaming_filter(chunk)
+
+        latency[i] = time.perf_counter() - then
+
+    print(f'Filtered {n_chunks} chunks of shape {chunk.shape} ({duration / 60.:.1f} min of data, '
+          f'{"refiltered history" if refilter else "StreamingFilter"}).')
+
+    print(f'{"window [min]":>16} | {"mean [us]":>10} | {"median [us]":>11} | {"p99 [us]":>10} | {"max [us]":>10}')
+    for window in np.array_split(np.arange(n_chunks), n_windows):
+        w = latency[window] * 1e6
+        t0, t1 = window[0] * chunk_size / 60., (window[-1] + 1) * chunk_size / 60.
+        print(f'{t0:7.1f} - {t1:6.1f} | {w.mean():10.2f} | {np.median(w):11.2f} | '
+              f'{np.percentile(w, 99):10.2f} | {w.max():10.2f}')
+
+
+if __name__ == '__main__':
+    import argh
+    argh.dispatch_commands([filter_latency,
+                            ])
@@ -0,0 +1,98 @@
+""" Benchmark of the timestamp-aligned multi-device synchronization
+
+The application (function)
+
+- `alignment`
+
+can be executed as main program from the <PROJECT_ROOT> folder via
+
+> python examples/benchmarks/synchronizer.py alignment [--duration 10800] [--jitter 0.002]
+
+Two synthetic streams, a Bioplux stream (500 Hz x 9 channels) and a Unicorn stream (250 Hz x 17 channels), are
+generated chunk-wise with individual clock offsets, clock drifts and timestamp jitter and aligned on a common
+time base by a `biofb.pipeline.Synchronizer`. Each stream carries its true (device-)time as data, such that the
+alignment error can be evaluated. The per-update latency, the alignment error and the estimated clock drifts are
+reported for consecutive time-windows of the streams and should stay flat over the whole session.
+"""
+
+from biofb.pipeline import Synchronizer
+import numpy as np
+import time
+
+
+class SyntheticStream(object):
+    """ Chunk-wise generator of a stream which carries its true time as data, timestamped by a drifting and
+        jittered clock """
+
+    def __init__(self, sampling_rate, n_channels, offset, drift, jitter, chunk_duration):
+        self.sampling_rate = sampling_rate
+        self.n_channels = n_channels
+        self.offset = offset
+        self.drift = drift
+        self.jitter = jitter
+        self.chunk_size = int(sampling_rate * chunk_duration)
+        self.n_samples = 0
+
+    def true_time(self, timestamps):
+        """ True stream time of (noise-free) timestamps """
+        return (timestamps - self.offset) / (1. + self.drift)
+
+    def __next__(self):
+        true_time = np.arange(self.n_samples, self.n_samples + self.chunk_size) / self.sampling_rate
+        self.n_samples += self.chunk_size
+
+        timestamps = self.offset + true_time * (1. + self.drift) + np.random.normal(0., self.jitter, self.chunk_size)
+        return timestamps, np.repeat(true_time[:, None], self.n_channels, axis=1)
+
+
+def alignment(duration=10800., jitter=0.002, drift=5e-5, chunk_duration=0.1, n_windows=12):
+    """ Measure the per-update latency and alignment error of a synthetic Bioplux and Unicorn stream
+
+    :param duration: Duration of the synthetic streams in seconds (defaults to 10800, i.e. 3 hours).
+    :param jitter: Standard deviation of the timestamp jitter in seconds (defaults to 0.002).
+    :param drift: Relative clock drift of the streams, the Bioplux clock runs fast and the Unicorn clock runs slow
+                  by `drift` (defaults to 5e-5, i.e. 0.18 s per hour).
+    :param chunk_duration: Duration of a data chunk in seconds (defaults to 0.1).
+    :param n_windows: Number of time-windows for which the statistics are reported.
+    """
+
+    streams = [SyntheticStream(sampling_rate=500., n_channels=9, offset=100., drift=drift, jitter=jitter,
+                               chunk_duration=chunk_duration),
+               SyntheticStream(sampling_rate=250., n_channels=17, offset=100.3, drift=-drift, jitter=jitter,
+                               chunk_duration=chunk_duration)]
+
+    synchronizer = Synchronizer(sampling_rates=[s.sampling_rate for s in streams])
+
+    n_updates = int(duration / chunk_duration)
+    latency = np.empty(n_updates)
+    error = np.zeros(n_updates)
+    drifts = np.empty((n_updates, len(streams)))
+    for i in range(n_updates):
+        chunks = [next(s) for s in streams]
+
+        then = time.perf_counter()
+        timestamps, data = synchronizer.update(chunks)
+        latency[i] = time.perf_counter() - then
+
+        if len(timestamps):
+            error[i] = max(np.abs(d[:, 0] - s.true_time(timestamps)).max() for d, s in zip(data, streams))
+
+        drifts[i] = synchronizer.drifts
+
+    print(f'Aligned {n_updates} chunks of {duration / 60.:.1f} min Bioplux (500 Hz x 9) and Unicorn (250 Hz x 17) '
+          f'streams (jitter {jitter * 1e3:.1f} ms, drift +/-{drift:.1e}) at {synchronizer.sampling_rate:.0f} Hz, '
+          f'retained memory {sum(b.nbytes for b in synchronizer._buffers) / 1024:.0f} kB.')
+
+    print(f'{"window [min]":>16} | {"mean [us]":>10} | {"p99 [us]":>10} | {"max err [ms]":>12} | '
+          f'{"drift bioplux":>13} | {"drift unicorn":>13}')
+    for window in np.array_split(np.arange(n_updates), n_windows):
+        w = latency[window] * 1e6
+        t0, t1 = window[0] * chunk_duration / 60., (window[-1] + 1) * chunk_duration / 60.
+        print(f'{t0:7.1f} - {t1:6.1f} | {w.mean():10.2f} | {np.percentile(w, 99):10.2f} | '
+              f'{error[window].max() * 1e3:12.3f} | {drifts[window[-1], 0]:13.2e} | {drifts[window[-1], 1]:13.2e}')
+
+
+if __name__ == '__main__':
+    import argh
+    argh.dispatch_commands([alignment,
+                            ])
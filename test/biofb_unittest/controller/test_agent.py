@@ -37,6 +37,28 @@ class TestAgent(unittest.TestCase):
         self.assertEqual(agent.name, "Loaded Agent")
         self.assertEqual(agent.description, "Loaded from Dict.")
 
+    def test_dump_actions(self):
+        from tempfile import TemporaryDirectory
+        from os import path
+        import h5py
+
+        agent = self.TestAgent()
+        agent.action_data = [(0.5, None), (1.0, ('a', 2.5)), (1.5, 3), (2.0, 'b'), (2.5, ('.', None))]
+
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, 'actions.h5')
+            agent.dump_actions(filename)
+
+            with h5py.File(filename, 'r') as h5:
+                records = h5['action_data'][()]
+
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records.dtype.names, ('timestamp', 'length', 'values', 'labels'))
+
+        loaded = self.TestAgent()
+        loaded.action_data = records
+        self.assertEqual(loaded.action_data, [(0.5, None), (1.0, 'a', 2.5), (1.5, 3.), (2.0, 'b'), (2.5, '.', None)])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -95,6 +95,45 @@ class TestSession(unittest.TestCase):
         self.assertTrue(session.done)
         self.assertTrue(session.sample.state >= imax)
 
+    def test_recording_buffer(self):
+        from biofb.session import Sample
+        from tempfile import TemporaryDirectory
+        from os import path
+        import numpy as np
+
+        setup = dict(name='Setup', devices=[dict(name='D1', channels=[dict(name='A', sampling_rate=100.)]),
+                                            dict(name='D2', channels=[dict(name='B', sampling_rate=50.)])])
+
+        with TemporaryDirectory() as tmp:
+            for buffer_duration, monitor_window, expected in ((None, None, 10.), (None, 30., 30.), (2., 30., 2.)):
+                sample = Sample(setup=setup, subject=dict(identity='Subject'), filename=path.join(tmp, 'sample.h5'))
+                session = self.TestSession(agent=self.TestAgent(), sample=sample, buffer_duration=buffer_duration,
+                                           recording=path.join(tmp, 'recording.bin'))
+                session.monitor_window = monitor_window
+                devices = session.sample.setup.devices
+
+                # the sample already holds data, e.g. of a previous run
+                for device in devices:
+                    session.sample.setup.append_device_data(np.random.rand(100, 1), device=device)
+
+                session.start_recording()
+
+                # received data is kept in bounded ring-buffers while recording
+                self.assertEqual([d.buffer_duration for d in devices], [expected] * 2)
+                for _ in range(10):
+                    for device in devices:
+                        session.sample.setup.append_device_data(np.random.rand(1000, 1), device=device)
+
+                self.assertEqual([len(d.data) for d in devices], [d.buffer_capacity for d in devices])
+                session.stop_recording()
+
+                # the buffer durations are restored, i.e. later unrecorded runs keep all data
+                self.assertEqual([d.buffer_duration for d in devices], [None] * 2)
+                for device in devices:
+                    n_samples = len(device.data)
+                    session.sample.setup.append_device_data(np.random.rand(1000, 1), device=device)
+                    self.assertEqual(len(device.data), n_samples + 1000)
+
 
 if __name__ == '__main__':
     unittest.main()
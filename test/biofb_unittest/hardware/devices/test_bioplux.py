@@ -2,6 +2,32 @@ import unittest
 from os import path
 
 
+def write_opensignals_file(filename, n_samples=1000, sensors=("EOG", "ECG", "RESPIRATION", "EEG", "EDA", "CUSTOM/0.5/1.0/V")):
+    """ Write a synthetic `OpenSignals r(evolution)` text file (columns nSeq, DI, CH1, ...) and return its data """
+    import numpy as np
+    import json
+
+    labels = [f"CH{i + 1}" for i in range(len(sensors))]
+    config = {"00:07:80:0F:31:5C": {
+        "device connection": "BTH00:07:80:0F:31:5C", "sampling rate": 500, "resolution": [16] * len(sensors),
+        "firmware version": 773, "comments": "", "keywords": "", "mode": 0, "sync interval": 2, "date": "2021-1-19",
+        "time": "15:3:8.574", "channels": list(range(1, len(sensors) + 1)), "sensor": list(sensors), "label": labels,
+        "column": ["nSeq", "DI"] + labels, "special": [{}] * len(sensors), "sleeve color": [""] * len(sensors),
+        "digital IO": [0, 1], "convertedValues": 1}}
+
+    data = np.random.rand(n_samples, len(sensors) + 2).round(6)
+    data[:, 0] = np.arange(n_samples) % 16
+    data[:, 1] = np.random.randint(0, 2, n_samples)
+
+    with open(filename, 'w') as f:
+        f.write("# OpenSignals Text File Format\n")
+        f.write(f"# {json.dumps(config)}\n")
+        f.write("# EndOfHeader\n")
+        np.savetxt(f, data, fmt='%g', delimiter='\t')
+
+    return data
+
+
 class TestBioplux(unittest.TestCase):
     def setUp(self) -> None:
         pass
@@ -60,6 +86,44 @@ class TestBioplux(unittest.TestCase):
             if plot:
                 bp.plot(figure_kwargs={'figsize': (17, 10), 'sharex': True})
 
+    def test_load_bioplux_synthetic(self):
+        from biofb.hardware.devices import Bioplux
+        from tempfile import TemporaryDirectory
+        import numpy as np
+        import glob
+
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, 'opensignals_synthetic.txt')
+            expected = write_opensignals_file(filename)
+
+            bioplux = Bioplux()
+            data = bioplux.load_data(filename=filename, update_device=True)
+            self.assertEqual([c.name for c in bioplux.channels][:2], ["DI", "EOG"])
+            self.assertTrue(np.allclose(data, expected[:, 1:]))
+            self.assertIs(bioplux.data, data)
+
+            # only selected columns are loaded, in the order of the device channels
+            bioplux = Bioplux(channels=[Bioplux.EEG.copy(), Bioplux.ECG.copy()])  # labels CH4 and CH2
+            data = bioplux.load_data(filename=filename, update_channels=False)
+            self.assertTrue(np.allclose(data, expected[:, [5, 3]]))
+
+            # binary sidecar cache, memory-mapped on reopening
+            cached = bioplux.load_data(filename=filename, update_channels=False, cache=True)
+            self.assertEqual(len(glob.glob(path.join(tmp, '*.npy'))), 1)
+            self.assertIsInstance(bioplux.load_data(filename=filename, update_channels=False, cache=True), np.memmap)
+            self.assertTrue(np.array_equal(cached, data))
+            del cached
+
+            # keywords of `numpy.loadtxt` (former versions of `load_data`) are translated or rejected
+            with self.assertWarns(DeprecationWarning):
+                legacy = bioplux.load_data(filename=filename, update_channels=False, delimiter='\t',
+                                           skiprows=5, max_rows=10, dtype='float32')
+            self.assertEqual(legacy.dtype, np.float32)
+            np.testing.assert_allclose(legacy, data[2:12], rtol=1e-6)
+
+            with self.assertRaises(TypeError):
+                bioplux.load_data(filename=filename, update_channels=False, usecols=(1, 2))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -59,6 +59,48 @@ class TestUnicorn(unittest.TestCase):
             if plot:
                 uc.plot(figure_kwargs={'figsize': (17, 10), 'sharex': True})
 
+    def test_load_unicorn_synthetic(self):
+        from biofb.hardware.devices import Unicorn
+        from tempfile import TemporaryDirectory
+        import numpy as np
+        from unittest import mock
+        import glob
+
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, 'UnicornRecorder_synthetic.csv')
+            channel_names = [c.name for c in Unicorn.CHANNELS]
+            expected = np.random.rand(1001, len(channel_names)).astype(np.float32)
+            np.savetxt(filename, expected, delimiter=',', header=','.join(channel_names), comments='', fmt='%.9g')
+
+            unicorn = Unicorn()
+            data = unicorn.load_data(filename=filename)
+            self.assertEqual(data.dtype, np.float32)
+            self.assertTrue(np.array_equal(data, expected))
+
+            # only the configured channels are parsed, chunk-wise into a preallocated array
+            unicorn = Unicorn(channels=[Unicorn.COUNT.copy(), Unicorn.EEG2.copy()])
+            data = unicorn.load_data(filename=filename, chunksize=100, update_device=True)
+            self.assertTrue(np.array_equal(data, expected[:, [15, 1]]))
+            self.assertIs(unicorn.data, data)
+
+            # more data rows than counted
+            with mock.patch.object(Unicorn, 'count_rows', return_value=10):
+                grown = unicorn.load_data(filename=filename, chunksize=100)
+            self.assertTrue(np.array_equal(grown, data))
+            self.assertEqual(grown.dtype, np.float32)
+
+            # binary sidecar cache
+            unicorn.load_data(filename=filename, cache=True)
+            cached = unicorn.load_data(filename=filename, cache=True)
+            self.assertIsInstance(cached, np.memmap)
+            self.assertTrue(np.array_equal(cached, data))
+            self.assertEqual(len(glob.glob(path.join(tmp, '*.npy'))), 1)
+            del cached
+
+            unicorn = Unicorn(channels=[Unicorn.EEG1.copy(), dict(name='EEG 9', sampling_rate=250)])
+            with self.assertRaises(AssertionError):
+                unicorn.load_data(filename=filename)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 
 
 class TestSetup(unittest.TestCase):
@@ -12,6 +13,134 @@ class TestSetup(unittest.TestCase):
     def test_import(self):
         from biofb.hardware import Setup
 
+    def test_append_data(self):
+        from biofb.hardware import Device, Setup
+
+        chunks = [np.random.rand(n, 2) for n in (10, 20, 30)]
+
+        device = Device(name='device', channels=[dict(name='A', sampling_rate=10), dict(name='B', sampling_rate=10)])
+        for chunk in chunks:
+            device.append_data(chunk)
+
+        self.assertTrue(np.array_equal(device.data, np.concatenate(chunks)))
+        self.assertTrue(np.array_equal(device.get_recent_data(2.), np.concatenate(chunks)[-20:]))
+        self.assertTrue(np.shares_memory(device.get_recent_data(2.), device.data))
+
+        # externally set data is continued
+        device.data = np.zeros((5, 2))
+        device.append_data(chunks[0])
+        self.assertEqual(len(device.data), 15)
+
+        # ring-buffer
+        device.buffer_duration = 3.
+        for chunk in chunks:
+            device.append_data(chunk)
+        self.assertTrue(np.array_equal(device.data, np.concatenate(chunks)[-30:]))
+
+        # setup data
+        setup = Setup(name='setup', devices=[Device(name='device', channels=[dict(name='A', sampling_rate=10)])])
+        for chunk in chunks:
+            setup.append_device_data(chunk[:, :1], device='device')
+
+        self.assertIsNone(setup.devices[0]._data)
+        self.assertTrue(np.array_equal(setup.devices[0].data, np.concatenate(chunks)[:, :1]))
+        self.assertEqual(len(setup.get_recent_data(1.)[0]), 10)
+
+        # buffer duration set on a setup-hosted device which already holds data
+        device = setup.devices[0]
+        device.buffer_duration = 1.
+        self.assertEqual(device.buffer_capacity, 10)
+        for _ in range(5):
+            setup.append_device_data(np.random.rand(50, 1), device='device')
+
+        self.assertEqual(len(device.data), device.buffer_capacity)
+        self.assertEqual(setup._buffers[0].capacity, device.buffer_capacity)
+
+    def test_streaming_filter(self):
+        from biofb.hardware import Device
+        from biofb.signal.filter import StreamingFilter
+
+        device = Device(name='device', channels=[dict(name='A', sampling_rate=100), dict(name='B', sampling_rate=100)])
+        self.assertIsNone(device.streaming_filter)
+
+        chunk = np.random.rand(10, 2)
+        self.assertIs(device.filter_data(chunk), chunk)
+
+        device.streaming_filter = [{'type': 'lowpass', 'N': 2, 'Wn': 10.}]
+        self.assertIsInstance(device.streaming_filter, StreamingFilter)
+
+        # a constant signal passes the (steady-state initialized) lowpass filter
+        constant = np.ones((50, 2))
+        self.assertTrue(np.allclose(np.concatenate([device.filter_data(c) for c in np.split(constant, 5)]), 1.))
+
+        # filter banks are cached per configuration, least recently used banks are dropped
+        specs = [{'type': 'lowpass', 'N': 2, 'Wn': 10.}]
+        bank = device.get_filter_bank(specs)
+        self.assertIs(device.get_filter_bank(specs), bank)
+        for i in range(Device.FILTER_BANK_CACHE_SIZE):
+            device.get_filter_bank([{'type': 'lowpass', 'N': 2, 'Wn': 11. + i}])
+
+        self.assertEqual(len(device._filter_banks), Device.FILTER_BANK_CACHE_SIZE)
+        self.assertIsNot(device.get_filter_bank(specs), bank)
+
+    def test_apply_filters(self):
+        from biofb.hardware import Device
+        from scipy.signal import sosfiltfilt
+        from biofb.signal.filter import bandpass, notch, to_sos
+
+        channels = [dict(name=f'EEG {i}', sampling_rate=250) for i in range(4)] + [dict(name='Counter', sampling_rate=250)]
+        data = np.random.rand(1000, 5)
+
+        device = Device(name='device', channels=channels, data=data.copy())
+        pipeline = [{'type': 'notch', 'w0': 50.}, {'type': 'bandpass', 'N': 4, 'Wn': (1., 40.)}]
+
+        memory = device.data
+        filtered = device.apply_filters(pipeline, channels=['EEG 0', 'EEG 1', 2, 'EEG 3'])
+        self.assertIs(filtered, memory)  # filtered in place
+
+        sos = to_sos([notch(w0=50., sampling_rate=250), bandpass(N=4, Wn=(1., 40.), sampling_rate=250)])
+        self.assertTrue(np.allclose(filtered[:, :4], sosfiltfilt(sos, data[:, :4], axis=0)))
+        self.assertTrue(np.array_equal(filtered[:, 4], data[:, 4]))
+
+        # single filter, filtered copy
+        lowpass = device.apply_filter('lowpass', channels=[0, 2], N=2, Wn=10., filtfilt=False, update_data=False)
+        self.assertTrue(np.array_equal(lowpass[:, 1], device.data[:, 1]))
+        self.assertFalse(np.shares_memory(lowpass, device.data))
+
+    def test_channel_index(self):
+        from biofb.hardware import Device, Setup
+
+        device = Device(name='device', channels=[dict(name=n, sampling_rate=10) for n in ('A', 'B', 'C', 'C')],
+                        data=np.arange(20.).reshape(5, 4))
+
+        a, b, c1, c2 = device.channels
+        self.assertIs(device['B'], b)
+        self.assertIs(device[b], b)
+        self.assertEqual(device['C'], [c1, c2])
+        self.assertIsNone(device['D'])
+        self.assertEqual(device.get_channel_index(c2), 3)
+        with self.assertRaises(KeyError):
+            device.get_channel_index('C')
+
+        # channel data are strided column views
+        self.assertTrue(np.shares_memory(b.data, device.data))
+        self.assertTrue(np.array_equal(b.data, np.arange(1., 20., 4)))
+        b.data = 0.
+        self.assertTrue(np.all(device.data[:, 1] == 0.))
+
+        # renamed channels are re-indexed
+        c2.name = 'D'
+        self.assertIs(device['D'], c2)
+        self.assertIs(device['C'], c1)
+
+        setup = Setup(name='setup', devices=[device, Device(name='other', channels=[dict(name='A', sampling_rate=10)])])
+        self.assertEqual(setup.get_device_index('other'), 1)
+        self.assertIs(setup['device'], setup.devices[0])
+        setup.devices[1].name = 'renamed'
+        self.assertEqual(setup.get_device_index('renamed'), 1)
+        with self.assertRaises(AttributeError):
+            setup.get_device_index('other')
+
 
 if __name__ == '__main__':
     unittest.main()
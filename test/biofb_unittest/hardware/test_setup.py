@@ -12,6 +12,66 @@ class TestSetup(unittest.TestCase):
     def test_import(self):
         from biofb.hardware import Setup
 
+    def test_timestamps(self):
+        from biofb.hardware import Setup
+        import numpy as np
+
+        setup = Setup(name='Setup', devices=[dict(name='D1', channels=[dict(name='A', sampling_rate=10.)]),
+                                             dict(name='D2', channels=[dict(name='B', sampling_rate=10.)])])
+
+        for i in range(3):
+            setup.append_device_data(np.random.randn(5, 1), device='D1', timestamps=np.arange(5 * i, 5 * i + 5) / 10.)
+            setup.append_device_data(np.random.randn(5, 1), device='D2')
+
+        timestamps = setup.timestamps
+        np.testing.assert_allclose(timestamps[0], np.arange(15) / 10.)
+        self.assertEqual(len(timestamps[0]), len(setup.data[0]))
+        self.assertIsNone(timestamps[1])
+
+        # timestamps are discarded if data is appended without timestamps
+        setup.append_device_data(np.random.randn(5, 1), device='D1')
+        self.assertIsNone(setup.timestamps[0])
+
+    def test_synchronize(self):
+        from biofb.hardware import Setup
+        from biofb.pipeline import MemoryReceiver
+        import numpy as np
+
+        setup = Setup(name='Setup', devices=[dict(name='D1', channels=[dict(name='A', sampling_rate=100.)]),
+                                             dict(name='D2', channels=[dict(name='B', sampling_rate=50.),
+                                                                       dict(name='C', sampling_rate=50.)])])
+        for device in setup.devices:
+            device.buffer_duration = 1.
+
+        data = [np.random.randn(300, 1), np.random.randn(150, 2)]
+        receivers_kwargs = [dict(stream=device.name, data=d, sampling_rate=device.sampling_rate, speed=None,
+                                 channels=device.channels, chunk_size=0.5, verbose=False)
+                            for device, d in zip(setup.devices, data)]
+
+        try:
+            setup.receive_data(receivers=[MemoryReceiver] * 2, receivers_kwargs=receivers_kwargs, synchronize=True)
+            for _ in range(5):
+                setup.receive_data(synchronize=True)
+        finally:
+            setup.stop()
+
+        # all devices are resampled at the synchronized rate
+        self.assertEqual(setup.synchronizer.sampling_rate, 100.)
+        self.assertEqual([d.sampling_rates for d in setup.devices], [[100.], [100., 100.]])
+
+        timestamps = setup.timestamps
+        for device, t in zip(setup.devices, timestamps):
+            self.assertEqual(len(device.data), 100)  # 1 s ring-buffer at 100 Hz
+            self.assertEqual(len(t), len(device.data))
+            self.assertEqual(len(device.get_recent_data(0.5)), 50)
+            np.testing.assert_allclose(np.diff(t), 0.01, atol=1e-3)
+
+        np.testing.assert_allclose(timestamps[0], timestamps[1])
+
+        # nominal sampling rates are restored without synchronizer
+        setup.synchronizer = None
+        self.assertEqual([d.sampling_rates for d in setup.devices], [[100.], [50., 50.]])
+
 
 if __name__ == '__main__':
     unittest.main()
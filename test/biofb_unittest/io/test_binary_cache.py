@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+
+
+class TestBinaryCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data = np.random.rand(100, 3).astype('float32')
+
+    def tearDown(self) -> None:
+        pass
+
+    def test_import(self):
+        from biofb.io import load_cached, get_cache_filename, remove_stale_caches
+
+    def test_load_cached(self):
+        from biofb.io import load_cached, get_cache_filename
+        from tempfile import TemporaryDirectory
+        from os import path
+        import glob
+        import os
+
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, 'data.txt')
+            np.savetxt(filename, self.data)
+
+            def sidecars():
+                return sorted(glob.glob(path.join(tmp, '*.npy')))
+
+            # one sidecar per key, the loader is only called for missing caches
+            calls = []
+            loader = lambda: calls.append(1) or np.loadtxt(filename, dtype='float32')
+            cached = load_cached(filename, loader, 'all')
+            self.assertIsInstance(cached, np.memmap)
+            self.assertTrue(np.array_equal(cached, self.data))
+            self.assertTrue(np.array_equal(load_cached(filename, loader, 'all'), self.data))
+            load_cached(filename, lambda: self.data[:, :1], 'first')
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(len(sidecars()), 2)
+            del cached
+
+            # a modified data file replaces the outdated sidecars (of all keys)
+            np.savetxt(filename, self.data[:50])
+            os.utime(filename, ns=(0, 0))
+            modified = load_cached(filename, loader, 'all')
+            self.assertTrue(np.array_equal(modified, self.data[:50]))
+            self.assertEqual(sidecars(), [get_cache_filename(filename, 'all')])
+            del modified
+
+            # unrelated files are kept
+            other = path.join(tmp, 'data.txt.other.npy')
+            np.save(other, self.data)
+            np.savetxt(filename, self.data[:10])
+            os.utime(filename, ns=(1, 1))
+            load_cached(filename, loader, 'all')
+            self.assertEqual(sidecars(), sorted([get_cache_filename(filename, 'all'), other]))
+
+
+if __name__ == '__main__':
+    unittest.main()
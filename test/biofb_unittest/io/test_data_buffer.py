@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+
+
+class TestDataBuffer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.n_channels = 3
+        self.chunks = [np.random.rand(n, self.n_channels) for n in (5, 1, 17, 100, 3, 250, 7)]
+
+    def tearDown(self) -> None:
+        pass
+
+    def test_import(self):
+        from biofb.io import DataBuffer
+
+    def test_growable(self):
+        from biofb.io import DataBuffer
+
+        buffer = DataBuffer(block_size=8)
+        self.assertIsNone(buffer.data)
+
+        for i, chunk in enumerate(self.chunks):
+            data = buffer.append(chunk)
+            self.assertTrue(np.array_equal(data, np.concatenate(self.chunks[:i + 1])))
+            self.assertIs(data, buffer.data)
+
+        self.assertEqual(len(buffer), sum(len(c) for c in self.chunks))
+        self.assertTrue(np.array_equal(buffer.last(10), np.concatenate(self.chunks)[-10:]))
+        self.assertTrue(np.shares_memory(buffer.last(10), buffer.data))
+
+    def test_ring(self, capacity=50):
+        from biofb.io import DataBuffer
+
+        buffer = DataBuffer(capacity=capacity)
+
+        for i, chunk in enumerate(self.chunks):
+            data = buffer.append(chunk)
+            self.assertTrue(np.array_equal(data, np.concatenate(self.chunks[:i + 1])[-capacity:]))
+            self.assertLessEqual(len(buffer), capacity)
+
+        self.assertEqual(buffer.allocated, 2 * capacity)
+
+    def test_shape_mismatch(self):
+        from biofb.io import DataBuffer
+
+        buffer = DataBuffer(data=np.zeros((2, 3)))
+        with self.assertRaises(ValueError):
+            buffer.append(np.zeros((2, 4)))
+
+        # empty chunks are ignored
+        buffer.append(np.zeros((0, 3)))
+        self.assertEqual(len(buffer), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -129,6 +129,74 @@ class TestLoadable(unittest.TestCase):
         with self.assertRaises(AssertionError):
             Loadable.load_dict_like(value=path.join(self.data_path, "not-a-file-for-sure/do-not-create-this-path.json"))
 
+    def test_load_to_dict(self):
+        from biofb.session import Sample, Setting
+        from biofb.hardware import Device
+        from biofb.hardware.channels import ECG
+
+        self.assertEqual(Device.get_parameters(), ('name', 'channels', 'description', 'load_data_kwargs', 'data',
+                                                   'parameters'))
+        self.assertIs(Device.get_parameters(), Device.get_parameters())
+
+        setup = dict(name='Setup', devices=[dict(name='D1', channels=[dict(name='ECG', sampling_rate=100.),
+                                                                      dict(name='B', sampling_rate=100.)])])
+        setting = dict(name='Setting', controller=dict(name='Controller', **{'class': 'biofb.session.Controller'}))
+        samples = [Sample.load(dict(setup=setup, setting=setting, subject=dict(identity=f'Subject {i}')))
+                   for i in range(2)]
+
+        # shared representations are not modified while loading
+        self.assertIn('class', setting['controller'])
+        self.assertIsInstance(samples[1].setup.devices[0]['ECG'], ECG)
+
+        dict_repr = samples[0].to_dict()
+        self.assertEqual(dict_repr['setup']['devices'][0]['channels'][1]['name'], 'B')
+        self.assertEqual(dict_repr['subject']['identity'], 'Subject 0')
+        self.assertEqual(Sample.load(dict_repr).to_dict()['setup'], dict_repr['setup'])
+        self.assertIsInstance(Setting.load(dict(name='Setting')), Setting)
+
+    def test_file_format(self):
+        from biofb.io import Loadable
+        from tempfile import TemporaryDirectory
+        import h5py
+        import json
+        import yaml
+        import os
+
+        dict_obj = dict(test=1, abc="str")
+
+        with TemporaryDirectory() as tmp:
+            # formats are detected by the extension or, without extension, by the first bytes of the file
+            files = dict(json=os.path.join(tmp, 'json-repr'), yml=os.path.join(tmp, 'yaml-repr'),
+                         h5=os.path.join(tmp, 'hdf5-repr'), csv=os.path.join(tmp, 'csv-repr.csv'))
+
+            with open(files['json'], 'w') as f:
+                json.dump(dict_obj, f)
+            with open(files['yml'], 'w') as f:
+                yaml.safe_dump(dict_obj, f)
+            with h5py.File(files['h5'], 'w') as h5:
+                h5['test'] = 1
+                h5['abc'] = 'str'
+            with open(files['csv'], 'w') as f:
+                f.write('test,abc\n1,str\n2,xyz\n')
+
+            for file_format, filename in files.items():
+                self.assertEqual(Loadable.get_file_format(filename), file_format)
+
+            self.assertEqual(Loadable.load_dict_like(files['json']), dict_obj)
+            self.assertEqual(Loadable.load_dict_like(files['yml']), dict_obj)
+            self.assertEqual(Loadable.load_dict_like(files['h5'], cache=False)['test'], 1)
+            self.assertEqual(Loadable.load_dict_like(files['csv']), dict(test=['1', '2'], abc=['str', 'xyz']))
+            self.assertEqual(Loadable.load_dict_like(files['csv'], 1), dict(test='2', abc='xyz'))
+
+            # cached results are copies, and are invalidated if the file is modified
+            loaded = Loadable.load_dict_like(files['yml'])
+            loaded['test'] = 2
+            self.assertEqual(Loadable.load_dict_like(files['yml']), dict_obj)
+
+            with open(files['yml'], 'w') as f:
+                yaml.safe_dump(dict(test=12345), f)
+            self.assertEqual(Loadable.load_dict_like(files['yml']), dict(test=12345))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+
+
+class TestMappedArray(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data = np.random.rand(1000, 3).astype('float32')
+
+    def tearDown(self) -> None:
+        pass
+
+    def test_import(self):
+        from biofb.io import MappedArray
+
+    def test_map(self):
+        from biofb.io import MappedArray
+        from tempfile import TemporaryDirectory
+        from os import path
+        import pickle
+
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, 'data.npy')
+            np.save(filename, self.data)
+
+            mapped = MappedArray.from_file(filename)
+            self.assertEqual(mapped.shape, self.data.shape)
+            self.assertEqual(len(mapped), 1000)
+
+            # only the reference is pickled
+            mapped = pickle.loads(pickle.dumps(mapped))
+            self.assertLess(len(pickle.dumps(mapped)), 1000)
+
+            np.testing.assert_array_equal(mapped.read(), self.data)
+            np.testing.assert_array_equal(mapped[100:250], self.data[100:250])
+            np.testing.assert_array_equal(mapped.read(990, 2000), self.data[990:])
+            self.assertEqual(mapped.read(5, 5).shape, (0, 3))
+
+            slices = list(mapped.iter_slices(n_rows=300))
+            self.assertEqual([len(s) for s in slices], [300, 300, 300, 100])
+            np.testing.assert_array_equal(np.concatenate(slices), self.data)
+            np.testing.assert_array_equal(np.array(list(mapped)), self.data)
+
+            # views on memory-mapped arrays
+            view = np.load(filename, mmap_mode='r')[123:456]
+            np.testing.assert_array_equal(MappedArray.from_array(view).read(), self.data[123:456])
+            del slices, view
+
+            with self.assertRaises(AssertionError):
+                MappedArray.from_array(self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
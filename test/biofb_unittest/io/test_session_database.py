@@ -29,6 +29,223 @@ class TestSessionDatabase(unittest.TestCase):
             mm = s.setup.devices[0]
             self.assertIsInstance(mm, Device)
 
+    def test_lazy_load(self):
+        from biofb.io import SessionDatabase
+        from tempfile import TemporaryDirectory
+        import numpy as np
+
+        setup = dict(name='Setup', devices=[dict(name='Device', channels=[dict(name='A', sampling_rate=100.),
+                                                                          dict(name='B', sampling_rate=100.)])])
+
+        with TemporaryDirectory() as tmp:
+            samples, data = [], []
+            for i in range(3):
+                filename = path.join(tmp, f'sample-{i}.dat')
+                data.append(np.random.randn(1000, 2))
+                np.savetxt(filename, data[-1])
+                samples.append(dict(setup=setup, subject=dict(identity=f'Subject {i}'), filename=filename))
+
+            # data is loaded immediately by default (loaders may update the devices from the data files)
+            db = SessionDatabase(samples=samples)
+            db.load_data()
+            self.assertEqual([s.data_loaded for s in db.samples], [True] * 3)
+
+            db = SessionDatabase(samples=samples, max_bytes=2 * data[0].nbytes)
+            db.load_data(lazy=True)
+            self.assertEqual([s.data_loaded for s in db.samples], [False] * 3)
+
+            # data is loaded upon first access
+            np.testing.assert_allclose(db.samples[0].data[0], data[0])
+            self.assertEqual([s.data_loaded for s in db.samples], [True, False, False])
+            self.assertEqual(db.samples[0].setup.devices[0].data.shape, (1000, 2))
+
+            # least recently used data is evicted beyond the byte budget (and reloaded upon access)
+            np.testing.assert_allclose(db.samples[1].data[0], data[1])
+            np.testing.assert_allclose(db.samples[2].data[0], data[2])
+            self.assertEqual([s.data_loaded for s in db.samples], [False, True, True])
+            self.assertLessEqual(db.data_cache.nbytes, db.max_bytes)
+
+            np.testing.assert_allclose(db.samples[0].data[0], data[0])
+            self.assertEqual([s.data_loaded for s in db.samples], [True, False, True])
+
+            # explicitly set data is never evicted
+            db.samples[1].data = [data[1]]
+            db.max_bytes = 0
+            self.assertEqual([s.data_loaded for s in db.samples], [True, True, False])
+
+    def test_parallel_load(self):
+        from biofb.io import SessionDatabase
+        from tempfile import TemporaryDirectory
+        import numpy as np
+
+        setup = dict(name='Setup', devices=[dict(name='Device', channels=[dict(name='A', sampling_rate=100.)])])
+
+        with TemporaryDirectory() as tmp:
+            samples, data = [], []
+            for i in range(6):
+                filename = path.join(tmp, f'sample-{i}.dat')
+                data.append(np.random.randn(100))
+                if i != 3:  # missing data file
+                    np.savetxt(filename, data[-1])
+                samples.append(dict(setup=setup, subject=dict(identity=f'Subject {i}'), filename=filename))
+
+            for executor in ('thread', 'process'):
+                db = SessionDatabase(samples=samples)
+                errors = db.load_data(lazy=False, workers=2, executor=executor)
+
+                self.assertEqual(list(errors.keys()), [3])
+                self.assertIsInstance(errors[3], FileNotFoundError)
+                self.assertIs(db.load_errors, errors)
+
+                for i, (sample, d) in enumerate(zip(db.samples, data)):
+                    self.assertEqual(sample.data_loaded, i != 3)
+                    if i != 3:
+                        np.testing.assert_allclose(sample.data[0], d)
+
+    def test_query(self):
+        from biofb.io import SessionDatabase
+        from datetime import datetime
+        import numpy as np
+
+        devices = [dict(name=name, channels=[dict(name='A', sampling_rate=100.)]) for name in ('D1', 'D2')]
+        settings = [dict(name='Test', location=dict(name='Lab')),
+                    dict(name='Control', location=dict(name='Home'), controller=dict(name='Human'))]
+
+        samples = []
+        for i in range(20):
+            samples.append(dict(setup=dict(name='Setup', devices=devices[:1 + i % 2]),
+                                subject=dict(identity=f'Subject {i % 4}'), setting=settings[i % 3 == 0],
+                                timestamp=datetime(2021, 1, 1 + i).timestamp(), filename=f'sample-{i}.dat'))
+
+        db = SessionDatabase(samples=samples, max_bytes=1000)
+
+        def expected(condition):
+            return [s for s in db.samples if condition(s)]
+
+        result = db.query(subject='Subject 1')
+        self.assertEqual(result.samples, expected(lambda s: s.subject.identity == 'Subject 1'))
+        self.assertIs(result.data_cache, db.data_cache)
+
+        result = db.query(subject=['Subject 1', 'Subject 2'], device='D2', location='Home')
+        self.assertEqual(result.samples, expected(lambda s: s.subject.identity in ('Subject 1', 'Subject 2') and
+                                                  len(s.setup.devices) == 2 and s.setting.location.name == 'Home'))
+
+        result = db.query(controller='Human', start='2021-01-05', stop=datetime(2021, 1, 15))
+        self.assertEqual(result.samples, expected(lambda s: s.setting.controller.name == 'Human' and
+                                                  datetime(2021, 1, 5).timestamp() <= s.timestamp <
+                                                  datetime(2021, 1, 15).timestamp()))
+        self.assertGreater(len(result), 0)
+
+        self.assertEqual(len(db.query(subject='Unknown')), 0)
+        self.assertEqual(len(db.query()), len(db))
+
+        # indices are kept in sync with the samples
+        db += [dict(setup=dict(name='Setup', devices=devices), subject=dict(identity='New'), filename='new.dat')]
+        self.assertEqual(len(db.query(subject='New')), 1)
+        np.testing.assert_array_equal(db.index.query(device='D1'), np.arange(len(db)))
+
+    def test_catalog(self):
+        from biofb.io import SessionDatabase
+        from tempfile import TemporaryDirectory
+        from unittest import mock
+        import yaml
+        import os
+
+        with TemporaryDirectory() as tmp:
+            meta_filename = path.join(tmp, 'meta.yml')
+            with open(meta_filename, 'w') as f:
+                yaml.dump(dict(ids=dict(TP=dict(identity='Test Person'),
+                                        SETUP=dict(name='Setup', devices=[dict(name='Device', channels=[
+                                            dict(name='A', sampling_rate=100.)])]))), f)
+
+            db_filename = path.join(tmp, 'db.yml')
+            with open(db_filename, 'w') as f:
+                yaml.dump(dict(meta_data='meta.yml',  # relative to the database file (not the working directory)
+                               samples=[dict(setup='SETUP', subject='TP', filename=f'sample-{i}.dat', timestamp=i)
+                                        for i in range(3)]), f)
+
+            db = SessionDatabase.load(db_filename)
+            self.assertTrue(path.isfile(SessionDatabase.get_catalog_filename(db_filename)))
+            self.assertEqual([s.subject.identity for s in db.samples], ['Test Person'] * 3)
+            self.assertEqual(db.samples[0].setup.devices[0].name, 'Device')
+
+            # repeated reads skip yaml parsing and id resolution
+            with mock.patch.object(SessionDatabase, 'compile', side_effect=AssertionError):
+                db = SessionDatabase.load(db_filename)
+                self.assertEqual([s.timestamp for s in db.samples], [0, 1, 2])
+
+                # shared meta-data is stored once and remains shared
+                samples = SessionDatabase.read(db_filename)['samples']
+                self.assertIs(samples[0]['setup'], samples[1]['setup'])
+
+            # modified sources invalidate the catalog
+            with open(meta_filename, 'w') as f:
+                yaml.dump(dict(ids=dict(TP=dict(identity='Other Person'),
+                                        SETUP=dict(name='Setup', devices=[dict(name='Device', channels=[
+                                            dict(name='A', sampling_rate=100.)])]))), f)
+            os.utime(meta_filename, ns=(0, 0))
+
+            db = SessionDatabase.load(db_filename)
+            self.assertEqual([s.subject.identity for s in db.samples], ['Other Person'] * 3)
+            self.assertEqual(SessionDatabase.read(db_filename, catalog=False), SessionDatabase.read(db_filename))
+
+            # missing meta-data files are tracked as sources as well
+            os.remove(meta_filename)
+            self.assertEqual(SessionDatabase.read(db_filename)['samples'][0]['subject'], 'TP')
+            with open(meta_filename, 'w') as f:
+                yaml.dump(dict(ids=dict(TP=dict(identity='Test Person'))), f)
+            self.assertEqual(SessionDatabase.read(db_filename)['samples'][0]['subject'], dict(identity='Test Person'))
+
+    def test_catalog_types(self):
+        from biofb.io import SessionDatabase, read_catalog
+        from tempfile import TemporaryDirectory
+        from datetime import date, datetime
+
+        with TemporaryDirectory() as tmp:
+            db_filename = path.join(tmp, 'db.yml')
+            with open(db_filename, 'w') as f:
+                f.write("samples:\n"
+                        "  - {filename: sample.dat, date: 2021-03-04, time: 2021-03-04 10:11:12,\n"
+                        "     markers: {1: start, 2: stop, $shared: 0}, pair: !!python/tuple [1, 2]}\n")
+
+            db = SessionDatabase.read(db_filename)
+            sample = db['samples'][0]
+            self.assertEqual(sample['date'], date(2021, 3, 4))
+            self.assertEqual(sample['time'], datetime(2021, 3, 4, 10, 11, 12))
+            self.assertEqual(sample['markers'], {1: 'start', 2: 'stop', '$shared': 0})
+            self.assertEqual(sample['pair'], (1, 2))
+
+            # the catalog is written and restores all types
+            self.assertEqual(read_catalog(SessionDatabase.get_catalog_filename(db_filename)), db)
+            self.assertEqual(SessionDatabase.read(db_filename), SessionDatabase.read(db_filename, catalog=False))
+
+    def test_hdf5_memory_map(self):
+        from biofb.session import Sample
+        from biofb.io import is_memory_mapped
+        from tempfile import TemporaryDirectory
+        import numpy as np
+
+        setup = dict(name='Setup', devices=[dict(name='D1', channels=[dict(name='A', sampling_rate=100.)]),
+                                            dict(name='D2', channels=[dict(name='B', sampling_rate=50.)])])
+
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, 'sample.h5')
+            data = [np.random.randn(100, 1), np.random.randn(50, 1)]
+
+            sample = Sample(setup=setup, subject=dict(identity='Subject'), filename=filename)
+            sample.data = data
+            for chunked in (True, False):
+                sample.dump_data(chunked=chunked)
+
+                # only contiguous datasets are memory-mapped, chunked datasets (default) are read into memory
+                loaded = Sample(setup=setup, subject=dict(identity='Subject'), filename=filename)
+                loaded.load_data(lazy=True)
+                self.assertFalse(loaded.data_loaded)
+
+                for d, l in zip(data, loaded.data):
+                    self.assertEqual(is_memory_mapped(l), not chunked)
+                    np.testing.assert_allclose(l, d)
+
 
 if __name__ == '__main__':
     unittest.main()
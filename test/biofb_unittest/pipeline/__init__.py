@@ -0,0 +1,3 @@
+from .test_shared_memory import TestSharedMemoryQueue
+from .test_receiver import TestReceiver
+from .test_synchronizer import TestSynchronizer
@@ -0,0 +1,128 @@
+import unittest
+import numpy as np
+import uuid
+
+
+class TestLSLReceiver(unittest.TestCase):
+
+    def setUp(self) -> None:
+        import pylsl
+        self.name = f'biofb-test-{uuid.uuid4().hex}'
+        self.n_channels = 3
+        info = pylsl.StreamInfo(self.name, 'EEG', self.n_channels, 100., pylsl.cf_float32, self.name)
+        self.outlet = pylsl.StreamOutlet(info)
+
+    def tearDown(self) -> None:
+        del self.outlet
+
+    def test_get_data_chunk(self):
+        from biofb.pipeline.lab_streaming_layer_receiver import LSLReceiver
+
+        data = np.arange(25 * self.n_channels, dtype='float32').reshape(25, self.n_channels)
+
+        for pull_chunks in (True, False):
+            receiver = LSLReceiver(stream=self.name, chunk_size=0.1, pull_chunks=pull_chunks, verbose=False)
+            receiver.stream_inlet.open_stream(timeout=5.)
+
+            self.outlet.push_chunk(data)
+
+            # chunks of exactly `chunk_size` samples, the remaining samples are carried over to the next chunk
+            for i in range(2):
+                timestamps, samples = receiver.receive_data()
+                self.assertEqual(timestamps.shape, (10, ))
+                self.assertEqual(samples.dtype, np.float32)
+                np.testing.assert_array_equal(samples, data[i * 10:(i + 1) * 10])
+                self.assertTrue(np.all(np.diff(timestamps) >= 0))
+
+            # only 5 of 10 samples are available, the pull blocks with timeout until the chunk is complete
+            self.outlet.push_chunk(data[:5] + 100)
+            timestamps, samples = LSLReceiver.get_data_chunk(receiver.stream_inlet, receiver.stream_info,
+                                                             chunk_size=5, pull_chunks=pull_chunks, timeout=0.1)
+            np.testing.assert_array_equal(samples, data[20:])
+
+            timestamps, samples = LSLReceiver.get_data_chunk(receiver.stream_inlet, receiver.stream_info,
+                                                             chunk_size=5, pull_chunks=pull_chunks, timeout=0.1)
+            np.testing.assert_array_equal(samples, data[:5] + 100)
+
+            if pull_chunks:  # samples are pulled without (per request size) pylsl buffers
+                self.assertEqual(len(receiver.stream_inlet.buffers), 0)
+
+            receiver.stream_inlet.close_stream()
+
+    def test_dtypes(self):
+        from biofb.pipeline.lab_streaming_layer_receiver import LSLReceiver, LSL_DTYPES
+        import pylsl
+
+        for channel_format in (pylsl.cf_int16, pylsl.cf_int64, pylsl.cf_double64):
+            name = f'{self.name}-{channel_format}'
+            info = pylsl.StreamInfo(name, 'EEG', self.n_channels, 100., channel_format, name)
+            outlet = pylsl.StreamOutlet(info)
+
+            receiver = LSLReceiver(stream=name, chunk_size=7, pull_chunks=True, verbose=False)
+            receiver.stream_inlet.open_stream(timeout=5.)
+
+            data = np.arange(10 * self.n_channels).reshape(10, self.n_channels).astype(LSL_DTYPES[channel_format])
+            outlet.push_chunk(data.tolist())
+
+            timestamps, samples = receiver.receive_data()
+            self.assertEqual(samples.dtype, data.dtype)
+            np.testing.assert_array_equal(samples, data[:7])
+            self.assertEqual(timestamps.shape, (7, ))
+
+            receiver.stream_inlet.close_stream()
+            del outlet
+
+    def test_pull_chunk_errors(self):
+        from biofb.pipeline.lab_streaming_layer_receiver import LSLReceiver
+        from types import SimpleNamespace
+        import pylsl
+
+        def inlet(errcode):
+            def do_pull_chunk(obj, samples, timestamps, n_values, n_timestamps, timeout, error):
+                error._obj.value = errcode
+                return 0
+
+            return SimpleNamespace(obj=None, do_pull_chunk=do_pull_chunk)
+
+        samples, timestamps = np.empty((5, self.n_channels), dtype='float32'), np.empty(5)
+        self.assertEqual(LSLReceiver.pull_chunk(inlet(0), samples, timestamps, timeout=0.), 0)
+
+        # liblsl error codes are raised as the public pylsl exception types
+        for errcode, error in ((-1, pylsl.TimeoutError), (-2, pylsl.LostError), (-3, pylsl.InvalidArgumentError),
+                               (-4, pylsl.InternalError), (-9, RuntimeError)):
+            with self.assertRaises(error):
+                LSLReceiver.pull_chunk(inlet(errcode), samples, timestamps, timeout=0.)
+
+    def test_cpu_usage(self):
+        from biofb.pipeline.lab_streaming_layer_receiver import LSLReceiver
+        import resource
+        import time
+
+        def children_cpu_time():
+            usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+            return usage.ru_utime + usage.ru_stime
+
+        cpu_time, then = children_cpu_time(), time.monotonic()
+
+        receiver = LSLReceiver(stream=self.name, chunk_size=0.1, pull_chunks=True, verbose=False)
+        with receiver:
+            puller = receiver._puller
+
+            # 3 s of data in real-time (100 Hz), followed by 1 s without data
+            sample = np.random.rand(1, self.n_channels).astype('float32')
+            for i in range(300):
+                self.outlet.push_chunk(sample)
+                time.sleep(0.01)
+
+            time.sleep(1.)
+            self.assertGreater(receiver.poll(), 0)
+
+        puller.join()
+        cpu_time, elapsed = children_cpu_time() - cpu_time, time.monotonic() - then
+
+        # the background receiver process blocks while waiting for data instead of polling a full core
+        self.assertLess(cpu_time, 0.25 * elapsed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+import numpy as np
+import time
+
+
+class TestMemory(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.sampling_rate = 100.
+        self.data = np.random.randn(1000, 3)
+
+    def tearDown(self) -> None:
+        pass
+
+    def test_replay(self):
+        from biofb.pipeline import MemoryReceiver
+
+        receiver = MemoryReceiver(stream='replay', data=self.data, sampling_rate=self.sampling_rate,
+                                  chunk_size=0.1, speed=None, verbose=False)
+
+        chunks = [receiver.receive_data() for _ in range(100)]
+        timestamps = np.concatenate([t for t, d in chunks])
+        np.testing.assert_array_equal(np.concatenate([d for t, d in chunks]), self.data)
+        np.testing.assert_allclose(np.diff(timestamps), 1. / self.sampling_rate, atol=1e-6)
+        self.assertEqual(receiver.n_replayed, 1000)
+
+        # all data are replayed
+        timestamps, data = receiver.receive_data()
+        self.assertEqual(data.shape, (0, 3))
+
+        meta_data = receiver.stream_info['meta_data']
+        self.assertEqual(meta_data['channel_count'], 3)
+        self.assertEqual(meta_data['nominal_srate'], self.sampling_rate)
+        self.assertEqual([c['label'] for c in receiver.stream_info['channels']], ['CH0', 'CH1', 'CH2'])
+
+        # looped replay of recorded timestamps
+        receiver = MemoryReceiver(stream='replay', data=self.data[:50], timestamps=5. + np.arange(50) / 100.,
+                                  sampling_rate=self.sampling_rate, chunk_size=20, speed=None, loop=True,
+                                  verbose=False)
+        timestamps = np.concatenate([receiver.receive_data()[0] for _ in range(6)])
+        self.assertEqual(len(timestamps), 100)
+        np.testing.assert_allclose(np.diff(timestamps), 1. / self.sampling_rate, atol=1e-6)
+
+    def test_speed(self):
+        from biofb.pipeline import MemoryReceiver
+
+        # 0.5 s of data at 1x and 10x real-time
+        for speed in (1., 10.):
+            receiver = MemoryReceiver(stream='replay', data=self.data[:50], sampling_rate=self.sampling_rate,
+                                      chunk_size=10, speed=speed, verbose=False)
+            receiver.connect()
+
+            then = time.monotonic()
+            for _ in range(5):
+                receiver.receive_data()
+            elapsed = time.monotonic() - then
+
+            self.assertGreaterEqual(elapsed, 0.5 / speed - 1e-3)
+            self.assertLess(elapsed, 0.5 / speed + 0.1)
+
+    def test_setup(self):
+        from biofb.pipeline import MemoryReceiver
+        from biofb.hardware import Setup
+
+        setup = Setup(name='Setup', devices=[dict(name='D1', channels=[dict(name='A', sampling_rate=100.)]),
+                                             dict(name='D2', channels=[dict(name='B', sampling_rate=50.),
+                                                                       dict(name='C', sampling_rate=50.)])])
+
+        data = [np.random.randn(100, 1), np.random.randn(50, 2)]
+        receivers_kwargs = [dict(stream=device.name, data=d, sampling_rate=device.sampling_rate, speed=None,
+                                 channels=device.channels, chunk_size=0.5, verbose=False)
+                            for device, d in zip(setup.devices, data)]
+
+        try:
+            setup.receive_data(receivers=[MemoryReceiver] * 2, receivers_kwargs=receivers_kwargs)
+            setup.receive_data()
+        finally:
+            setup.stop()
+
+        self.assertEqual([d.name for d in setup.devices], ['D1', 'D2'])
+        for device, d in zip(setup.devices, data):
+            np.testing.assert_array_equal(device.data, d)
+
+    def test_loopback(self):
+        from biofb.pipeline import MemoryReceiver, MemoryTransmitter, MemoryStream
+        from biofb.hardware import Device
+
+        device = Device(name='Device', channels=[dict(name=c, sampling_rate=self.sampling_rate) for c in 'ABC'])
+
+        transmitter = MemoryTransmitter(device=device, stream='loopback', verbose=False)
+        with transmitter:
+            receiver = MemoryReceiver(stream='loopback', timeout=0.1, verbose=False)
+            self.assertEqual(receiver.stream_info['meta_data']['channel_count'], 3)
+            self.assertEqual([c['label'] for c in receiver.stream_info['channels']], ['A', 'B', 'C'])
+
+            transmitter.push_data(self.data[:20])
+            timestamps, data = receiver.receive_data()
+            np.testing.assert_array_equal(data, self.data[:20])
+            self.assertEqual(timestamps.shape, (20, ))
+
+            transmitter.join()
+
+        timestamps, data = receiver.receive_data()
+        self.assertEqual(data.shape, (0, 3))
+        MemoryStream.get('loopback').close()
+
+    def test_transmitter_speed(self):
+        from biofb.pipeline import MemoryReceiver, MemoryTransmitter, MemoryStream
+        from biofb.hardware import Device
+
+        device = Device(name='Device', channels=[dict(name=c, sampling_rate=self.sampling_rate) for c in 'ABC'])
+
+        # 2 s of data (transmitted sample by sample) at 10x real-time, and unthrottled
+        for speed, target_rate in ((10., 1000.), (None, np.inf)):
+            transmitter = MemoryTransmitter(device=device, stream='speed', speed=speed, verbose=False)
+            with transmitter:
+                transmitter.push_data(self.data[:200])
+                transmitter.join()
+
+                receiver = MemoryReceiver(stream='speed', timeout=0.1, verbose=False)
+                np.testing.assert_array_equal(np.concatenate([receiver.receive_data()[1] for _ in range(200)]),
+                                              self.data[:200])
+
+                report, = transmitter.rate_reports
+                self.assertEqual(report['n_samples'], 200)
+                self.assertEqual(report['target_rate'], target_rate)
+                if speed is not None:
+                    self.assertAlmostEqual(report['elapsed'], 0.2, delta=0.05)
+                    self.assertAlmostEqual(report['actual_rate'], target_rate, delta=0.2 * target_rate)
+
+            MemoryStream.get('speed').close()
+
+    def test_push_mapped(self):
+        from biofb.pipeline import MemoryReceiver, MemoryTransmitter, MemoryStream
+        from biofb.hardware import Device
+        from biofb.io import MappedArray
+        from tempfile import TemporaryDirectory
+        from os import path
+
+        device = Device(name='Device', channels=[dict(name=c, sampling_rate=self.sampling_rate) for c in 'ABC'])
+
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, 'data.npy')
+            np.save(filename, self.data)
+            mapped = np.load(filename, mmap_mode='r')
+
+            # filename (pushed before the transmitter is started), memory-mapped view and mapped array
+            pushed = [(filename, self.data), (mapped[100:300], self.data[100:300]),
+                      (MappedArray.from_file(filename)[:50], self.data[:50])]
+
+            transmitter = MemoryTransmitter(device=device, stream='mapped', terminate_when_empty=False,
+                                            verbose=False)
+            transmitter.push_data(pushed[0][0])
+            with transmitter:
+                for data, _ in pushed[1:]:
+                    transmitter.push_data(data)
+
+                receiver = MemoryReceiver(stream='mapped', timeout=1., verbose=False)
+                for _, expected in pushed:
+                    received, n_received = [], 0
+                    while n_received < len(expected):
+                        received.append(receiver.receive_data()[1])
+                        n_received += len(received[-1])
+
+                    np.testing.assert_array_equal(np.concatenate(received), expected)
+
+                self.assertEqual([r['n_samples'] for r in transmitter.rate_reports], [1000, 200, 50])
+
+            MemoryStream.get('mapped').close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+import time
+
+
+class TestPacer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        pass
+
+    def tearDown(self) -> None:
+        pass
+
+    def test_pace(self):
+        from biofb.pipeline import Pacer
+
+        # 0.5 s of 100 Hz data at 10x real-time in chunks of 10 samples, with 1 ms processing time per chunk
+        pacer = Pacer(sampling_rate=100., speed=10.).start()
+        for i in range(1, 51):
+            time.sleep(1e-3)
+            pacer.wait(i * 10)
+
+        report = pacer.report()
+        self.assertEqual(report['n_samples'], 500)
+        self.assertEqual(report['target_rate'], 1000.)
+
+        # the processing time does not accumulate
+        self.assertAlmostEqual(report['elapsed'], 0.5, delta=0.03)
+        self.assertAlmostEqual(report['actual_rate'], 1000., delta=50.)
+
+        # a lagging pacer catches up with the timeline
+        pacer = Pacer(sampling_rate=100.).start()
+        time.sleep(0.1)
+        self.assertLess(pacer.wait(5), 0.)
+        self.assertGreater(pacer.wait(20), 0.05)
+        self.assertAlmostEqual(pacer.elapsed, 0.2, delta=0.02)
+        self.assertGreater(pacer.report()['max_lag'], 0.)
+
+    def test_unthrottled(self):
+        from biofb.pipeline import Pacer
+
+        for pacer in (Pacer(sampling_rate=100., speed=None), Pacer(sampling_rate=0.)):
+            pacer.start()
+            then = time.monotonic()
+            self.assertEqual(pacer.wait(10 ** 6), 0.)
+            self.assertLess(time.monotonic() - then, 0.01)
+            self.assertEqual(pacer.target_rate, np.inf)
+            self.assertEqual(pacer.report()['n_samples'], 10 ** 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
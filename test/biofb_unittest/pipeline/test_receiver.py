@@ -0,0 +1,141 @@
+import unittest
+import numpy as np
+import time
+from biofb.pipeline import Receiver, TRANSPORTS
+
+
+class CountingReceiver(Receiver):
+    """ Receiver of a synthetic stream of `n_chunks` chunks with consecutive sample indices as data """
+
+    def __init__(self, stream='counting', n_channels=3, chunk_size=5, n_chunks=10, **kwargs):
+        Receiver.__init__(self, stream=stream, n_channels=n_channels, chunk_size=chunk_size, n_chunks=n_chunks,
+                          **kwargs)
+        self._connected = False
+        self._n_received = 0
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def connect(self) -> tuple:
+        self._connected = True
+        return self, self.stream_info
+
+    @property
+    def stream_info(self) -> dict:
+        return dict(meta_data=dict(name=self.stream, channel_count=self._kwargs['n_channels'], nominal_srate=0),
+                    channels=[])
+
+    def receive_data(self) -> [np.ndarray, np.ndarray]:
+        while self._n_received >= self._kwargs['n_chunks']:
+            time.sleep(1.)
+
+        n, chunk_size = self._n_received, self._kwargs['chunk_size']
+        self._n_received += 1
+
+        timestamps = np.arange(n * chunk_size, (n + 1) * chunk_size, dtype=float)
+        return timestamps, np.repeat(timestamps[:, None], self._kwargs['n_channels'], axis=1)
+
+    def get_chunk_size(self) -> int:
+        return self._kwargs['chunk_size']
+
+
+class IdleReceiver(CountingReceiver):
+    """ Non-blocking Receiver of a stream without data """
+
+    def receive_data(self) -> None:
+        return None
+
+
+class FailingReceiver(CountingReceiver):
+    """ Receiver whose stream fails after `n_chunks` chunks """
+
+    def receive_data(self) -> [np.ndarray, np.ndarray]:
+        if self._n_received >= self._kwargs['n_chunks']:
+            raise ConnectionError('stream lost')
+
+        return CountingReceiver.receive_data(self)
+
+
+class TestReceiver(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.n_chunks = 10
+        self.chunk_size = 5
+
+    def tearDown(self) -> None:
+        pass
+
+    def wait_for_samples(self, receiver, n_samples, timeout=10.):
+        deadline = time.monotonic() + timeout
+        while receiver.poll() < n_samples:
+            self.assertLess(time.monotonic(), deadline, "Timeout while waiting for samples.")
+            time.sleep(1e-3)
+
+    def test_pull_available(self):
+        n_samples = self.n_chunks * self.chunk_size
+
+        for transport in TRANSPORTS:
+            with CountingReceiver(n_chunks=self.n_chunks, chunk_size=self.chunk_size, transport=transport,
+                                  verbose=False) as receiver:
+
+                timestamps, data = receiver.pull_data()
+                self.assertTrue(np.array_equal(timestamps, np.arange(self.chunk_size)))
+
+                self.wait_for_samples(receiver, n_samples - self.chunk_size)
+                self.assertEqual(receiver.poll(), n_samples - self.chunk_size)
+
+                timestamps, data = receiver.pull_available(max_chunks=2)
+                self.assertTrue(np.array_equal(timestamps, np.arange(self.chunk_size, 3 * self.chunk_size)))
+
+                timestamps, data = receiver.pull_available()
+                self.assertEqual(data.shape, (n_samples - 3 * self.chunk_size, 3))
+                self.assertTrue(np.array_equal(timestamps, np.arange(3 * self.chunk_size, n_samples)))
+                self.assertTrue(np.array_equal(data[:, 0], timestamps))
+                self.assertEqual(receiver.poll(), 0)
+
+                timestamps, data = receiver.pull_available()
+                self.assertEqual(timestamps.shape, (0, ))
+                self.assertEqual(data.shape, (0, 3))
+
+    def test_backoff(self):
+        import resource
+
+        def children_cpu_time():
+            usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+            return usage.ru_utime + usage.ru_stime
+
+        cpu_time = children_cpu_time()
+        with IdleReceiver(verbose=False) as receiver:
+            puller = receiver._puller
+            time.sleep(1.)
+            self.assertEqual(receiver.poll(), 0)
+
+        puller.join()
+        self.assertLess(children_cpu_time() - cpu_time, 0.25)
+
+    def test_transport_capacity(self):
+        # chunks exceeding a third of the default capacity of the shared memory transport
+        with CountingReceiver(n_chunks=3, chunk_size=2000, transport='shared_memory', verbose=False) as receiver:
+            self.assertGreaterEqual(receiver._queue.capacity, 3 * 2000)
+
+            for i in range(3):
+                timestamps, data = receiver.pull_data()
+                self.assertTrue(np.array_equal(timestamps, np.arange(i * 2000, (i + 1) * 2000)))
+
+    def test_errors(self):
+        for transport in TRANSPORTS:
+            receiver = FailingReceiver(n_chunks=2, chunk_size=self.chunk_size, transport=transport, verbose=False)
+            with receiver:
+                for _ in range(2):
+                    receiver.pull_data()
+
+                # errors of the background process are raised in the calling process (instead of blocking)
+                with self.assertRaises(ConnectionError):
+                    receiver.pull_data()
+
+            self.assertIsNone(receiver._puller)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import numpy as np
+
+
+STREAMS = [dict(name='D1', channels=['A', 'B'], sampling_rate=10.), dict(name='D2', channels=['C'], sampling_rate=5.)]
+
+
+class TestRecorder(unittest.TestCase):
+
+    def setUp(self) -> None:
+        np.random.seed(0)
+
+    def tearDown(self) -> None:
+        pass
+
+    def test_import(self):
+        from biofb.pipeline import Recorder, read_recording
+
+    def record(self, filename, n_chunks=20, **kwargs):
+        from biofb.pipeline import Recorder
+
+        data = [np.random.randn(n_chunks * 4, 2), np.random.randn(n_chunks * 2, 1)]
+        timestamps = [np.arange(n_chunks * 4) / 10., None]
+        actions = []
+
+        with Recorder(filename, streams=STREAMS, **kwargs) as recorder:
+            for i in range(n_chunks):
+                recorder.record_data(0, timestamps[0][4 * i:4 * i + 4], data[0][4 * i:4 * i + 4])
+                recorder.record_data(1, None, data[1][2 * i:2 * i + 2])
+                actions.append((i / 2., 'key', np.float64(i)))
+                recorder.record_action(*actions[-1])
+
+        self.assertEqual(recorder.n_records, n_chunks * 3)
+        return data, timestamps, actions
+
+    def test_record(self):
+        from biofb.pipeline import read_recording
+        from tempfile import TemporaryDirectory
+        import os
+
+        with TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'recording.bin')
+            data, timestamps, actions = self.record(filename, max_queued=4)
+
+            recording = read_recording(filename)
+            self.assertEqual(recording['streams'], STREAMS)
+            np.testing.assert_array_equal(recording['data'][0], data[0])
+            np.testing.assert_array_equal(recording['data'][1], data[1])
+            np.testing.assert_array_equal(recording['timestamps'][0], timestamps[0])
+            self.assertIsNone(recording['timestamps'][1])
+            self.assertEqual(recording['actions'], [(t, k, float(v)) for t, k, v in actions])
+
+            # a truncated recording is readable up to the last complete record
+            with open(filename, 'r+b') as f:
+                f.truncate(os.path.getsize(filename) - 5)
+
+            recording = read_recording(filename)
+            self.assertEqual(len(recording['actions']), len(actions) - 1)
+            np.testing.assert_array_equal(recording['data'][0], data[0])
+
+    def test_killed(self):
+        from biofb.pipeline import read_recording
+        from tempfile import TemporaryDirectory
+        import subprocess
+        import signal
+        import sys
+        import os
+        import time
+
+        script = "\n".join([
+            "import sys, numpy as np",
+            "from biofb.pipeline import Recorder",
+            "recorder = Recorder(sys.argv[1], streams=[dict(name='D', channels=['A'], sampling_rate=10.)],",
+            "                    flush_interval=0.01)",
+            "recorder.start()",
+            "for i in range(10 ** 9):",
+            "    recorder.record_data(0, None, np.full((100, 1), float(i)))",
+        ])
+
+        with TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'recording.bin')
+            process = subprocess.Popen([sys.executable, '-c', script, filename], cwd=os.getcwd(),
+                                       env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+
+            try:
+                deadline = time.monotonic() + 30.
+                while (not os.path.isfile(filename) or os.path.getsize(filename) < 10 ** 5) and \
+                        time.monotonic() < deadline:
+                    time.sleep(0.05)
+            finally:
+                process.send_signal(signal.SIGKILL)
+                process.wait()
+
+            recording = read_recording(filename)
+            data = recording['data'][0]
+            self.assertGreater(len(data), 0)
+            np.testing.assert_array_equal(data[:, 0], np.repeat(np.arange(len(data) // 100), 100))
+
+    def test_to_hdf5(self):
+        from biofb.pipeline import Recorder
+        from biofb.io import records_to_actions
+        from tempfile import TemporaryDirectory
+        import h5py
+        import os
+
+        with TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'recording.bin')
+            data, timestamps, actions = self.record(filename)
+
+            h5filename = os.path.join(tmp, 'sample.h5')
+            Recorder.to_hdf5(filename, h5filename, key='sample_data', compression='lzf')
+
+            with h5py.File(h5filename, 'r') as h5:
+                np.testing.assert_array_equal(h5['sample_data/D1'][()], data[0])
+                np.testing.assert_array_equal(h5['sample_data/D2'][()], data[1])
+                np.testing.assert_array_equal(h5['sample_data/timestamps/D1'][()], timestamps[0])
+                self.assertNotIn('D2', h5['sample_data/timestamps'])
+                self.assertEqual(list(h5['sample_data/D1'].attrs['channels']), ['A', 'B'])
+
+                self.assertEqual(records_to_actions(h5['action_data'][()]), [(t, k, float(v)) for t, k, v in actions])
+
+
+if __name__ == '__main__':
+    unittest.main()
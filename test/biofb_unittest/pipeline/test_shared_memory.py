@@ -0,0 +1,121 @@
+import unittest
+import numpy as np
+from multiprocessing import Process
+from queue import Empty, Full
+
+
+def produce_chunks(queue, chunks):
+    for chunk in chunks:
+        queue.put(chunk)
+
+
+class TestSharedMemoryQueue(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.n_channels = 17
+        self.chunks = [(np.random.rand(n), np.random.rand(n, self.n_channels)) for n in (25, 1, 17, 30, 3, 25, 7)]
+
+    def tearDown(self) -> None:
+        pass
+
+    def test_import(self):
+        from biofb.pipeline import SharedMemoryQueue
+
+    def test_put_get(self):
+        from biofb.pipeline import SharedMemoryQueue
+
+        queue = SharedMemoryQueue(n_channels=self.n_channels, capacity=96)
+        try:
+            self.assertTrue(queue.empty())
+            self.assertRaises(Empty, queue.get_nowait)
+
+            for _ in range(3):  # wrap around the ring-buffer several times
+                for timestamps, data in self.chunks:
+                    queue.put((timestamps, data))
+                    self.assertEqual(queue.pending_samples(), len(data))
+
+                    t, d = queue.get()
+                    self.assertTrue(np.array_equal(t, timestamps))
+                    self.assertTrue(np.array_equal(d, data))
+                    self.assertTrue(queue.empty())
+
+        finally:
+            queue.close()
+
+    def test_full(self):
+        from biofb.pipeline import SharedMemoryQueue
+
+        queue = SharedMemoryQueue(n_channels=self.n_channels, capacity=96, max_chunks=2)
+        try:
+            self.assertRaises(ValueError, queue.put, (np.zeros(33), np.zeros((33, self.n_channels))))
+
+            queue.put(self.chunks[0])
+            queue.put(self.chunks[1])
+            self.assertEqual(queue.qsize(), 2)
+            self.assertRaises(Full, queue.put_nowait, self.chunks[2])
+
+            t, d = queue.get()  # releases a chunk descriptor
+            self.assertTrue(np.array_equal(d, self.chunks[0][1]))
+            queue.put(self.chunks[3])
+
+            # chunk descriptors are exhausted again
+            self.assertRaises(Full, queue.put, self.chunks[3], timeout=1e-3)
+
+            queue.get()
+            t, d = queue.get()
+            self.assertTrue(np.array_equal(d, self.chunks[3][1]))
+            queue.put(self.chunks[3])
+
+            # remaining memory is exhausted (the currently read chunk is not released)
+            self.assertRaises(Full, queue.put_nowait, self.chunks[3])
+
+        finally:
+            queue.close()
+
+    def test_blocking_put(self):
+        from biofb.pipeline import SharedMemoryQueue
+        from threading import Thread
+        import time
+
+        queue = SharedMemoryQueue(n_channels=self.n_channels, capacity=96, max_chunks=2)
+        try:
+            queue.put(self.chunks[0])
+            queue.put(self.chunks[1])
+
+            # the producer waits for released memory (until the consumer reads a chunk)
+            producer = Thread(target=queue.put, args=(self.chunks[2], ))
+            producer.start()
+            time.sleep(0.1)
+            self.assertTrue(producer.is_alive())
+
+            then = time.monotonic()
+            queue.get()
+            producer.join(timeout=1.)
+            self.assertFalse(producer.is_alive())
+            self.assertLess(time.monotonic() - then, 0.1)
+            self.assertEqual(queue.qsize(), 2)
+
+        finally:
+            queue.close()
+
+    def test_process(self):
+        from biofb.pipeline import SharedMemoryQueue
+
+        queue = SharedMemoryQueue(n_channels=self.n_channels, capacity=96)
+        try:
+            producer = Process(target=produce_chunks, args=(queue, self.chunks * 5))
+            producer.start()
+
+            for timestamps, data in self.chunks * 5:
+                t, d = queue.get(timeout=10.)
+                self.assertTrue(np.array_equal(t, timestamps))
+                self.assertTrue(np.array_equal(d, data))
+
+            producer.join()
+
+        finally:
+            queue.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
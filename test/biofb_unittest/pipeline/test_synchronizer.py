@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+
+
+def synthetic_stream(sampling_rate, duration, offset=0., drift=0., jitter=0., chunk_size=10, n_channels=2):
+    """ Chunks of a linear ramp `data = true_time`, timestamped by a drifting and jittered clock """
+    n_samples = int(duration * sampling_rate)
+    true_time = np.arange(n_samples) / sampling_rate
+    timestamps = offset + true_time * (1. + drift) + np.random.normal(0., jitter, n_samples)
+    data = np.repeat(true_time[:, None], n_channels, axis=1)
+    return [(timestamps[i:i + chunk_size], data[i:i + chunk_size]) for i in range(0, n_samples, chunk_size)]
+
+
+class TestSynchronizer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        np.random.seed(0)
+
+    def tearDown(self) -> None:
+        pass
+
+    def test_import(self):
+        from biofb.pipeline import Synchronizer, ClockModel
+
+    def test_clock_model(self):
+        from biofb.pipeline import ClockModel
+
+        clock = ClockModel(sampling_rate=500., memory=5000)
+        n_samples = 0
+        for timestamps, data in synthetic_stream(500., 60., offset=1e5, drift=1e-4, jitter=2e-3):
+            clock.update(np.arange(n_samples, n_samples + len(timestamps)), timestamps)
+            n_samples += len(timestamps)
+
+        self.assertAlmostEqual(clock.drift, 1e-4, delta=2e-5)
+        self.assertAlmostEqual(clock.offset, 1e5, delta=1e-3)
+
+    def test_alignment(self):
+        from biofb.pipeline import Synchronizer
+
+        bioplux = synthetic_stream(500., 30., offset=10., drift=5e-5, jitter=1e-3, chunk_size=50, n_channels=9)
+        unicorn = synthetic_stream(250., 30., offset=10.5, drift=-5e-5, jitter=1e-3, chunk_size=25, n_channels=17)
+
+        synchronizer = Synchronizer(sampling_rates=(500., 250.), buffer_duration=2.)
+
+        timestamps, data = [], [[], []]
+        for i in range(len(bioplux)):
+            chunks = [bioplux[i], unicorn[i] if i < len(unicorn) else (np.empty(0), np.empty((0, 17)))]
+            t, (d_bioplux, d_unicorn) = synchronizer.update(chunks)
+            self.assertEqual(d_bioplux.shape, (len(t), 9))
+            self.assertEqual(d_unicorn.shape, (len(t), 17))
+
+            timestamps.append(t)
+            data[0].append(d_bioplux)
+            data[1].append(d_unicorn)
+
+        timestamps = np.concatenate(timestamps)
+        self.assertTrue(np.allclose(np.diff(timestamps), 1. / 500.))
+        self.assertGreaterEqual(timestamps[0], 10.5 - 1e-2)
+
+        # the aligned ramps recover the true time of each stream
+        d_bioplux, d_unicorn = np.concatenate(data[0]), np.concatenate(data[1])
+        warm = timestamps > timestamps[0] + 5.
+        self.assertLess(np.abs(d_bioplux[warm, 0] - (timestamps[warm] - 10.) / (1. + 5e-5)).max(), 2e-3)
+        self.assertLess(np.abs(d_unicorn[warm, 0] - (timestamps[warm] - 10.5) / (1. - 5e-5)).max(), 2e-3)
+
+        # bounded memory
+        self.assertEqual([b.allocated for b in synchronizer._buffers], [2000, 1000])
+
+    def test_empty(self):
+        from biofb.pipeline import Synchronizer
+
+        synchronizer = Synchronizer(sampling_rates=(500., 250.))
+        t, data = synchronizer.update([(np.arange(5) / 500., np.zeros((5, 3))), (np.empty(0), np.empty((0, 2)))])
+        self.assertEqual(t.shape, (0, ))
+        self.assertEqual(data[0].shape, (0, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,175 @@ class TestSample(unittest.TestCase):
     def test_construct(self):
         from biofb.session import Sample
 
+    def test_dump_data(self):
+        from biofb.session import Sample
+        from tempfile import TemporaryDirectory
+        from os import path
+        import numpy as np
+        import h5py
+
+        setup = dict(name='Setup', devices=[dict(name='D1', channels=[dict(name='A', sampling_rate=100.),
+                                                                      dict(name='B', sampling_rate=100.)]),
+                                            dict(name='D2', channels=[dict(name='C', sampling_rate=50.)])])
+
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, 'sample.h5')
+            sample = Sample(setup=setup, subject=dict(identity='Subject'), filename=filename)
+
+            timestamps = np.arange(1000) / 100.
+            for i in range(10):
+                sample.setup.append_device_data(np.random.randn(100, 2), device='D1',
+                                                timestamps=timestamps[i * 100:(i + 1) * 100])
+                sample.setup.append_device_data(np.random.randn(50, 1), device='D2')
+
+            sample.dump_data(chunk_size=128, compression='lzf', shuffle=True)
+
+            with h5py.File(filename, 'r') as h5:
+                d1 = h5['sample.data/D1']
+                self.assertEqual(d1.chunks, (128, 2))
+                self.assertEqual(d1.maxshape, (None, 2))
+                self.assertEqual(d1.compression, 'lzf')
+                self.assertTrue(d1.shuffle)
+                self.assertEqual(list(d1.attrs['channels']), ['A', 'B'])
+                self.assertEqual(d1.attrs['sampling_rate'], 100.)
+
+                np.testing.assert_allclose(h5['sample.data/timestamps/D1'][()], timestamps)
+                self.assertNotIn('D2', h5['sample.data/timestamps'])
+
+            loaded = Sample(setup=setup, subject=dict(identity='Subject'), filename=filename)
+            loaded.load_data()
+            for d, l in zip(sample.data, loaded.data):
+                np.testing.assert_allclose(l, d)
+
+            # chunked, resizable datasets by default, contiguous on request
+            sample.dump_data()
+            with h5py.File(filename, 'r') as h5:
+                self.assertIsNotNone(h5['sample.data/D1'].chunks)
+                self.assertEqual(h5['sample.data/D1'].maxshape, (None, 2))
+                self.assertIsNone(h5['sample.data/D1'].compression)
+
+            sample.dump_data(chunked=False)
+            with h5py.File(filename, 'r') as h5:
+                self.assertIsNone(h5['sample.data/D1'].chunks)
+
+    def test_dump_missing_data(self):
+        from biofb.session import Sample
+        from tempfile import TemporaryDirectory
+        from os import path
+        import numpy as np
+
+        setup = dict(name='Setup', devices=[dict(name='D1', channels=[dict(name='A', sampling_rate=100.)]),
+                                            dict(name='D2', channels=[dict(name='B', sampling_rate=50.)])])
+
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, 'sample.h5')
+            sample = Sample(setup=setup, subject=dict(identity='Subject'), filename=filename)
+            sample.setup.append_device_data(np.random.randn(100, 1), device='D1')
+            sample.dump_data()  # no data of D2
+
+            for lazy in (True, False):
+                loaded = Sample(setup=setup, subject=dict(identity='Subject'), filename=filename)
+                loaded.load_data(lazy=lazy)
+                np.testing.assert_allclose(loaded.data[0], sample.data[0])
+                self.assertIsNone(loaded.data[1])
+
+            loaded = Sample(setup=setup, subject=dict(identity='Subject'), filename=filename)
+            loaded.load_data(lazy=True)
+            self.assertIsNone(loaded.read('D2', 0., 1.))
+            np.testing.assert_allclose(loaded.read('D1', 0., 0.5), sample.data[0][:50])
+            self.assertIsNone(loaded.read('D2'))  # loaded data
+
+            # missing files
+            loaded = Sample(setup=setup, subject=dict(identity='Subject'), filename=path.join(tmp, 'missing.h5'))
+            with self.assertRaises(FileNotFoundError):
+                loaded.load_data(lazy=False)
+
+    def test_read(self):
+        from biofb.session import Sample
+        from biofb.io import TimestampIndex
+        from tempfile import TemporaryDirectory
+        from os import path
+        import numpy as np
+        import h5py
+
+        setup = dict(name='Setup', devices=[dict(name='D1', channels=[dict(name='A', sampling_rate=100.),
+                                                                      dict(name='B', sampling_rate=100.)]),
+                                            dict(name='D2', channels=[dict(name='C', sampling_rate=50.)])])
+
+        with TemporaryDirectory() as tmp:
+            filename = path.join(tmp, 'sample.h5')
+            sample = Sample(setup=setup, subject=dict(identity='Subject'), filename=filename)
+
+            timestamps = 1e5 + np.arange(1000) / 100.
+            sample.setup.append_device_data(np.random.randn(1000, 2), device='D1', timestamps=timestamps)
+            sample.setup.append_device_data(np.random.randn(500, 1), device='D2')
+            d1, d2 = sample.data
+
+            # in-memory data
+            np.testing.assert_array_equal(sample.read('D1', 1.5, 2.), d1[150:200])
+            np.testing.assert_array_equal(sample.read('D2', 1.5, 2., channels='C'), d2[75:100])
+            np.testing.assert_array_equal(sample.read('D1', t_stop=1., channels=['B']), d1[:100, 1:])
+            np.testing.assert_array_equal(sample.read('D1', 1e5 + 2., 1e5 + 2.5, timestamps=True), d1[200:250])
+
+            # on-disk data (not loaded), chunked dataset
+            sample.dump_data(chunk_size=64)
+            loaded = Sample(setup=setup, subject=dict(identity='Subject'), filename=filename)
+            loaded.load_data(lazy=True)
+
+            np.testing.assert_array_equal(loaded.read('D1', 1.5, 2.), d1[150:200])
+            np.testing.assert_array_equal(loaded.read(1, 9.9, channels=[0]), d2[495:])
+            np.testing.assert_array_equal(loaded.read('D1', 1e5 + 2., 1e5 + 2.5, channels='A', timestamps=True),
+                                          d1[200:250, :1])
+            self.assertFalse(loaded.data_loaded)
+
+            # loaded data, timestamps are looked up on disk
+            loaded.load_data()
+            np.testing.assert_array_equal(loaded.read('D1', 1e5 + 2., 1e5 + 2.5, timestamps=True), d1[200:250])
+
+            with h5py.File(filename, 'r') as h5:
+                index = TimestampIndex(h5['sample.data/timestamps/D1'], block_size=16)
+                for t in (0., 1e5, 1e5 + 0.005, 1e5 + 3.33, 1e5 + 9.99, 2e5):
+                    for side in ('left', 'right'):
+                        self.assertEqual(index.index(t, side=side), np.searchsorted(timestamps, t, side=side))
+
+                self.assertEqual(index.timestamp(42), timestamps[42])
+
+    def test_time(self):
+        from biofb.session import Sample
+        from biofb.hardware import get_time_axis
+        import numpy as np
+
+        setup = dict(name='Setup', devices=[dict(name='D1', channels=[dict(name='A', sampling_rate=100.),
+                                                                      dict(name='B', sampling_rate=100.)]),
+                                            dict(name='D2', channels=[dict(name='C', sampling_rate=50.),
+                                                                      dict(name='D', sampling_rate=25.)]),
+                                            dict(name='D3', channels=[dict(name='E', sampling_rate=10.)])])
+
+        sample = Sample(setup=setup, subject=dict(identity='Subject'))
+        sample.data = [np.random.randn(300, 2), np.random.randn(50, 2), None]
+
+        t1, t2, t3 = sample.time
+        np.testing.assert_allclose(t1, np.repeat(np.arange(300)[:, None] / 100., 2, axis=1))
+        np.testing.assert_allclose(t2, np.column_stack([np.arange(50) / 50., np.arange(50) / 25.]))
+        self.assertIsNone(t3)
+
+        # views on a shared, cached time axis which is extended once the data grows
+        self.assertFalse(t1.flags.writeable)
+        self.assertTrue(np.shares_memory(t1, get_time_axis(10, 100.)))
+        np.testing.assert_allclose(sample.setup.devices[0]['A'].time, np.arange(300) / 100.)
+
+        sample.data[0] = np.random.randn(1000, 2)
+        np.testing.assert_allclose(sample.time[0][:, 1], np.arange(1000) / 100.)
+
+        # at most `TIME_AXIS_CACHE_SIZE` sampling rates are cached, least recently used axes are released
+        from biofb.hardware import time_axis
+        axis = get_time_axis(10, 100.)
+        for i in range(time_axis.TIME_AXIS_CACHE_SIZE):
+            get_time_axis(10, 1000. + i)
+
+        self.assertEqual(len(time_axis._TIME_AXES), time_axis.TIME_AXIS_CACHE_SIZE)
+        self.assertFalse(np.shares_memory(get_time_axis(10, 100.), axis))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -123,5 +123,57 @@ class TestSignalFiltering(unittest.TestCase):
 
             plt.show()
 
+    def test_streaming_filter(self, n_chunks=23):
+        from biofb.signal.filter import StreamingFilter, notch, bandpass
 
+        x = np.stack([self.signal, 2. * self.signal, np.arange(len(self.signal))], axis=1)
+        notch_filter = notch(w0=50., sampling_rate=self.sr)
+        bandpass_filter = bandpass(N=4, Wn=(5, 15), sampling_rate=self.sr)
 
+        streaming_filter = StreamingFilter(filters=[notch_filter, bandpass_filter], channels=[0, 1], steady_state=False)
+        filtered = np.concatenate([streaming_filter(chunk) for chunk in np.array_split(x, n_chunks)])
+
+        # chunk-wise filtering agrees with filtering of the whole signal
+        expected = sp.signal.sosfilt(bandpass_filter, sp.signal.lfilter(*notch_filter, x[:, :2], axis=0), axis=0)
+        self.assertTrue(np.allclose(filtered[:, :2], expected))
+        self.assertTrue(np.array_equal(filtered[:, 2], x[:, 2]))
+
+        # specification based design
+        streaming_filter.reset()
+        spec_filter = StreamingFilter.from_specs([{'type': 'notch', 'w0': 50.}, {'type': 'bandpass', 'N': 4, 'Wn': (5, 15)}],
+                                                 sampling_rate=self.sr, channels=[0, 1], steady_state=False)
+        self.assertTrue(np.allclose(spec_filter(x), streaming_filter(x)))
+
+    def test_filter_cache(self):
+        from biofb.signal.filter import bandpass, notch, filter_cache_info, clear_filter_cache
+
+        clear_filter_cache()
+        sos = bandpass(N=4, Wn=[5, 15], sampling_rate=self.sr)
+        sos_cached = bandpass(N=4, Wn=np.array([5., 15.]), sampling_rate=self.sr)
+        self.assertTrue(np.array_equal(sos_cached, sos))
+
+        # the cached design is not affected by modifications of the returned coefficients
+        sos_cached[:] = 0.
+        self.assertFalse(np.shares_memory(sos_cached, sos))
+
+        b, a = notch(w0=50., sampling_rate=self.sr)
+        self.assertTrue(np.array_equal(notch(w0=50, sampling_rate=self.sr)[0], b))
+
+        info = filter_cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 2))
+
+        self.assertTrue(np.allclose(sos, sp.signal.butter(4, [5, 15], btype='bandpass', fs=self.sr, output='sos')))
+
+    def test_filter_bank(self):
+        from biofb.signal.filter import FilterBank, apply_sos_filter
+
+        x = np.stack([self.signal, self.signal, self.signal[::-1]], axis=1)
+        specs = [{'type': 'lowpass', 'N': 4, 'Wn': 15}]
+
+        bank = FilterBank(specs=specs, sampling_rates=[self.sr, self.sr, self.sr / 2])
+        filtered = bank(x, filtfilt=True, channels=[0, 2])
+
+        self.assertTrue(np.allclose(filtered[:, 0], sp.signal.sosfiltfilt(bank.sos(self.sr), x[:, 0])))
+        self.assertTrue(np.array_equal(filtered[:, 1], x[:, 1]))
+        expected = apply_sos_filter(x[:, 2], N=4, Wn=15, sampling_rate=self.sr / 2, sos_filter='lowpass')
+        self.assertTrue(np.allclose(bank(x)[:, 2], expected))